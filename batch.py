@@ -0,0 +1,209 @@
+# batch.py
+"""
+Modo em lote (não interativo) do sistema de RH.
+
+Lê um roteiro de comandos, um por linha (arquivo ou stdin), e executa cada um
+pela HRFacade, sem menus e sem listar funcionários a cada passo. Os argumentos
+seguem as regras do shell (shlex): use aspas para valores com espaço. Linhas
+vazias e comentários (#) são ignorados.
+
+    hire <tipo> <nome> <idade> <email> <departamento> <cargo> <salário> <ano>
+    remove <funcionário>
+    train <funcionário> <YYYY-MM-DD> <HH:MM> <descrição>
+    evaluate <funcionário> <1|2|3>
+    punch <funcionário> <YYYY-MM-DD HH:MM> <YYYY-MM-DD HH:MM>
+    pay <funcionário> [<YYYY-MM-DD> <YYYY-MM-DD>]
+    report <funcionário> <attendance|compliance>
+
+<funcionário> é o id do funcionário ou o seu email. As mensagens que o sistema
+imprime a cada operação são descartadas (exceto os relatórios pedidos); erros
+não interrompem o roteiro e são listados no resumo final.
+"""
+
+import contextlib
+import os
+import shlex
+import sys
+from datetime import datetime, time as day_time
+from time import perf_counter
+
+from commands import AddTrainingCommand, AddPerformanceEvaluationCommand, CommandInvoker
+from indexes import parse_date
+from exceptions import HRSystemException
+
+REPORT_TYPES = ("attendance", "compliance")
+
+
+class BatchResult:
+    """ Resumo da execução: contagem por comando, erros (linha, comando, mensagem) e total pago. """
+    def __init__(self):
+        self.executed = 0
+        self.by_command = {}
+        self.errors = []
+        self.total_paid = 0.0
+        self.seconds = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    @property
+    def ops_per_sec(self):
+        total = self.executed + len(self.errors)
+        return total / self.seconds if self.seconds > 0 else None
+
+    def summary(self) -> str:
+        lines = [
+            f"Lote concluído: {self.executed} comando(s) executado(s), {len(self.errors)} erro(s) "
+            f"em {self.seconds:.2f}s ({self.ops_per_sec or 0:.0f} comandos/s)."
+        ]
+        for name, count in sorted(self.by_command.items()):
+            lines.append(f"  {name:<10} {count:>8}")
+        if self.by_command.get("pay"):
+            lines.append(f"  Total pago: R$ {self.total_paid:.2f}")
+        if self.errors:
+            lines.append("Erros:")
+            for line_number, command, message in self.errors:
+                lines.append(f"  linha {line_number} ({command}): {message}")
+        return "\n".join(lines)
+
+
+class BatchRunner:
+    """ Executa roteiros de comandos pela HRFacade. Relatórios são escritos em 'out'. """
+    def __init__(self, facade, out=None):
+        self._facade = facade
+        self._out = out if out is not None else sys.stdout
+        self._by_email = None
+        self._handlers = {
+            "hire": self._hire,
+            "remove": self._remove,
+            "train": self._train,
+            "evaluate": self._evaluate,
+            "punch": self._punch,
+            "pay": self._pay,
+            "report": self._report,
+        }
+
+    def _employee(self, reference: str):
+        """ Funcionário pelo id (número) ou pelo email. """
+        hr_system = self._facade._hr_system
+        if reference.isdigit():
+            employee = hr_system.get_employee_by_id(int(reference))
+        else:
+            if self._by_email is None:
+                self._by_email = {employee.email.lower(): employee for employee in hr_system.employees_list}
+            employee = self._by_email.get(reference.lower())
+        if employee is None:
+            raise ValueError(f"Funcionário não encontrado: '{reference}'")
+        return employee
+
+    def _index(self, reference: str) -> int:
+        return self._facade.index_of_id(self._employee(reference).employee_id)
+
+    @staticmethod
+    def _expect(args, *counts):
+        if len(args) not in counts:
+            expected = " ou ".join(str(count) for count in counts)
+            raise ValueError(f"Esperava {expected} argumento(s), recebido: {len(args)}")
+
+    @staticmethod
+    def _moment(value: str) -> datetime:
+        try:
+            return datetime.strptime(value.strip(), "%Y-%m-%d %H:%M")
+        except ValueError:
+            raise ValueError(f"Horário deve estar no formato 'YYYY-MM-DD HH:MM', recebido: '{value}'")
+
+    def _hire(self, args, result):
+        self._expect(args, 8)
+        emp_type, name, age, email, department, position, salary, hire_date = args
+        try:
+            emp_type, age, salary = int(emp_type), int(age), float(salary)
+        except ValueError:
+            raise ValueError(f"Tipo e idade devem ser inteiros e salário um número, recebido: {emp_type}, {age}, {salary}")
+        employee = self._facade.hire_employee(emp_type, name, age, email, department, position, salary, hire_date)
+        if self._by_email is not None:
+            self._by_email[employee.email.lower()] = employee
+
+    def _remove(self, args, result):
+        self._expect(args, 1)
+        employee = self._employee(args[0])
+        self._facade.remove_employee(self._facade.index_of_id(employee.employee_id))
+        if self._by_email is not None:
+            self._by_email.pop(employee.email.lower(), None)
+
+    def _train(self, args, result):
+        self._expect(args, 4)
+        reference, date, hour, description = args
+        CommandInvoker(AddTrainingCommand(self._employee(reference), date, hour, description)).run()
+
+    def _evaluate(self, args, result):
+        self._expect(args, 2)
+        try:
+            level = int(args[1])
+        except ValueError:
+            raise ValueError(f"Nível deve ser 1, 2 ou 3, recebido: '{args[1]}'")
+        CommandInvoker(AddPerformanceEvaluationCommand(self._employee(args[0]), level)).run()
+
+    def _punch(self, args, result):
+        self._expect(args, 3)
+        index = self._index(args[0])
+        self._facade._hr_system.attendance_list[index].add_record(self._moment(args[1]), self._moment(args[2]))
+
+    def _pay(self, args, result):
+        self._expect(args, 1, 3)
+        start = end = None
+        if len(args) == 3:
+            start = datetime.combine(parse_date(args[1], "Início do período"), day_time())
+            end = datetime.combine(parse_date(args[2], "Fim do período"), day_time())
+        result.total_paid += self._facade.calculate_payment(self._index(args[0]), start, end)
+
+    def _report(self, args, result):
+        self._expect(args, 2)
+        if args[1] not in REPORT_TYPES:
+            raise ValueError(f"Tipo de relatório inválido: {args[1]} (opções: {', '.join(REPORT_TYPES)})")
+        index = self._index(args[0])
+        with contextlib.redirect_stdout(self._out):
+            if args[1] == "attendance":
+                self._facade.generate_attendance_report(index)
+            else:
+                self._facade.generate_compliance_report(index)
+
+    def execute(self, line: str, result: BatchResult, line_number: int = 0):
+        """ Executa uma linha do roteiro, registrando o erro em 'result' em vez de propagá-lo. """
+        try:
+            tokens = shlex.split(line, comments=True)
+        except ValueError as e:
+            result.errors.append((line_number, line.strip(), f"Linha inválida: {str(e)}"))
+            return
+        if not tokens:
+            return
+        name, args = tokens[0].lower(), tokens[1:]
+        handler = self._handlers.get(name)
+        try:
+            if handler is None:
+                raise ValueError(f"Comando desconhecido: '{tokens[0]}' (opções: {', '.join(self._handlers)})")
+            handler(args, result)
+            result.executed += 1
+            result.by_command[name] = result.by_command.get(name, 0) + 1
+        except (HRSystemException, ValueError) as e:
+            result.errors.append((line_number, name, str(e)))
+
+    def run(self, lines) -> BatchResult:
+        """ Executa todas as linhas de 'lines' (arquivo aberto, stdin ou lista de strings). """
+        result = BatchResult()
+        started = perf_counter()
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            for line_number, line in enumerate(lines, 1):
+                self.execute(line, result, line_number)
+        result.seconds = perf_counter() - started
+        return result
+
+    def run_file(self, path: str) -> BatchResult:
+        """ Executa o roteiro do arquivo 'path' ('-' para a entrada padrão). """
+        if path == "-":
+            return self.run(sys.stdin)
+        try:
+            with open(path, encoding="utf-8") as f:
+                return self.run(f)
+        except OSError as e:
+            raise HRSystemException(f"Erro ao ler roteiro '{path}': {str(e)}")
@@ -0,0 +1,529 @@
+# benchmarks.py
+"""
+Suíte de benchmarks do sistema de RH.
+
+Gera organizações sintéticas determinísticas (mesma semente -> mesmos dados) e
+mede os caminhos críticos: contratação/remoção, ingestão de pontos, folha de
+pagamento via HRFacade, relatórios, exibição da hierarquia e memória.
+
+Uso:
+    python benchmarks.py                              # empresa de 1k funcionários
+    python benchmarks.py --sizes 1k,100k --output bench.json
+    python benchmarks.py --baseline baseline.json     # compara com um baseline salvo
+    python benchmarks.py --save-baseline baseline.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from batch import BatchRunner
+from commands import AddPerformanceEvaluationCommand, BatchCommandInvoker, CommandInvoker
+from facade import HRFacade
+from hr_system import HRSystem
+from models import Employee, Department
+from persistence import load_organization, save_organization
+from report_cache import REPORT_CACHE
+from sharding import ShardedHRSystem
+from scheduler import TimingWheel
+from simulation import Scenario
+from validation import EMPLOYEE_SCHEMA
+
+SIZES = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000}
+
+FIRST_NAMES = ["Ana", "Bruno", "Carla", "Diego", "Elisa", "Fabio", "Gabriela", "Hugo",
+               "Isabela", "João", "Karen", "Lucas", "Marina", "Nelson", "Olivia", "Pedro"]
+LAST_NAMES = ["Silva", "Souza", "Oliveira", "Santos", "Lima", "Costa", "Pereira", "Rocha"]
+DEPARTMENTS = ["Engenharia", "Recursos Humanos", "Financeiro", "Vendas", "Jurídico",
+               "Marketing", "Operações", "Suporte"]
+SEVERITIES = ["Baixa", "Média", "Alta"]
+TRAINING_TOPICS = ["Segurança do Trabalho", "Compliance", "Liderança", "Onboarding"]
+BASE_DATE = datetime(2024, 1, 1, 8, 0)
+
+
+@contextlib.contextmanager
+def _silenced():
+    """ Descarta a saída do sistema (que imprime a cada operação) durante a medição. """
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def _rss_kb():
+    """ Pico de memória residente do processo em KB (None se indisponível). """
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _measure(ops, fn):
+    start = time.perf_counter()
+    with _silenced():
+        fn()
+    seconds = time.perf_counter() - start
+    return {
+        "seconds": round(seconds, 6),
+        "ops": ops,
+        "ops_per_sec": round(ops / seconds, 2) if seconds > 0 else None,
+    }
+
+
+def reset_system():
+    """ Descarta o Singleton atual para que cada cenário comece com um sistema vazio. """
+    HRSystem._instance = None
+    Employee.number_of_employees = 0
+    REPORT_CACHE.clear()
+
+
+class SyntheticOrganization:
+    """
+    Gerador determinístico de uma empresa sintética.
+    Todos os dados derivam de 'random.Random(seed)', então execuções com a mesma
+    semente produzem exatamente a mesma organização.
+    """
+    def __init__(self, size, seed=42, punches_per_employee=20, tree_depth=6, branching=3):
+        self.size = size
+        self.seed = seed
+        self.punches_per_employee = punches_per_employee
+        self.tree_depth = tree_depth
+        self.branching = branching
+        self._rng = random.Random(seed)
+
+    def employee_records(self):
+        """ Gera as tuplas de contratação aceitas por HRFacade.hire_employee. """
+        rng = self._rng
+        for i in range(self.size):
+            emp_type = rng.choices((1, 2, 3), weights=(85, 10, 5))[0]
+            name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {i}"
+            yield (
+                emp_type, name, rng.randint(18, 65), f"user{i}@empresa.com",
+                rng.choice(DEPARTMENTS), "Analista", round(rng.uniform(15, 150), 2),
+                str(rng.randint(2010, 2024)),
+            )
+
+    def build_department_tree(self, employees):
+        """
+        Monta uma árvore de departamentos com 'tree_depth' níveis e distribui os
+        funcionários entre as folhas em round-robin.
+        """
+        root = Department("Empresa Sintética")
+        level = [root]
+        for depth in range(1, self.tree_depth + 1):
+            next_level = []
+            for parent_index, parent in enumerate(level):
+                for b in range(self.branching):
+                    child = Department(f"Depto {depth}.{parent_index}.{b}")
+                    parent.add_component(child)
+                    next_level.append(child)
+            level = next_level
+        for i, employee in enumerate(employees):
+            level[i % len(level)].add_component(employee)
+        return root
+
+    def punches(self, employee_index):
+        """ Pontos (entrada, saída) em dias consecutivos, com horários variados. """
+        rng = self._rng
+        for day in range(self.punches_per_employee):
+            clock_in = BASE_DATE + timedelta(days=day, minutes=rng.randint(-60, 90))
+            yield clock_in, clock_in + timedelta(minutes=rng.randint(240, 600))
+
+    def violations(self, employee_index):
+        rng = self._rng
+        for _ in range(rng.choices((0, 1, 2), weights=(80, 15, 5))[0]):
+            date = BASE_DATE + timedelta(days=rng.randint(0, 364))
+            yield date.strftime("%Y-%m-%d"), "Violação sintética", rng.choice(SEVERITIES)
+
+    def trainings(self, employee_index):
+        """ Sessões em dias distintos, para não gerar conflitos de agenda. """
+        rng = self._rng
+        day = 0
+        for _ in range(rng.randint(0, 3)):
+            day += rng.randint(1, 120)
+            date = BASE_DATE + timedelta(days=day, hours=rng.randint(0, 8))
+            yield date.strftime("%Y-%m-%d"), date.strftime("%H:%M"), rng.choice(TRAINING_TOPICS)
+
+    def leaves(self, employee_index):
+        """ Afastamentos sem sobreposição, em ordem cronológica. """
+        rng = self._rng
+        day = BASE_DATE.date()
+        for _ in range(rng.randint(0, 2)):
+            start = day + timedelta(days=rng.randint(0, 150))
+            end = start + timedelta(days=rng.randint(0, 14))
+            yield start.isoformat(), end.isoformat(), "Férias"
+            day = end + timedelta(days=1)
+
+    def shift_deadlines(self, count, max_shift_minutes=720):
+        """ Prazos (em ticks de 1 minuto) de turnos abertos ao longo de um dia, para a roda de tempo. """
+        rng = self._rng
+        return [rng.randint(0, 1440) + max_shift_minutes for _ in range(count)]
+
+    def evaluations(self, employee_index):
+        rng = self._rng
+        return [rng.choice((1, 2, 3)) for _ in range(rng.randint(0, 4))]
+
+
+def run_size(label, size, seed, punches_per_employee, sample, punch_log=False):
+    """ Executa todos os cenários para uma empresa de 'size' funcionários. """
+    reset_system()
+    org = SyntheticOrganization(size, seed=seed, punches_per_employee=punches_per_employee)
+    facade = HRFacade()
+    hr_system = HRSystem.get_instance()
+    results = {"employees": size}
+    rss_before = _rss_kb()
+
+    records = list(org.employee_records())
+    # Validação pura (sem contratar): registros válidos e versões com três campos inválidos cada
+    invalid_records = [(4, "", age, email, dept, pos, -salary, date) for _, _, age, email, dept, pos, salary, date in records]
+    results["validate_valid"] = _measure(size, lambda: [EMPLOYEE_SCHEMA.validate(*r) for r in records])
+    results["validate_invalid"] = _measure(size, lambda: [EMPLOYEE_SCHEMA.validate(*r) for r in invalid_records])
+    results["hire"] = _measure(size, lambda: [facade.hire_employee(*r) for r in records])
+    employees = facade.get_employee_list()
+
+    def ingest():
+        for i, attendance in enumerate(hr_system.attendance_list):
+            for clock_in, clock_out in org.punches(i):
+                attendance.add_record(clock_in, clock_out)
+    results["punch_ingestion"] = _measure(size * punches_per_employee, ingest)
+
+    def live_punches():
+        for attendance in hr_system.attendance_list[:sample]:
+            attendance.clock_in()
+            attendance.clock_out()
+    results["live_clock_in_out"] = _measure(min(sample, size), live_punches)
+
+    # Painel de presença: consultas com parte da amostra de ponto aberto
+    with _silenced():
+        for attendance in hr_system.attendance_list[:sample]:
+            attendance.clock_in()
+    departments = sorted({employee.department for employee in employees})
+    results["presence_headcount"] = _measure(
+        sample, lambda: [facade.headcount(departments[i % len(departments)]) for i in range(sample)])
+    results["presence_by_department"] = _measure(sample, lambda: [facade.headcount_by_department() for _ in range(sample)])
+    results["presence_who_is_in"] = _measure(1, facade.who_is_in)
+    with _silenced():
+        for attendance in hr_system.attendance_list[:sample]:
+            attendance.clock_out()
+
+    # Roda de tempo dos turnos abertos: um prazo por turno (10 por funcionário), metade cancelada por clock out
+    shifts = size * 10
+    wheel = TimingWheel(start=0)
+    deadlines = org.shift_deadlines(shifts)
+    results["shift_wheel_schedule"] = _measure(
+        shifts, lambda: [wheel.schedule(key, deadline) for key, deadline in enumerate(deadlines)])
+    results["shift_wheel_cancel"] = _measure(shifts // 2, lambda: [wheel.cancel(key) for key in range(0, shifts, 2)])
+    results["shift_wheel_expire"] = _measure(shifts - shifts // 2, lambda: wheel.advance(max(deadlines)))
+
+    def populate_sub_records():
+        for i, employee in enumerate(employees):
+            for date, description, severity in org.violations(i):
+                hr_system.compliance_list[i].add_violation(date, description, severity)
+            for date, hour, description in org.trainings(i):
+                employee.add_training(date, hour, description)
+            for level in org.evaluations(i):
+                employee.add_performance_evaluation(level)
+            for start, end, reason in org.leaves(i):
+                employee.add_leave_request(start, end, reason)
+    results["sub_records"] = _measure(size, populate_sub_records)
+
+    with _silenced():
+        company = org.build_department_tree(employees)
+
+    rss_after = _rss_kb()
+    results["memory"] = {
+        "rss_peak_kb": rss_after,
+        "rss_growth_kb": rss_after - rss_before if rss_after is not None else None,
+        "bytes_per_employee": round((rss_after - rss_before) * 1024 / size, 1) if rss_after is not None else None,
+    }
+
+    results["payroll"] = _measure(size, lambda: [facade.calculate_payment(i) for i in range(size)])
+    # Tabela progressiva com muitas faixas: o custo por funcionário deve ficar estável
+    facade.configure_tax_engine({
+        "tax_brackets": [{"from": i * 50.0, "rate": min(0.35, i * 0.001)} for i in range(500)],
+        "deductions": [{"name": "Previdência", "rate": 0.075}],
+        "bonus_rates": {"Manager": 0.20},
+    })
+    results["payroll_tax_engine"] = _measure(size, lambda: [facade.calculate_payment(i) for i in range(size)])
+    results["payroll_simulation_tax_engine"] = _measure(1, lambda: facade.simulate_payroll([]))
+    facade.configure_tax_engine(None)
+    period_start = BASE_DATE.replace(day=1, hour=0, minute=0)
+    period_end = period_start + timedelta(days=7)
+    results["payroll_period"] = _measure(
+        size, lambda: [facade.calculate_payment(i, period_start, period_end) for i in range(size)])
+
+    # 50 cenários "e se" (reajustes, bônus, imposto) sobre a empresa inteira, sem alterar ninguém
+    scenarios = [Scenario(f"Reajuste {i}%", salary_raise=i / 100) for i in range(40)]
+    scenarios += [Scenario(f"{dept} +5%", department_raises={dept: 0.05}) for dept in DEPARTMENTS[:5]]
+    scenarios += [Scenario(f"Imposto {rate:.0%}", tax_rate=rate) for rate in (0.10, 0.12, 0.18, 0.20, 0.25)]
+    results["payroll_simulation"] = _measure(len(scenarios), lambda: facade.simulate_payroll(scenarios))
+
+    def snapshot_payroll():
+        # Folha sobre um snapshot enquanto metade dos funcionários continua batendo ponto
+        with facade.snapshot() as snapshot:
+            for i in range(size):
+                if i % 2 == 0:
+                    hr_system.attendance_list[i].add_record(
+                        BASE_DATE + timedelta(days=400), BASE_DATE + timedelta(days=400, hours=1))
+                facade.calculate_payment(i, period_start, period_end, snapshot=snapshot)
+    results["snapshot_open"] = _measure(1, lambda: facade.snapshot().close())
+    results["payroll_snapshot_with_writes"] = _measure(size, snapshot_payroll)
+
+    results["monthly_summary"] = _measure(
+        size, lambda: [attendance.monthly_summary() for attendance in hr_system.attendance_list])
+
+    report_indexes = range(min(sample, size))
+    results["attendance_report"] = _measure(
+        len(report_indexes), lambda: [facade.generate_attendance_report(i) for i in report_indexes])
+    results["compliance_report"] = _measure(
+        len(report_indexes), lambda: [facade.generate_compliance_report(i) for i in report_indexes])
+
+    def incremental_reports():
+        # Um ponto novo por funcionário desde o último relatório: só a linha nova é formatada
+        for i in report_indexes:
+            hr_system.attendance_list[i].add_record(
+                BASE_DATE + timedelta(days=500), BASE_DATE + timedelta(days=500, hours=1))
+            facade.generate_attendance_report(i)
+    results["attendance_report_incremental"] = _measure(len(report_indexes), incremental_reports)
+    results["report_cache_chars"] = REPORT_CACHE.size
+
+    quarter_start, quarter_end = BASE_DATE.date(), (BASE_DATE + timedelta(days=89)).date()
+    results["high_severity_query"] = _measure(
+        1, lambda: facade.find_violations("Alta", quarter_start, quarter_end))
+    results["top_risk_50"] = _measure(1, lambda: facade.top_risk_employees(50))
+    results["training_calendar_week"] = _measure(
+        1, lambda: hr_system.indexes.trainings.upcoming(7, now=BASE_DATE))
+    cycle_sample = employees[:min(sample, size)]
+    results["evaluation_cycle_single"] = _measure(
+        len(cycle_sample), lambda: [CommandInvoker(AddPerformanceEvaluationCommand(e, 2)).run() for e in cycle_sample])
+    results["evaluation_cycle_batch"] = _measure(
+        size, lambda: BatchCommandInvoker(AddPerformanceEvaluationCommand(e, 2) for e in employees).run())
+    results["performance_rollup"] = _measure(
+        2, lambda: (facade.performance_distribution(), facade.employees_trending_to_bad()))
+    results["employee_search"] = _measure(
+        100, lambda: [facade.search_employees(FIRST_NAMES[i % len(FIRST_NAMES)][:3]) for i in range(100)])
+    results["who_is_out"] = _measure(
+        30, lambda: [facade.employees_on_leave(BASE_DATE.date() + timedelta(days=d)) for d in range(30)])
+    results["list_page_by_id"] = _measure(1, lambda: facade.list_employees(limit=50))
+    results["list_page_by_salary"] = _measure(1, lambda: facade.list_employees(limit=50, sort_by="salary"))
+    results["list_stream_all"] = _measure(size, lambda: sum(1 for _ in facade.iter_employees(page_size=1000)))
+    results["list_stream_by_name"] = _measure(
+        size, lambda: sum(1 for _ in facade.iter_employees(sort_by="name", page_size=100)))
+
+    results["hierarchy_display"] = _measure(size, company.display_hierarchy)
+    first_branch = company._children[0]
+    results["ancestry_membership"] = _measure(
+        size, lambda: [employee.is_under(first_branch) for employee in employees])
+    probe = Department("Depto temporário")
+
+    def membership_with_writes():
+        # Cada consulta vem logo depois de uma alteração da árvore (o nested set nunca está em dia)
+        for employee in employees:
+            first_branch.add_component(probe)
+            employee.is_under(first_branch)
+            first_branch.remove_component(probe)
+    results["ancestry_membership_with_writes"] = _measure(size, membership_with_writes)
+    results["ancestry_chain"] = _measure(size, lambda: [employee.ancestors() for employee in employees])
+    results["hierarchy_render_json"] = _measure(
+        size, lambda: facade.render_hierarchy(company, io.StringIO(), "json"))
+    results["hierarchy_page_subtree"] = _measure(
+        1, lambda: facade.render_hierarchy(company, io.StringIO(), "outline", subtree="Depto 1.0.0", limit=100))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Partida rápida: comparar com hire + punch_ingestion + sub_records (o caminho da Facade)
+        snapshot_path = os.path.join(tmp, "organization.snap")
+        results["org_snapshot_save"] = _measure(size, lambda: save_organization(snapshot_path, hr_system, company))
+        results["org_snapshot_bytes"] = os.path.getsize(snapshot_path)
+
+        def startup_from_snapshot():
+            HRSystem._instance = None
+            load_organization(snapshot_path, HRSystem.get_instance())
+        results["startup_from_snapshot"] = _measure(size, startup_from_snapshot)
+        HRSystem._instance = hr_system
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Extração completa (todas as tabelas); 'ops' = linhas exportadas
+        for fmt in ("csv", "jsonl"):
+            for parallel, suffix in ((False, ""), (True, "_parallel")):
+                export = facade.export_data(os.path.join(tmp, fmt + suffix), fmt, parallel=parallel)
+                results[f"export_{fmt}{suffix}"] = {
+                    "seconds": export["seconds"], "ops": export["rows"], "ops_per_sec": export["rows_per_sec"],
+                }
+
+    if punch_log:
+        with tempfile.TemporaryDirectory() as tmp:
+            results["punch_log_migration"] = _measure(
+                size * punches_per_employee, lambda: facade.enable_punch_log(os.path.join(tmp, "punches.bin")))
+            results["payroll_punch_log"] = _measure(
+                size, lambda: [facade.calculate_payment(i) for i in range(size)])
+            results["hours_punch_log_bulk"] = _measure(
+                size * punches_per_employee, hr_system.punch_log.totals_by_employee)
+            hr_system.punch_log.close()
+
+    # Modo em lote (main.py --batch): avaliações e folhas por id, sem menus
+    script = [f"evaluate {employee.employee_id} 2" for employee in employees[:sample]]
+    script += [f"pay {employee.employee_id}" for employee in employees[:sample]]
+    results["batch_script"] = _measure(len(script), lambda: BatchRunner(facade).run(script))
+
+    rng = random.Random(seed)
+    removals = min(sample, size)
+
+    def remove():
+        for _ in range(removals):
+            facade.remove_employee(rng.randrange(len(hr_system.employees_list)))
+    results["remove"] = _measure(removals, remove)
+
+    reset_system()
+    return results
+
+
+def run_sharded(size, seed, punches_per_employee, shard_counts):
+    """
+    Escalabilidade do modo particionado: mesma empresa sintética distribuída em
+    1, 2, 4... processos. As métricas ficam como 'sharded_<n>_<operação>'.
+    """
+    results = {}
+    for num_shards in shard_counts:
+        org = SyntheticOrganization(size, seed=seed, punches_per_employee=punches_per_employee)
+        records = list(org.employee_records())
+        with ShardedHRSystem(num_shards) as sharded:
+            prefix = f"sharded_{num_shards}_"
+            employee_ids = []
+            results[prefix + "hire"] = _measure(size, lambda: employee_ids.extend(sharded.hire_employees(records)))
+            punches = [
+                (employee_id, clock_in, clock_out)
+                for i, employee_id in enumerate(employee_ids) for clock_in, clock_out in org.punches(i)
+            ]
+            results[prefix + "punch_ingestion"] = _measure(len(punches), lambda: sharded.add_records(punches))
+            results[prefix + "payroll"] = _measure(size, sharded.run_payroll)
+            period_start = BASE_DATE.replace(day=1, hour=0, minute=0)
+            results[prefix + "payroll_period"] = _measure(
+                size, lambda: sharded.run_payroll(period_start, period_start + timedelta(days=7)))
+    return results
+
+
+def best_of(runs):
+    """ Combina repetições mantendo, para cada métrica temporizada, a execução mais rápida. """
+    best = dict(runs[0])
+    for run in runs[1:]:
+        for name, value in run.items():
+            if isinstance(value, dict) and "seconds" in value and value["seconds"] < best[name]["seconds"]:
+                best[name] = value
+    return best
+
+
+def compare(current, baseline, threshold):
+    """
+    Compara os tempos atuais com um baseline salvo.
+    Retorna a lista de linhas de comparação; 'regression' indica piora acima do limite.
+    """
+    rows = []
+    for size_label, metrics in current["results"].items():
+        base_metrics = baseline.get("results", {}).get(size_label)
+        if not base_metrics:
+            continue
+        for name, value in metrics.items():
+            base_value = base_metrics.get(name)
+            if not isinstance(value, dict) or "seconds" not in value or not isinstance(base_value, dict):
+                continue
+            if not base_value.get("seconds"):
+                continue
+            ratio = value["seconds"] / base_value["seconds"]
+            rows.append({
+                "size": size_label,
+                "metric": name,
+                "baseline_seconds": base_value["seconds"],
+                "current_seconds": value["seconds"],
+                "ratio": round(ratio, 3),
+                "regression": ratio > 1 + threshold,
+            })
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks do sistema de RH")
+    parser.add_argument("--sizes", default="1k", help=f"Tamanhos separados por vírgula ({', '.join(SIZES)})")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--punches", type=int, default=20, help="Pontos por funcionário")
+    parser.add_argument("--sample", type=int, default=1000, help="Amostra para relatórios, pontos ao vivo e remoções")
+    parser.add_argument("--punch-log", action="store_true", help="Também mede a folha com o log binário de pontos")
+    parser.add_argument("--shards", default="", help="Quantidades de shards para o cenário particionado (ex: 1,2,4)")
+    parser.add_argument("--output", help="Arquivo JSON de saída (padrão: stdout)")
+    parser.add_argument("--baseline", help="Baseline JSON para comparação")
+    parser.add_argument("--save-baseline", help="Salva os resultados como novo baseline")
+    parser.add_argument("--repeat", type=int, default=1, help="Repetições por tamanho (mantém o melhor tempo)")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Tolerância de regressão (0.10 = 10%%)")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args(argv)
+
+    labels = [label.strip().lower() for label in args.sizes.split(",") if label.strip()]
+    unknown = [label for label in labels if label not in SIZES]
+    if unknown:
+        parser.error(f"Tamanhos desconhecidos: {', '.join(unknown)}")
+    try:
+        shard_counts = [int(count) for count in args.shards.split(",") if count.strip()]
+    except ValueError:
+        parser.error(f"Quantidades de shards inválidas: {args.shards}")
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "punches_per_employee": args.punches,
+            "sample": args.sample,
+            "repeat": args.repeat,
+            "punch_log": args.punch_log,
+            "shards": shard_counts,
+            "cpu_count": os.cpu_count(),
+        },
+        "results": {},
+    }
+    for label in labels:
+        print(f"Executando cenário {label} ({SIZES[label]} funcionários)...", file=sys.stderr)
+        runs = [
+            {**run_size(label, SIZES[label], args.seed, args.punches, args.sample, args.punch_log),
+             **run_sharded(SIZES[label], args.seed, args.punches, shard_counts)}
+            for _ in range(max(1, args.repeat))
+        ]
+        report["results"][label] = best_of(runs)
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        report["comparison"] = compare(report, baseline, args.threshold)
+        regressions = [row for row in report["comparison"] if row["regression"]]
+        for row in report["comparison"]:
+            flag = "REGRESSÃO" if row["regression"] else "ok"
+            print(f"{row['size']:>5} {row['metric']:<20} {row['baseline_seconds']:>10.4f}s -> "
+                  f"{row['current_seconds']:>10.4f}s  x{row['ratio']:<6} {flag}", file=sys.stderr)
+
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    else:
+        print(output)
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            f.write(output)
+
+    if regressions and args.fail_on_regression:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,80 +4,60 @@
 # de construção.
 
 from models import Employee, Manager, Intern
-from exceptions import (
-    InvalidEmployeeTypeException, InvalidEmployeeDataException,
-    HRSystemException
-)
+from validation import EMPLOYEE_SCHEMA
+from exceptions import InvalidEmployeeDataException, HRSystemException
 
 class EmployeeBuilder:
     """
     Esta classe nos ajuda a construir um objeto Employee passo a passo.
+    Cada passo valida o seu campo com as regras do EMPLOYEE_SCHEMA (validation.py).
     """
     def __init__(self, name, age, email):
-        try:
-            if not name or not isinstance(name, str) or len(name.strip()) == 0:
-                raise InvalidEmployeeDataException("Nome não pode ser vazio")
-            if not isinstance(age, int) or age <= 0:
-                raise InvalidEmployeeDataException(f"Idade deve ser um número inteiro positivo, recebido: {age}")
-            if not email or not isinstance(email, str) or len(email.strip()) == 0:
-                raise InvalidEmployeeDataException("Email não pode ser vazio")
-            
-            # Atributos essenciais são passados no início
-            self.name = name.strip()
-            self.age = age
-            self.email = email.strip()
-            # Outros atributos começam com valores padrão
-            self.department = "Not Assigned"
-            self.work_position = "Not Assigned"
-            self.salary_per_hour = 0
-            self.hire_date = "Not Defined"
-            self.emp_type = 1 # 1 para Employee padrão
-        except InvalidEmployeeDataException as e:
-            raise
-        except Exception as e:
-            raise HRSystemException(f"Erro ao inicializar builder: {str(e)}")
+        # Atributos essenciais são passados no início
+        self.name = self._checked("name", name)
+        self.age = self._checked("age", age)
+        self.email = self._checked("email", email)
+        # Outros atributos começam com valores padrão
+        self.department = "Not Assigned"
+        self.work_position = "Not Assigned"
+        self.salary_per_hour = 0
+        self.hire_date = "Not Defined"
+        self.emp_type = 1 # 1 para Employee padrão
+
+    @staticmethod
+    def _checked(field, value):
+        value, error = EMPLOYEE_SCHEMA.validate_field(field, value)
+        if error is not None:
+            raise error.error_class(error.message)
+        return value
+
+    @classmethod
+    def from_record(cls, record: dict):
+        """ Builder preenchido com um registro já validado e normalizado pelo EMPLOYEE_SCHEMA (sem revalidar). """
+        builder = cls.__new__(cls)
+        builder.name = record["name"]
+        builder.age = record["age"]
+        builder.email = record["email"]
+        builder.department = record["department"]
+        builder.work_position = record["work_position"]
+        builder.salary_per_hour = record["salary"]
+        builder.hire_date = record["hire_date"]
+        builder.emp_type = record["emp_type"]
+        return builder
 
     def set_type(self, emp_type):
-        try:
-            if not isinstance(emp_type, int):
-                raise TypeError(f"Tipo de funcionário deve ser um número inteiro, recebido: {type(emp_type).__name__}")
-            if emp_type not in [1, 2, 3]:
-                raise InvalidEmployeeTypeException(f"Tipo de funcionário deve ser 1, 2 ou 3, recebido: {emp_type}")
-            self.emp_type = emp_type
-            return self # Retornar 'self' permite encadear chamadas
-        except (TypeError, InvalidEmployeeTypeException) as e:
-            raise InvalidEmployeeTypeException(f"Erro ao definir tipo de funcionário: {str(e)}")
+        self.emp_type = self._checked("emp_type", emp_type)
+        return self # Retornar 'self' permite encadear chamadas
 
     def set_details(self, department, work_position, hire_date):
-        try:
-            if not department or not isinstance(department, str) or len(department.strip()) == 0:
-                raise InvalidEmployeeDataException("Departamento não pode ser vazio")
-            if work_position is None:
-                work_position = "Not Assigned"
-            if hire_date is None:
-                hire_date = "Not Defined"
-            
-            self.department = department.strip()
-            self.work_position = str(work_position).strip() if work_position else "Not Assigned"
-            self.hire_date = str(hire_date).strip() if hire_date else "Not Defined"
-            return self
-        except InvalidEmployeeDataException as e:
-            raise
-        except Exception as e:
-            raise HRSystemException(f"Erro ao definir detalhes do funcionário: {str(e)}")
+        self.department = self._checked("department", department)
+        self.work_position = self._checked("work_position", work_position)
+        self.hire_date = self._checked("hire_date", hire_date)
+        return self
 
     def set_salary(self, salary_per_hour):
-        try:
-            if not isinstance(salary_per_hour, (int, float)):
-                raise TypeError(f"Salário deve ser um número, recebido: {type(salary_per_hour).__name__}")
-            if salary_per_hour <= 0:
-                raise InvalidEmployeeDataException(f"Salário deve ser um número positivo, recebido: {salary_per_hour}")
-            if salary_per_hour > 10000:
-                raise InvalidEmployeeDataException(f"Salário por hora não pode exceder R$ 10.000,00, recebido: R$ {salary_per_hour:.2f}")
-            self.salary_per_hour = float(salary_per_hour)
-            return self
-        except (TypeError, InvalidEmployeeDataException) as e:
-            raise InvalidEmployeeDataException(f"Erro ao definir salário: {str(e)}")
+        self.salary_per_hour = self._checked("salary", salary_per_hour)
+        return self
 
     def build(self):
         """
@@ -1,9 +1,12 @@
 # commands.py
+from time import perf_counter
 from abc import ABC, abstractmethod
-from models import Employee
+from bisect import insort
+from models import Employee, Subject, find_training_conflict, MIN_SALARY_PER_HOUR, MAX_SALARY_PER_HOUR
+from indexes import parse_datetime
 from exceptions import (
     InvalidPerformanceLevelException, InvalidIndexException,
-    HRSystemException
+    TrainingConflictException, HRSystemException
 )
 
 # PADRÃO COMPORTAMENTAL 4: COMMAND
@@ -17,6 +20,21 @@ class Command(ABC):
     def execute(self):
         pass
 
+    def validate(self, batch_state: dict):
+        """
+        Verificação sem efeitos colaterais feita pelo BatchCommandInvoker antes de
+        executar o lote. 'batch_state' é compartilhado entre os comandos do lote
+        (ex: para detectar conflitos entre dois comandos do mesmo lote).
+        """
+        pass
+
+    def apply(self):
+        """ Executa sem mensagens (usado em lote). Por padrão, igual a 'execute'. """
+        self.execute()
+
+    def undo(self):
+        raise HRSystemException(f"Comando {type(self).__name__} não pode ser desfeito")
+
 class AddTrainingCommand(Command):
     def __init__(self, employee: Employee, date: str, time: str, description: str):
         try:
@@ -38,13 +56,33 @@ class AddTrainingCommand(Command):
         except (ValueError, TypeError) as e:
             raise HRSystemException(f"Erro ao criar comando de treinamento: {str(e)}")
 
+    def validate(self, batch_state: dict):
+        start = parse_datetime(self._date, self._time, "Data do treinamento")
+        neighbor = self._employee.training_conflict(start)
+        pending = batch_state.setdefault(("training", self._employee.employee_id), [])
+        if neighbor is None:
+            neighbor = find_training_conflict(pending, start)
+        if neighbor is not None:
+            raise TrainingConflictException(
+                f"{self._employee.name} já tem um treinamento em {neighbor.strftime('%Y-%m-%d %H:%M')}, "
+                f"conflitante com {start.strftime('%Y-%m-%d %H:%M')}"
+            )
+        insort(pending, start)
+
+    def apply(self):
+        self._position = self._employee.add_training(self._date, self._time, self._description)
+
     def execute(self):
         try:
-            self._employee.add_training(self._date, self._time, self._description)
+            self.apply()
             print(f"Sessão de treinamento '{self._description}' adicionada para {self._employee.name}.")
         except Exception as e:
             raise HRSystemException(f"Erro ao executar comando de adicionar treinamento: {str(e)}")
 
+    def undo(self):
+        # O lote desfaz em ordem inversa, então a posição de inserção ainda é válida
+        self._employee.remove_training(self._position)
+
 class AddPerformanceEvaluationCommand(Command):
     def __init__(self, employee: Employee, level: int):
         try:
@@ -64,15 +102,78 @@ class AddPerformanceEvaluationCommand(Command):
         except (ValueError, TypeError, InvalidPerformanceLevelException) as e:
             raise HRSystemException(f"Erro ao criar comando de avaliação: {str(e)}")
 
+    def apply(self):
+        self._position = self._employee.add_performance_evaluation(self._level)
+
     def execute(self):
         try:
-            self._employee.add_performance_evaluation(self._level)
+            self.apply()
             print(f"Avaliação de performance adicionada para {self._employee.name}.")
         except InvalidPerformanceLevelException as e:
             raise
         except Exception as e:
             raise HRSystemException(f"Erro ao executar comando de adicionar avaliação: {str(e)}")
 
+    def undo(self):
+        self._employee.remove_performance_evaluation(self._position)
+
+class UpdateSalaryCommand(Command):
+    def __init__(self, employee: Employee, salary_per_hour: float):
+        try:
+            if employee is None:
+                raise ValueError("Funcionário não pode ser None")
+            if not isinstance(employee, Employee):
+                raise TypeError(f"Objeto deve ser uma instância de Employee, recebido: {type(employee).__name__}")
+            if not isinstance(salary_per_hour, (int, float)) or salary_per_hour <= 0:
+                raise ValueError(f"Salário deve ser um número positivo, recebido: {salary_per_hour}")
+            
+            self._employee = employee
+            self._salary_per_hour = salary_per_hour
+            self._previous_salary = None
+        except (ValueError, TypeError) as e:
+            raise HRSystemException(f"Erro ao criar comando de reajuste: {str(e)}")
+
+    def validate(self, batch_state: dict):
+        # Mesma faixa do setter Employee.salary_per_hour, para o lote ser rejeitado antes de começar
+        if not MIN_SALARY_PER_HOUR <= self._salary_per_hour <= MAX_SALARY_PER_HOUR:
+            raise HRSystemException(
+                f"Salário por hora de {self._employee.name} deve estar entre R$ {MIN_SALARY_PER_HOUR:.2f} "
+                f"e R$ {MAX_SALARY_PER_HOUR:.2f}, recebido: R$ {self._salary_per_hour:.2f}"
+            )
+
+    def apply(self):
+        self._previous_salary = self._employee.salary_per_hour
+        self._employee.salary_per_hour = self._salary_per_hour
+
+    def execute(self):
+        try:
+            self.apply()
+            print(f"Salário de {self._employee.name} atualizado para R$ {self._employee.salary_per_hour:.2f}/h.")
+        except Exception as e:
+            raise HRSystemException(f"Erro ao executar comando de reajuste: {str(e)}")
+
+    def undo(self):
+        self._employee.salary_per_hour = self._previous_salary
+
+class ExportDataCommand(Command):
+    """ Exporta os dados brutos da empresa via Facade e informa linhas/s por tabela. """
+    def __init__(self, facade, directory: str, fmt: str = "csv", tables=None, parallel: bool = False):
+        if not isinstance(directory, str) or len(directory.strip()) == 0:
+            raise HRSystemException("Erro ao criar comando de exportação: Diretório não pode ser vazio")
+        self._facade = facade
+        self._directory = directory.strip()
+        self._fmt = fmt
+        self._tables = tables
+        self._parallel = parallel
+        self.result = None
+
+    def execute(self):
+        self.result = self._facade.export_data(self._directory, self._fmt, self._tables, self._parallel)
+        for table, stats in self.result["tables"].items():
+            print(f"  {table:<12} {stats['rows']:>10} linhas  {stats['rows_per_sec'] or 0:>12.0f} linhas/s  -> {stats['path']}")
+        print(f"Exportação concluída: {self.result['rows']} linhas em {self.result['seconds']:.2f}s "
+              f"({self.result['rows_per_sec'] or 0:.0f} linhas/s).")
+
 class CommandInvoker:
     def __init__(self, command: Command):
         try:
@@ -88,4 +189,91 @@ class CommandInvoker:
         try:
             self._command.execute()
         except Exception as e:
-            raise HRSystemException(f"Erro ao executar comando: {str(e)}")
\ No newline at end of file
+            raise HRSystemException(f"Erro ao executar comando: {str(e)}")
+
+class BatchCommandInvoker:
+    """
+    Executa muitos comandos como uma unidade: valida todos antes de começar,
+    executa em uma única passada sem mensagens por comando, adia as notificações
+    dos Observers para um único envio no final e mantém um log de desfazer.
+    Se um comando falhar, os já executados são desfeitos em ordem inversa.
+    """
+    def __init__(self, commands=None):
+        self._commands = []
+        for command in commands or ():
+            self.add(command)
+
+    def add(self, command: Command):
+        if command is None:
+            raise HRSystemException("Erro ao adicionar comando ao lote: Comando não pode ser None")
+        if not isinstance(command, Command):
+            raise HRSystemException(
+                f"Erro ao adicionar comando ao lote: Objeto deve ser uma instância de Command, "
+                f"recebido: {type(command).__name__}"
+            )
+        self._commands.append(command)
+
+    def __len__(self):
+        return len(self._commands)
+
+    def validate(self) -> list:
+        """ Retorna a lista de (posição, erro) dos comandos inválidos, sem executar nada. """
+        batch_state = {}
+        errors = []
+        for position, command in enumerate(self._commands, 1):
+            try:
+                command.validate(batch_state)
+            except Exception as e:
+                errors.append((position, str(e)))
+        return errors
+
+    def run(self) -> dict:
+        errors = self.validate()
+        if errors:
+            details = "; ".join(f"comando {position}: {message}" for position, message in errors[:5])
+            more = f" (e mais {len(errors) - 5})" if len(errors) > 5 else ""
+            raise HRSystemException(f"Lote rejeitado, {len(errors)} comando(s) inválido(s): {details}{more}")
+
+        started = perf_counter()
+        undo_log = []
+        Subject.defer_notifications()
+        try:
+            try:
+                for command in self._commands:
+                    command.apply()
+                    undo_log.append(command)
+            except Exception as e:
+                failed_at = len(undo_log) + 1
+                try:
+                    for command in reversed(undo_log):
+                        command.undo()
+                except Exception as undo_error:
+                    Subject.flush_notifications()
+                    raise HRSystemException(
+                        f"Comando {failed_at} do lote falhou ({str(e)}) e o rollback também falhou: {str(undo_error)}"
+                    )
+                Subject.flush_notifications(discard=True)
+                raise HRSystemException(
+                    f"Lote desfeito: comando {failed_at} falhou e {len(undo_log)} comando(s) foram revertidos: {str(e)}"
+                )
+            notified = Subject.flush_notifications()
+        finally:
+            # Interrupções (ex: KeyboardInterrupt) não podem deixar o adiamento ligado para o processo todo
+            if Subject._pending_notifications is not None:
+                Subject.flush_notifications(discard=True)
+
+        by_type = {}
+        for command in self._commands:
+            by_type[type(command).__name__] = by_type.get(type(command).__name__, 0) + 1
+        summary = {
+            "executed": len(self._commands),
+            "by_type": by_type,
+            "notified": notified,
+            "seconds": perf_counter() - started,
+        }
+        print(
+            f"Lote executado: {summary['executed']} comando(s) "
+            f"({', '.join(f'{name}: {count}' for name, count in by_type.items())}), "
+            f"{notified} notificação(ões) em {summary['seconds']:.3f}s."
+        )
+        return summary
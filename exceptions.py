@@ -96,3 +96,39 @@ class ListSynchronizationException(HRSystemException):
     """Exceção lançada quando as listas do sistema estão dessincronizadas."""
     pass
 
+
+class InvalidSeverityException(HRSystemException):
+    """Exceção lançada quando a gravidade de uma violação é inválida."""
+    pass
+
+class LeaveOverlapException(HRSystemException):
+    """Exceção lançada quando uma solicitação de afastamento se sobrepõe a outra do mesmo funcionário."""
+    pass
+
+class TrainingConflictException(HRSystemException):
+    """Exceção lançada quando um treinamento conflita com outro já agendado para o funcionário."""
+    pass
+
+class ReadOnlySnapshotException(HRSystemException):
+    """Exceção lançada ao tentar alterar dados lidos de um snapshot (somente leitura) ou já fechado."""
+    pass
+
+class PersistenceException(HRSystemException):
+    """Exceção lançada ao gravar ou carregar um snapshot binário da organização."""
+    pass
+
+class ExportException(HRSystemException):
+    """Exceção lançada ao exportar os dados da empresa (CSV/JSONL)."""
+    pass
+
+class SimulationException(HRSystemException):
+    """Exceção lançada quando um cenário de simulação de folha é inválido."""
+    pass
+
+class TaxConfigException(HRSystemException):
+    """Exceção lançada quando a configuração de imposto/bônus (tax_engine.py) é inválida."""
+    pass
+
+class SchedulerException(HRSystemException):
+    """Exceção lançada quando a configuração do ShiftScheduler (turnos esquecidos) é inválida."""
+    pass
@@ -0,0 +1,204 @@
+# exporters.py
+"""
+Exportação em streaming dos dados brutos da empresa (CSV ou JSONL) para
+ferramentas de BI e contabilidade.
+
+Cada tabela tem um esquema estável (EXPORT_SCHEMAS: colunas em ordem fixa) e é
+gravada em um arquivo próprio, '<tabela>.csv' ou '<tabela>.jsonl'. As linhas
+saem de geradores e são escritas em blocos de 'chunk_rows', então a memória
+não cresce com o tamanho da empresa. A leitura é feita sobre um snapshot do
+HRSystem: a exportação é consistente mesmo com pontos sendo batidos durante a
+extração. Com 'parallel=True' cada tabela é exportada em um processo próprio,
+criado por fork depois de aberto o snapshot: os filhos herdam o snapshot sem
+copiá-lo nem serializá-lo, e a formatação das linhas (CPU) não disputa o GIL.
+Sem fork (Windows) ou com uma única CPU, as tabelas são exportadas em sequência.
+"""
+
+import csv
+import itertools
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from models import PERFORMANCE_LEVELS
+from exceptions import ExportException, HRSystemException
+
+FORMATS = ("csv", "jsonl")
+CHUNK_ROWS = 5000
+
+# Snapshot herdado pelos processos da exportação paralela (definido antes do fork)
+_forked_source = None
+
+EXPORT_SCHEMAS = {
+    "employees": ("employee_id", "type", "name", "age", "email", "department",
+                  "work_position", "salary_per_hour", "hire_date", "benefits"),
+    "punches": ("employee_id", "clock_in", "clock_out", "archived"),
+    "violations": ("employee_id", "date", "description", "severity"),
+    "trainings": ("employee_id", "date", "time", "description"),
+    "evaluations": ("employee_id", "sequence", "level", "label"),
+    "leaves": ("employee_id", "start_date", "end_date", "description"),
+}
+
+
+def _employee_rows(source):
+    for employee in source.employees_list:
+        yield (
+            employee.employee_id, type(employee).__name__, employee.name, employee.age, employee.email,
+            employee.department, employee.work_position, employee.salary_per_hour, employee.hire_date,
+            "|".join(employee._benefits),
+        )
+
+
+def _punch_rows(source):
+    for attendance in source.attendance_list:
+        employee_id = attendance._employee.employee_id
+        if attendance._archive_segments:
+            for record in attendance.load_archived():
+                yield employee_id, record["in"].isoformat(), record["out"].isoformat(), True
+        for record in attendance.records_between():
+            out_time = record["out"].isoformat() if record["out"] is not None else None
+            yield employee_id, record["in"].isoformat(), out_time, False
+
+
+def _violation_rows(source):
+    for compliance in source.compliance_list:
+        employee_id = compliance._employee.employee_id
+        for violation in compliance._violations:
+            yield employee_id, violation["Date"], violation["Description"], violation["Severity"]
+
+
+def _training_rows(source):
+    for employee in source.employees_list:
+        for session in list(employee._training):
+            yield employee.employee_id, session["Date"], session["Time"], session["Description"]
+
+
+def _evaluation_rows(source):
+    for employee in source.employees_list:
+        for sequence, level in enumerate(list(employee._performance), 1):
+            yield employee.employee_id, sequence, level, PERFORMANCE_LEVELS[level]
+
+
+def _leave_rows(source):
+    for employee in source.employees_list:
+        for leave in list(employee._requests):
+            yield employee.employee_id, leave["f_Date"].isoformat(), leave["s_Date"].isoformat(), leave["Description"]
+
+
+ROW_SOURCES = {
+    "employees": _employee_rows,
+    "punches": _punch_rows,
+    "violations": _violation_rows,
+    "trainings": _training_rows,
+    "evaluations": _evaluation_rows,
+    "leaves": _leave_rows,
+}
+
+
+def _chunks(rows, chunk_rows):
+    while True:
+        chunk = list(itertools.islice(rows, chunk_rows))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _write_csv(f, columns, rows, chunk_rows) -> int:
+    writer = csv.writer(f)
+    writer.writerow(columns)
+    count = 0
+    for chunk in _chunks(rows, chunk_rows):
+        writer.writerows(chunk)
+        count += len(chunk)
+    return count
+
+
+def _write_jsonl(f, columns, rows, chunk_rows) -> int:
+    dumps = json.dumps
+    count = 0
+    for chunk in _chunks(rows, chunk_rows):
+        f.write("".join(dumps(dict(zip(columns, row)), ensure_ascii=False) + "\n" for row in chunk))
+        count += len(chunk)
+    return count
+
+
+def export_table(source, table: str, directory: str, fmt: str = "csv", chunk_rows: int = CHUNK_ROWS) -> dict:
+    """ Exporta uma tabela para '<directory>/<table>.<fmt>'. Retorna linhas, tempo e linhas/s. """
+    path = os.path.join(directory, f"{table}.{fmt}")
+    temporary = f"{path}.tmp"
+    start = time.perf_counter()
+    with open(temporary, "w", encoding="utf-8", newline="") as f:
+        write = _write_csv if fmt == "csv" else _write_jsonl
+        rows = write(f, EXPORT_SCHEMAS[table], ROW_SOURCES[table](source), chunk_rows)
+    os.replace(temporary, path)
+    seconds = time.perf_counter() - start
+    return {
+        "path": path,
+        "rows": rows,
+        "seconds": round(seconds, 6),
+        "rows_per_sec": round(rows / seconds, 2) if seconds > 0 else None,
+    }
+
+
+def _export_forked_table(table: str, directory: str, fmt: str, chunk_rows: int) -> dict:
+    return export_table(_forked_source, table, directory, fmt, chunk_rows)
+
+
+def _export_parallel(snapshot, tables, directory: str, fmt: str, chunk_rows: int) -> dict:
+    global _forked_source
+    _forked_source = snapshot
+    try:
+        context = multiprocessing.get_context("fork")
+        workers = min(len(tables), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+            futures = {
+                table: executor.submit(_export_forked_table, table, directory, fmt, chunk_rows) for table in tables
+            }
+            return {table: future.result() for table, future in futures.items()}
+    except BrokenProcessPool as e:
+        raise ExportException(f"Processo da exportação paralela terminou inesperadamente: {str(e)}")
+    finally:
+        _forked_source = None
+
+
+def export_data(hr_system, directory: str, fmt: str = "csv", tables=None,
+                parallel: bool = False, chunk_rows: int = CHUNK_ROWS) -> dict:
+    """
+    Exporta as tabelas pedidas (padrão: todas) de um snapshot de 'hr_system'.
+    Retorna {'tables': {tabela: estatísticas}, 'rows', 'seconds', 'rows_per_sec'}.
+    """
+    try:
+        if fmt not in FORMATS:
+            raise ValueError(f"Formato de exportação inválido: {fmt} (opções: {', '.join(FORMATS)})")
+        tables = list(tables) if tables is not None else list(EXPORT_SCHEMAS)
+        unknown = [table for table in tables if table not in EXPORT_SCHEMAS]
+        if unknown:
+            raise ValueError(f"Tabela(s) desconhecida(s): {', '.join(unknown)} (opções: {', '.join(EXPORT_SCHEMAS)})")
+        if not isinstance(chunk_rows, int) or chunk_rows <= 0:
+            raise ValueError(f"Tamanho do bloco deve ser um inteiro positivo, recebido: {chunk_rows}")
+        os.makedirs(directory, exist_ok=True)
+
+        start = time.perf_counter()
+        with hr_system.snapshot() as snapshot:
+            if (parallel and len(tables) > 1 and (os.cpu_count() or 1) > 1
+                    and "fork" in multiprocessing.get_all_start_methods()):
+                stats = _export_parallel(snapshot, tables, directory, fmt, chunk_rows)
+            else:
+                stats = {table: export_table(snapshot, table, directory, fmt, chunk_rows) for table in tables}
+        seconds = time.perf_counter() - start
+        rows = sum(table_stats["rows"] for table_stats in stats.values())
+        return {
+            "tables": stats,
+            "rows": rows,
+            "seconds": round(seconds, 6),
+            "rows_per_sec": round(rows / seconds, 2) if seconds > 0 else None,
+        }
+    except ExportException:
+        raise
+    except HRSystemException as e:
+        raise ExportException(f"Erro ao exportar dados: {str(e)}")
+    except (OSError, ValueError, KeyError) as e:
+        raise ExportException(f"Erro ao exportar dados: {str(e)}")
@@ -1,15 +1,28 @@
 # facade.py
 
+from datetime import datetime, timedelta
 from hr_system import HRSystem
 from factories import EmployeeFactory
 from models import Employee, Manager
+from indexes import parse_date, parse_datetime, parse_severity
+from listing import EmployeePage, page_employees
+from hierarchy import render_hierarchy
+from snapshots import Snapshot
+from persistence import load_organization, save_organization
+from exporters import export_data
+from simulation import simulate_payroll
+from tax_engine import TaxEngine, TableBonusDecorator, ProgressiveTaxDecorator
+from scheduler import ShiftScheduler, DEFAULT_TICK
+from validation import EMPLOYEE_SCHEMA, FieldError, validate_employee
 from services import (
     PaymentContext, HourlyPaymentStrategy, MonthlyPaymentStrategy,
-    PaymentStrategy, ManagerBonusDecorator, TaxDeductionDecorator
+    PaymentStrategy, ManagerBonusDecorator, TaxDeductionDecorator,
+    DEFAULT_COMPACTION_HORIZON_DAYS, DEFAULT_ARCHIVE_DIR
 )
 from exceptions import (
     InvalidEmployeeIndexException, InvalidEmployeeDataException,
-    InvalidEmployeeTypeException, HRSystemException
+    InvalidEmployeeTypeException, InvalidDateException, InvalidSeverityException,
+    SimulationException, SchedulerException, HRSystemException
 )
 
 # PADRÃO ESTRUTURAL 3: FACADE
@@ -28,45 +41,108 @@ class HRFacade:
         """ Retorna a lista de funcionários do subsistema. """
         return self._hr_system.employees_list
 
+    def snapshot(self) -> Snapshot:
+        """
+        Abre uma visão congelada do sistema (use com 'with'). Passe-a como 'snapshot'
+        para calculate_payment e para os relatórios para que uma folha inteira leia
+        um único ponto no tempo enquanto contratações e pontos continuam chegando.
+        """
+        return self._hr_system.snapshot()
+
+    def list_employees(self, cursor: str = None, limit: int = 50, sort_by: str = "id",
+                       filters=None) -> EmployeePage:
+        """
+        Página de funcionários após o 'cursor' (None para a primeira página).
+        'sort_by': id, name, salary, department ou hire_date. 'filters': dict
+        (department, position, type, min_salary, max_salary) ou um callable.
+        Use 'next_cursor' da página retornada para pedir a seguinte.
+        """
+        try:
+            return page_employees(self._hr_system, cursor, limit, sort_by, filters)
+        except HRSystemException:
+            raise
+        except Exception as e:
+            raise HRSystemException(f"Erro ao listar funcionários: {str(e)}")
+
+    def iter_employees(self, sort_by: str = "id", filters=None, page_size: int = 500):
+        """ Percorre todos os funcionários página a página, sem materializar a lista inteira. """
+        cursor = None
+        while True:
+            page = self.list_employees(cursor, page_size, sort_by, filters)
+            yield from page
+            cursor = page.next_cursor
+            if cursor is None:
+                return
+
+    def search_employees(self, query: str, limit: int = 10, offset: int = 0) -> list[Employee]:
+        """ Busca por prefixo/substring de nome ou email, paginada ('offset', 'limit'). """
+        try:
+            if not isinstance(limit, int) or limit <= 0:
+                raise ValueError(f"Limite deve ser um número inteiro positivo, recebido: {limit}")
+            if not isinstance(offset, int) or offset < 0:
+                raise ValueError(f"Offset não pode ser negativo, recebido: {offset}")
+            employee_ids = self._hr_system.indexes.search.search(query)[offset:offset + limit]
+            return [self._hr_system.get_employee_by_id(employee_id) for employee_id in employee_ids]
+        except ValueError as e:
+            raise HRSystemException(f"Erro ao buscar funcionários: {str(e)}")
+
+    def index_of(self, employee: Employee) -> int:
+        """ Posição atual do funcionário na lista do sistema (usada pelos métodos baseados em índice). """
+        index = self._hr_system.index_of_id(getattr(employee, "employee_id", None))
+        if index is None or self._hr_system.employees_list[index] is not employee:
+            raise InvalidEmployeeIndexException(f"Funcionário '{employee}' não está cadastrado no sistema")
+        return index
+
+    def index_of_id(self, employee_id: int) -> int:
+        """ Posição atual do funcionário de id 'employee_id', em O(1), para os métodos baseados em índice. """
+        index = self._hr_system.index_of_id(employee_id)
+        if index is None:
+            raise InvalidEmployeeIndexException(f"Funcionário {employee_id} não está cadastrado no sistema")
+        return index
+
     def hire_employee(self, emp_type, name, age, email, dept, pos, salary, hire_date) -> Employee:
         """
         Simplifica o processo de contratação.
-        Internamente, usa a Factory e o Singleton.
+        Internamente, usa o esquema de validação, a Factory e o Singleton.
+        Os campos são validados uma única vez (todos os erros juntos).
         """
         try:
-            if emp_type not in [1, 2, 3]:
-                raise InvalidEmployeeTypeException(f"Tipo de funcionário deve ser 1, 2 ou 3, recebido: {emp_type}")
-            
-            if not name or not isinstance(name, str) or len(name.strip()) == 0:
-                raise InvalidEmployeeDataException("Nome do funcionário não pode ser vazio")
-            
-            if not isinstance(age, int) or age <= 0:
-                raise InvalidEmployeeDataException(f"Idade deve ser um número inteiro positivo, recebido: {age}")
-            
-            if not email or not isinstance(email, str) or len(email.strip()) == 0:
-                raise InvalidEmployeeDataException("Email do funcionário não pode ser vazio")
-            
-            if not dept or not isinstance(dept, str) or len(dept.strip()) == 0:
-                raise InvalidEmployeeDataException("Departamento não pode ser vazio")
-            
-            if not isinstance(salary, (int, float)) or salary <= 0:
-                raise InvalidEmployeeDataException(f"Salário deve ser um número positivo, recebido: {salary}")
+            record = validate_employee(emp_type, name, age, email, dept, pos, salary, hire_date).raise_if_invalid()
             
-            print(f"\n[Facade] Contratando {name}...")
+            print(f"\n[Facade] Contratando {record['name']}...")
             
-            new_employee = EmployeeFactory.create_employee(
-                emp_type, name, age, email, dept, pos, salary, hire_date
-            )
+            new_employee = EmployeeFactory.create_from_record(record)
             
             self._hr_system.add_employee(new_employee)
             
-            print(f"[Facade] {name} contratado e adicionado ao sistema.")
+            print(f"[Facade] {record['name']} contratado e adicionado ao sistema.")
             return new_employee
         except (InvalidEmployeeTypeException, InvalidEmployeeDataException) as e:
             raise
         except Exception as e:
             raise HRSystemException(f"Erro ao contratar funcionário: {str(e)}")
 
+    def hire_employees(self, records) -> tuple:
+        """
+        Contratação em lote. Cada registro tem os argumentos de 'hire_employee'.
+        Registros inválidos não interrompem o lote: retorna (contratados, rejeitados),
+        em que 'rejeitados' é uma lista de (posição do registro, [FieldError]).
+        """
+        hired, rejected = [], []
+        for position, values in enumerate(records):
+            result = EMPLOYEE_SCHEMA.validate(*values)
+            if not result.ok:
+                rejected.append((position, result.errors))
+                continue
+            try:
+                employee = EmployeeFactory.create_from_record(result.value)
+                self._hr_system.add_employee(employee)
+                hired.append(employee)
+            except HRSystemException as e:
+                rejected.append((position, [FieldError("record", str(e))]))
+        print(f"[Facade] {len(hired)} funcionário(s) contratado(s), {len(rejected)} registro(s) rejeitado(s).")
+        return hired, rejected
+
     def remove_employee(self, index: int):
         """ Simplifica a remoção de um funcionário. """
         try:
@@ -84,80 +160,294 @@ class HRFacade:
         except Exception as e:
             raise HRSystemException(f"Erro no sistema ao remover funcionário: {str(e)}")
 
-    def calculate_payment(self, employee_index: int) -> float:
+    @staticmethod
+    def _validate_period(start, end):
+        for value in (start, end):
+            if value is not None and not isinstance(value, datetime):
+                raise InvalidDateException(f"Período deve ser informado com datetime, recebido: {type(value).__name__}")
+        if start is not None and end is not None and end <= start:
+            raise InvalidDateException(f"Fim do período ({end}) deve ser posterior ao início ({start})")
+
+    def calculate_payment(self, employee_index: int, start: datetime = None, end: datetime = None,
+                          snapshot: Snapshot = None) -> float:
         """
         Simplifica todo o processo de cálculo de pagamento.
         Internamente, usa o Singleton, o Strategy e o Decorator.
+        Com 'start'/'end', paga apenas o período [start, end) (ex: a folha do mês).
+        Com 'snapshot', calcula sobre o estado congelado (ver 'snapshot()').
         """
         try:
+            self._validate_period(start, end)
+            source = snapshot if snapshot is not None else self._hr_system
             if not isinstance(employee_index, int):
                 raise TypeError(f"Índice deve ser um número inteiro, recebido: {type(employee_index).__name__}")
             if employee_index < 0:
                 raise InvalidEmployeeIndexException(f"Índice não pode ser negativo, recebido: {employee_index}")
-            if employee_index >= len(self._hr_system.employees_list):
+            if employee_index >= len(source.employees_list):
                 raise InvalidEmployeeIndexException(
-                    f"Índice {employee_index} está fora do range. Total de funcionários: {len(self._hr_system.employees_list)}"
+                    f"Índice {employee_index} está fora do range. Total de funcionários: {len(source.employees_list)}"
                 )
-            if employee_index >= len(self._hr_system.attendance_list):
+            if employee_index >= len(source.attendance_list):
                 raise InvalidEmployeeIndexException(
                     f"Lista de frequência dessincronizada. Índice {employee_index} não existe na lista de frequência"
                 )
             
-            employee = self._hr_system.employees_list[employee_index]
-            attendance = self._hr_system.attendance_list[employee_index]
+            employee = source.employees_list[employee_index]
+            attendance = source.attendance_list[employee_index]
             
             print(f"\n[Facade] Calculando pagamento para: {employee.name}...")
 
             payment_strategy: PaymentStrategy = HourlyPaymentStrategy()
+            tax_engine = self._hr_system.tax_engine
             
-            if isinstance(employee, Manager):
-                payment_strategy = ManagerBonusDecorator(payment_strategy)
-            
-            payment_strategy = TaxDeductionDecorator(payment_strategy)
+            if tax_engine is not None:
+                # Bônus e imposto progressivo pela tabela configurada
+                payment_strategy = ProgressiveTaxDecorator(TableBonusDecorator(payment_strategy, tax_engine), tax_engine)
+            else:
+                if isinstance(employee, Manager):
+                    payment_strategy = ManagerBonusDecorator(payment_strategy)
+                
+                payment_strategy = TaxDeductionDecorator(payment_strategy)
 
             payment_context = PaymentContext(payment_strategy)
-            money = payment_context.calculate_payment(attendance, employee.salary_per_hour)
+            money = payment_context.calculate_payment(attendance, employee.salary_per_hour, start, end)
             
             print(f"----------------------------------------")
             print(f"[Facade] Salário líquido: R$ {money:.2f}")
             return money
         except (TypeError, InvalidEmployeeIndexException) as e:
             raise InvalidEmployeeIndexException(f"Erro ao calcular pagamento: {str(e)}")
+        except InvalidDateException:
+            raise
         except Exception as e:
             raise HRSystemException(f"Erro no sistema ao calcular pagamento: {str(e)}")
 
-    def generate_attendance_report(self, employee_index: int):
-        """ Simplifica a geração do relatório de frequência. """
+    def configure_tax_engine(self, config=None):
+        """
+        Passa a calcular bônus e imposto pela tabela de 'config' (caminho de um JSON,
+        dict ou TaxEngine). Sem 'config', volta aos percentuais fixos dos Decorators.
+        """
+        if config is None or isinstance(config, TaxEngine):
+            engine = config
+        elif isinstance(config, dict):
+            engine = TaxEngine(config)
+        else:
+            engine = TaxEngine.from_file(config)
+        self._hr_system.tax_engine = engine
+        return engine
+
+    def simulate_payroll(self, scenarios, start=None, end=None) -> list:
+        """
+        Avalia cenários de folha (Scenario: reajustes, bônus de gerente, imposto) sobre um
+        snapshot, sem alterar nenhum funcionário. Retorna [atual, *cenários] (ScenarioResult).
+        """
+        try:
+            self._validate_period(start, end)
+            with self._hr_system.snapshot() as snapshot:
+                return simulate_payroll(snapshot, scenarios, start, end, self._hr_system.tax_engine)
+        except (SimulationException, InvalidDateException):
+            raise
+        except Exception as e:
+            raise HRSystemException(f"Erro no sistema ao simular folha: {str(e)}")
+
+    def save_organization(self, path: str, hierarchy=None) -> int:
+        """ Grava funcionários, sub-registros e a hierarquia em um snapshot binário (partida rápida). """
+        return save_organization(path, self._hr_system, hierarchy)
+
+    def load_organization(self, path: str):
+        """ Restaura um snapshot binário sem passar pela Factory/Builder; retorna a raiz da hierarquia. """
+        return load_organization(path, self._hr_system)
+
+    def render_hierarchy(self, root, writer=None, fmt="text", max_depth=None, subtree=None, offset=0, limit=None):
+        """
+        Escreve a hierarquia (ou o ramo 'subtree', ex: "Engenharia/Time de Redes") em 'writer'
+        como texto, outline ou JSON, sem recursão e em blocos. Retorna o offset da próxima página ou None.
+        """
+        try:
+            return render_hierarchy(root, writer, fmt, max_depth, subtree, offset, limit)
+        except (ValueError, AttributeError) as e:
+            raise HRSystemException(f"Erro ao renderizar hierarquia: {str(e)}")
+
+    def is_employee_under(self, index: int, department) -> bool:
+        """ Se o funcionário está em qualquer nível abaixo de 'department' (escopo de acesso/relatório). """
+        try:
+            return self._hr_system.employees_list[index].is_under(department)
+        except (IndexError, TypeError) as e:
+            raise InvalidEmployeeIndexException(f"Erro ao consultar departamento: {str(e)}")
+
+    def employee_departments(self, index: int) -> list:
+        """ Departamentos acima do funcionário, do mais próximo até a raiz. """
+        try:
+            return self._hr_system.employees_list[index].ancestors()
+        except (IndexError, TypeError) as e:
+            raise InvalidEmployeeIndexException(f"Erro ao consultar departamento: {str(e)}")
+
+    def who_is_in(self, department: str = None) -> list:
+        """ Funcionários com o ponto aberto agora (da empresa ou de um departamento) como (funcionário, entrada). """
+        return [
+            (self._hr_system.get_employee_by_id(employee_id), since)
+            for employee_id, since in sorted(self._hr_system.indexes.presence.present(department))
+        ]
+
+    def headcount(self, department: str = None) -> int:
+        """ Quantos estão presentes agora, na empresa ou em um departamento. """
+        return self._hr_system.indexes.presence.count(department)
+
+    def headcount_by_department(self) -> dict:
+        """ Presentes agora por departamento (só departamentos com alguém presente). """
+        return self._hr_system.indexes.presence.by_department()
+
+    def enable_shift_scheduler(self, max_hours: float = 12, action: str = "close",
+                               tick: timedelta = DEFAULT_TICK) -> ShiftScheduler:
+        """
+        Vigia os turnos abertos: os que passam de 'max_hours' sem clock out são fechados
+        no limite ("close") ou sinalizados para revisão ("flag"). Substitui o scheduler atual.
+        """
+        if not isinstance(max_hours, (int, float)) or max_hours <= 0:
+            raise SchedulerException(f"Duração máxima do turno deve ser um número positivo, recebido: {max_hours}")
+        self.disable_shift_scheduler()
+        scheduler = ShiftScheduler(self._hr_system, timedelta(hours=max_hours), action, tick)
+        self._hr_system.shift_scheduler = scheduler
+        return scheduler
+
+    def disable_shift_scheduler(self):
+        if self._hr_system.shift_scheduler is not None:
+            self._hr_system.shift_scheduler.stop()
+            self._hr_system.shift_scheduler = None
+
+    def check_open_shifts(self, now: datetime = None) -> list:
+        """ Roda o scheduler de turnos até 'now'. Retorna (funcionário, entrada, prazo) dos turnos tratados. """
+        if self._hr_system.shift_scheduler is None:
+            raise SchedulerException("Scheduler de turnos não está ativo (use enable_shift_scheduler)")
+        return self._hr_system.shift_scheduler.run_due(now)
+
+    def export_data(self, directory: str, fmt: str = "csv", tables=None, parallel: bool = False) -> dict:
+        """
+        Exporta funcionários, pontos, violações, treinamentos, avaliações e afastamentos
+        (CSV ou JSONL, um arquivo por tabela) de um snapshot, em blocos e com memória constante.
+        Com 'parallel', cada tabela é exportada em um processo próprio (ver exporters.py).
+        """
+        return export_data(self._hr_system, directory, fmt, tables, parallel)
+
+    def enable_punch_log(self, path: str):
+        """ Passa a gravar os pontos em um log binário lido via mmap (folhas grandes com pouca memória). """
+        return self._hr_system.enable_punch_log(path)
+
+    def find_violations(self, min_severity=3, start=None, end=None) -> list:
+        """
+        Consulta o índice de violações da empresa (ex: gravidade Alta no trimestre).
+        Retorna tuplas (data, funcionário, nível de gravidade), ordenadas por data.
+        """
+        try:
+            level = parse_severity(min_severity)
+            start_day = parse_date(start, "Início do período") if start is not None else None
+            end_day = parse_date(end, "Fim do período") if end is not None else None
+            return [
+                (day, self._hr_system.get_employee_by_id(employee_id), severity)
+                for day, employee_id, severity in self._hr_system.violation_index.query(level, start_day, end_day)
+            ]
+        except (InvalidSeverityException, InvalidDateException):
+            raise
+        except Exception as e:
+            raise HRSystemException(f"Erro no sistema ao consultar violações: {str(e)}")
+
+    def top_risk_employees(self, k: int = 50) -> list:
+        """ Retorna os 'k' funcionários de maior score de risco de compliance como (funcionário, score). """
         try:
+            if not isinstance(k, int) or k <= 0:
+                raise ValueError(f"Quantidade deve ser um número inteiro positivo, recebido: {k}")
+            return [
+                (self._hr_system.get_employee_by_id(employee_id), score)
+                for employee_id, score in self._hr_system.violation_index.top_risk(k)
+            ]
+        except ValueError as e:
+            raise HRSystemException(f"Erro ao consultar ranking de risco: {str(e)}")
+
+    def employees_on_leave(self, start, end=None) -> list[Employee]:
+        """ Funcionários afastados no dia 'start' ou em algum dia de [start, end] (YYYY-MM-DD ou date). """
+        try:
+            start_day = parse_date(start, "Data inicial")
+            end_day = parse_date(end, "Data final") if end is not None else start_day
+            if end_day < start_day:
+                raise InvalidDateException(f"Data final ({end_day}) não pode ser anterior à inicial ({start_day})")
+            employee_ids = self._hr_system.indexes.leaves.out_between(start_day, end_day)
+            return [self._hr_system.get_employee_by_id(employee_id) for employee_id in sorted(employee_ids)]
+        except InvalidDateException:
+            raise
+        except Exception as e:
+            raise HRSystemException(f"Erro no sistema ao consultar afastamentos: {str(e)}")
+
+    def upcoming_trainings(self, days: int = 7) -> list:
+        """ Sessões de treinamento dos próximos 'days' dias como (início, descrição, nº de participantes). """
+        try:
+            if not isinstance(days, int) or days <= 0:
+                raise ValueError(f"Quantidade de dias deve ser um número inteiro positivo, recebido: {days}")
+            return self._hr_system.indexes.trainings.upcoming(days)
+        except ValueError as e:
+            raise HRSystemException(f"Erro ao consultar próximos treinamentos: {str(e)}")
+
+    def training_attendees(self, date_str: str, time_str: str, description: str) -> list[Employee]:
+        """ Participantes da sessão de treinamento identificada por data, horário e descrição. """
+        start = parse_datetime(date_str, time_str, "Data do treinamento")
+        employee_ids = self._hr_system.indexes.trainings.attendees(start, description)
+        return [self._hr_system.get_employee_by_id(employee_id) for employee_id in sorted(employee_ids)]
+
+    def performance_distribution(self, department: str = None, role: str = None) -> dict:
+        """ Contagem de avaliações por nível (1: Good, 2: Average, 3: Bad) da empresa, de um departamento ou cargo. """
+        return self._hr_system.indexes.performance.distribution(department, role)
+
+    def employees_trending_to_bad(self, department: str = None) -> list[Employee]:
+        """ Funcionários cuja média móvel de avaliações está próxima de Bad. """
+        employee_ids = self._hr_system.indexes.performance.trending_to_bad(department)
+        return [self._hr_system.get_employee_by_id(employee_id) for employee_id in sorted(employee_ids)]
+
+    def compact_attendance(self, horizon_days: int = DEFAULT_COMPACTION_HORIZON_DAYS,
+                           archive_dir: str = DEFAULT_ARCHIVE_DIR) -> int:
+        """ Arquiva pontos antigos em disco, mantendo folha e relatórios corretos via resumos diários. """
+        return self._hr_system.compact_attendance(horizon_days, archive_dir)
+
+    def generate_attendance_report(self, employee_index: int, start: datetime = None, end: datetime = None,
+                                   snapshot: Snapshot = None):
+        """ Simplifica a geração do relatório de frequência (opcionalmente de um período). """
+        try:
+            self._validate_period(start, end)
+            source = snapshot if snapshot is not None else self._hr_system
             if not isinstance(employee_index, int):
                 raise TypeError(f"Índice deve ser um número inteiro, recebido: {type(employee_index).__name__}")
             if employee_index < 0:
                 raise InvalidEmployeeIndexException(f"Índice não pode ser negativo, recebido: {employee_index}")
-            if employee_index >= len(self._hr_system.attendance_list):
+            if employee_index >= len(source.attendance_list):
                 raise InvalidEmployeeIndexException(
-                    f"Índice {employee_index} está fora do range. Total de registros de frequência: {len(self._hr_system.attendance_list)}"
+                    f"Índice {employee_index} está fora do range. Total de registros de frequência: {len(source.attendance_list)}"
                 )
-            report = self._hr_system.attendance_list[employee_index]
-            report.generate_report()
+            report = source.attendance_list[employee_index]
+            report.generate_report(start, end)
         except (TypeError, InvalidEmployeeIndexException) as e:
             raise InvalidEmployeeIndexException(f"Erro ao gerar relatório de frequência: {str(e)}")
+        except InvalidDateException:
+            raise
         except Exception as e:
             raise HRSystemException(f"Erro no sistema ao gerar relatório de frequência: {str(e)}")
 
-    def generate_compliance_report(self, employee_index: int):
-        """ Simplifica a geração do relatório de compliance. """
+    def generate_compliance_report(self, employee_index: int, start: datetime = None, end: datetime = None,
+                                   snapshot: Snapshot = None):
+        """ Simplifica a geração do relatório de compliance (opcionalmente de um período). """
         try:
+            self._validate_period(start, end)
+            source = snapshot if snapshot is not None else self._hr_system
             if not isinstance(employee_index, int):
                 raise TypeError(f"Índice deve ser um número inteiro, recebido: {type(employee_index).__name__}")
             if employee_index < 0:
                 raise InvalidEmployeeIndexException(f"Índice não pode ser negativo, recebido: {employee_index}")
-            if employee_index >= len(self._hr_system.compliance_list):
+            if employee_index >= len(source.compliance_list):
                 raise InvalidEmployeeIndexException(
-                    f"Índice {employee_index} está fora do range. Total de registros de compliance: {len(self._hr_system.compliance_list)}"
+                    f"Índice {employee_index} está fora do range. Total de registros de compliance: {len(source.compliance_list)}"
                 )
-            report = self._hr_system.compliance_list[employee_index]
-            report.generate_report()
+            report = source.compliance_list[employee_index]
+            report.generate_report(start, end)
         except (TypeError, InvalidEmployeeIndexException) as e:
             raise InvalidEmployeeIndexException(f"Erro ao gerar relatório de compliance: {str(e)}")
+        except InvalidDateException:
+            raise
         except Exception as e:
             raise HRSystemException(f"Erro no sistema ao gerar relatório de compliance: {str(e)}")
\ No newline at end of file
@@ -0,0 +1,190 @@
+# hierarchy.py
+"""
+Percurso e renderização iterativos da hierarquia (Composite).
+
+'walk' percorre a árvore em pré-ordem com uma pilha explícita de iteradores, sem
+recursão: a memória é proporcional à profundidade, não ao tamanho da árvore, e
+organogramas muito profundos não esbarram no limite de recursão do Python.
+'render_hierarchy' escreve o resultado em qualquer writer (texto ou binário) em
+blocos de linhas, com limite de profundidade, seleção de sub-árvore e paginação.
+'number_nested_sets' usa o mesmo percurso para numerar o índice de ancestralidade
+dos componentes (ver OrganizationalComponent.is_under).
+
+Formatos:
+    text     o mesmo desenho de 'display_hierarchy' ('+' departamento, '-' funcionário)
+    outline  tópicos numerados (1, 1.1, 1.1.2, ...)
+    json     lista de nós em pré-ordem com a profundidade de cada um
+             (a árvore é reconstruível e a lista pode ser paginada)
+"""
+
+import io
+import json
+import sys
+
+FORMATS = ("text", "outline", "json")
+CHUNK_LINES = 1024  # linhas acumuladas antes de cada write
+
+
+def _children(component):
+    # Só departamentos têm '_children'; funcionários são folhas
+    return getattr(component, "_children", None)
+
+
+def walk(root, max_depth: int = None):
+    """
+    Gera (profundidade, componente) em pré-ordem a partir de 'root' (profundidade 0).
+    Com 'max_depth', os filhos abaixo dessa profundidade não são visitados.
+    """
+    yield 0, root
+    children = _children(root)
+    if not children or max_depth == 0:
+        return
+    stack = [iter(children)]
+    while stack:
+        component = next(stack[-1], None)
+        if component is None:
+            stack.pop()
+            continue
+        depth = len(stack)
+        yield depth, component
+        children = _children(component)
+        if children and (max_depth is None or depth < max_depth):
+            stack.append(iter(children))
+
+
+def number_nested_sets(root):
+    """
+    Numera a árvore de 'root' como nested set (percurso de Euler iterativo): cada
+    componente recebe '_interval' = (raiz, versão, entrada, saída). 'A' está abaixo
+    de 'B' se o intervalo de 'A' estiver contido no de 'B'. A raiz guarda em
+    '_numbered_nodes' quantos componentes foram numerados.
+    """
+    version = root._tree_version
+    counter = 0
+    stack = [(root, iter(_children(root) or ()))]
+    entries = [counter]
+    while stack:
+        component, children = stack[-1]
+        child = next(children, None)
+        if child is None:
+            stack.pop()
+            counter += 1
+            component._interval = (root, version, entries.pop(), counter)
+            continue
+        counter += 1
+        entries.append(counter)
+        stack.append((child, iter(_children(child) or ())))
+    root._numbered_nodes = (counter + 1) // 2
+
+
+def find_department(root, path: str):
+    """
+    Localiza um departamento pelo caminho de nomes separados por '/', a partir de
+    'root' (o nome da raiz no início do caminho é opcional). Lança ValueError.
+    """
+    names = [name.strip() for name in path.split("/") if name.strip()]
+    if names and names[0] == root._name:
+        names = names[1:]
+    node = root
+    for name in names:
+        for child in _children(node) or ():
+            if _children(child) is not None and child._name == name:
+                node = child
+                break
+        else:
+            raise ValueError(f"Departamento '{name}' não encontrado em '{node._name}'")
+    return node
+
+
+def _text_lines(nodes, indent_level):
+    for depth, component in nodes:
+        indent = "  " * (indent_level + depth)
+        if _children(component) is not None:
+            yield f"{indent}+ {component._name} (Departamento)\n"
+        else:
+            yield f"{indent}- {component.name} ({component.get_role()})\n"
+
+
+def _outline_lines(nodes):
+    numbers = []
+    for depth, component in nodes:
+        # A numeração do nó depende só do caminho até ele: 'numbers' tem no máximo 'depth' + 1 itens
+        if depth < len(numbers):
+            del numbers[depth + 1:]
+            numbers[depth] += 1
+        else:
+            numbers.append(1)
+        label = ".".join(map(str, numbers))
+        indent = "    " * depth
+        if _children(component) is not None:
+            yield f"{indent}{label} {component._name}\n"
+        else:
+            yield f"{indent}{label} {component.name} — {component.get_role()}\n"
+
+
+def _json_record(depth, component) -> dict:
+    if _children(component) is not None:
+        return {"depth": depth, "type": "department", "name": component._name,
+                "children": len(component._children)}
+    return {"depth": depth, "type": "employee", "id": component.employee_id,
+            "name": component.name, "role": component.get_role()}
+
+
+def _json_lines(nodes):
+    separator = "[\n"
+    for depth, component in nodes:
+        yield f"{separator}  {json.dumps(_json_record(depth, component), ensure_ascii=False)}"
+        separator = ",\n"
+    yield "[]\n" if separator == "[\n" else "\n]\n"
+
+
+def _page(items, offset, limit, state):
+    """ Aplica offset/limit à sequência e registra em 'state' se sobrou algum item. """
+    for position, item in enumerate(items):
+        if position < offset:
+            continue
+        if limit is not None and position >= offset + limit:
+            state["more"] = True
+            return
+        yield item
+
+
+def render_hierarchy(root, writer=None, fmt: str = "text", max_depth: int = None,
+                     subtree: str = None, offset: int = 0, limit: int = None, indent_level: int = 0):
+    """
+    Renderiza a hierarquia de 'root' (ou da sub-árvore 'subtree') em 'writer'
+    (padrão: sys.stdout). 'offset' e 'limit' contam nós em pré-ordem.
+    Retorna o offset da próxima página, ou None se a árvore acabou.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Formato inválido: {fmt} (opções: {', '.join(FORMATS)})")
+    if offset < 0 or (limit is not None and limit <= 0):
+        raise ValueError("Paginação inválida: offset deve ser >= 0 e limit > 0")
+    if subtree:
+        root = find_department(root, subtree)
+    writer = writer if writer is not None else sys.stdout
+    binary = isinstance(writer, (io.RawIOBase, io.BufferedIOBase))
+
+    state = {"more": False}
+    nodes = walk(root, max_depth)
+    if fmt == "text":
+        lines = _text_lines(_page(nodes, offset, limit, state), indent_level)
+    elif fmt == "json":
+        lines = _json_lines(_page(nodes, offset, limit, state))
+    else:
+        # A numeração do outline depende dos nós anteriores: numera tudo e pagina as linhas
+        lines = _page(_outline_lines(nodes), offset, limit, state)
+
+    chunk = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= CHUNK_LINES:
+            _write(writer, "".join(chunk), binary)
+            chunk.clear()
+    if chunk:
+        _write(writer, "".join(chunk), binary)
+    return offset + limit if state["more"] else None
+
+
+def _write(writer, text, binary):
+    writer.write(text.encode("utf-8") if binary else text)
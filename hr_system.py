@@ -2,18 +2,27 @@
 # objetivo: Garantir que uma classe tenha apenas uma instância e fornecer um ponto de
 # acesso global a essa instância.
 
+from bisect import bisect_left, insort
 from models import Employee, Manager, Intern
-from services import Attendance, Compliance
+from punch_log import PunchLog
+from snapshots import Versioned, Snapshot
+from indexes import ViolationIndex, EmployeeIndexes
+from services import (
+    Attendance, Compliance, DEFAULT_COMPACTION_HORIZON_DAYS, DEFAULT_ARCHIVE_DIR
+)
 from exceptions import (
     InvalidEmployeeIndexException, ListSynchronizationException,
     HRSystemException
 )
 
-class HRSystem:
+class HRSystem(Versioned):
     """
     Esta é a classe Singleton que gerencia o estado de todo o sistema de RH.
     """
     _instance = None 
+    _versioned_fields = (
+        "employees_list", "attendance_list", "compliance_list", "employee_ids", "_employees_by_id"
+    )
 
     @staticmethod
     def get_instance():
@@ -32,9 +41,18 @@ class HRSystem:
         if hasattr(self, '_initialized'):
             return
         
+        self._start_versioning()
         self.employees_list = []
         self.attendance_list = []
         self.compliance_list = []
+        self.punch_log = None
+        self.tax_engine = None  # TaxEngine (tax_engine.py); None = percentuais fixos dos Decorators
+        self.shift_scheduler = None  # ShiftScheduler (scheduler.py): turnos esquecidos
+        self.violation_index = ViolationIndex()
+        self.indexes = EmployeeIndexes()
+        self._employees_by_id = {}
+        self.employee_ids = []  # ids ordenados: base da listagem paginada por cursor
+        self._positions = {}    # id -> posição nas listas paralelas (None = refazer na próxima consulta)
         self._initialized = True
         
     def add_employee(self, employee):
@@ -45,10 +63,11 @@ class HRSystem:
             if not isinstance(employee, Employee):
                 raise TypeError(f"Objeto deve ser uma instância de Employee, recebido: {type(employee).__name__}")
             
+            self._before_write()
             self.employees_list.append(employee)
             
             try:
-                attendance = Attendance(employee)
+                attendance = Attendance(employee, self.punch_log)
                 self.attendance_list.append(attendance)
             except Exception as e:
                 # Rollback: remove o funcionário se falhar ao criar attendance
@@ -56,7 +75,7 @@ class HRSystem:
                 raise HRSystemException(f"Erro ao criar registro de frequência: {str(e)}")
             
             try:
-                compliance = Compliance(employee)
+                compliance = Compliance(employee, self.violation_index)
                 self.compliance_list.append(compliance)
             except Exception as e:
                 # Rollback: remove funcionário e attendance se falhar ao criar compliance
@@ -73,6 +92,14 @@ class HRSystem:
                     f"Compliance: {len(self.compliance_list)}"
                 )
             
+            self._employees_by_id[employee.employee_id] = employee
+            if self._positions is not None:
+                self._positions[employee.employee_id] = len(self.employees_list) - 1
+            if not self.employee_ids or employee.employee_id > self.employee_ids[-1]:
+                self.employee_ids.append(employee.employee_id)
+            else:
+                insort(self.employee_ids, employee.employee_id)
+            employee.attach_indexes(self.indexes)
             print(f"Number of employees: {len(self.employees_list)}")
         except (ValueError, TypeError, ListSynchronizationException) as e:
             raise HRSystemException(f"Erro ao adicionar funcionário: {str(e)}")
@@ -102,10 +129,11 @@ class HRSystem:
                     f"Compliance: {len(self.compliance_list)}"
                 )
             
+            self._before_write()
             removed = self.employees_list.pop(index)
             
             try:
-                self.attendance_list.pop(index)
+                self.attendance_list.pop(index).discard_report_cache()
             except IndexError:
                 raise ListSynchronizationException(
                     f"Erro ao remover registro de frequência no índice {index}. "
@@ -113,7 +141,9 @@ class HRSystem:
                 )
             
             try:
-                self.compliance_list.pop(index)
+                removed_compliance = self.compliance_list.pop(index)
+                removed_compliance.detach_index()
+                removed_compliance.discard_report_cache()
             except IndexError:
                 raise ListSynchronizationException(
                     f"Erro ao remover registro de compliance no índice {index}. "
@@ -121,6 +151,16 @@ class HRSystem:
                 )
             
             Employee.number_of_employees -= 1
+            self._employees_by_id.pop(removed.employee_id, None)
+            # Os seguintes deslocam uma posição: o mapa é refeito uma vez, na próxima consulta
+            self._positions = None
+            position = bisect_left(self.employee_ids, removed.employee_id)
+            if position < len(self.employee_ids) and self.employee_ids[position] == removed.employee_id:
+                del self.employee_ids[position]
+            removed.detach_indexes()
+            if removed.parent is not None:
+                # Sai também da hierarquia (Composite), senão o snapshot seguinte ainda o referencia
+                removed.parent.remove_component(removed)
             
             # Verifica sincronização após remover
             if not (len(self.employees_list) == len(self.attendance_list) == len(self.compliance_list)):
@@ -135,4 +175,97 @@ class HRSystem:
         except (TypeError, InvalidEmployeeIndexException, ListSynchronizationException, IndexError) as e:
             raise InvalidEmployeeIndexException(f"Erro ao remover funcionário: {str(e)}")
         except Exception as e:
-            raise HRSystemException(f"Erro inesperado ao remover funcionário: {str(e)}")
\ No newline at end of file
+            raise HRSystemException(f"Erro inesperado ao remover funcionário: {str(e)}")
+
+    def restore(self, employees, attendance_list, compliance_list, punch_log=None):
+        """
+        Carrega de uma vez um estado já validado (ex: snapshot binário em persistence.py),
+        sem validação por campo nem mensagens por funcionário. Exige o sistema vazio.
+        As violações já devem estar no 'violation_index'; os demais índices são reconstruídos aqui.
+        """
+        if self.employees_list:
+            raise HRSystemException("Restauração exige um sistema sem funcionários")
+        if not (len(employees) == len(attendance_list) == len(compliance_list)):
+            raise ListSynchronizationException(
+                f"Listas dessincronizadas na restauração. "
+                f"Funcionários: {len(employees)}, "
+                f"Frequência: {len(attendance_list)}, "
+                f"Compliance: {len(compliance_list)}"
+            )
+        self._before_write()
+        self.employees_list = list(employees)
+        self.attendance_list = list(attendance_list)
+        self.compliance_list = list(compliance_list)
+        self._employees_by_id = {employee.employee_id: employee for employee in self.employees_list}
+        self.employee_ids = sorted(self._employees_by_id)
+        self._positions = None
+        # As ordens de listagem são refeitas na próxima consulta, em vez de uma inserção por funcionário
+        self.indexes.listings.clear()
+        if punch_log is not None:
+            self.punch_log = punch_log
+        for employee in self.employees_list:
+            employee.attach_indexes(self.indexes)
+        for attendance in self.attendance_list:
+            if attendance.is_clocked_in():
+                attendance._update_presence(attendance._record[-1]["in"])
+
+    def snapshot(self) -> Snapshot:
+        """
+        Visão ponto-no-tempo, em O(1), para folhas e relatórios longos: contratações,
+        desligamentos e pontos posteriores não aparecem nela. Feche-a ao terminar.
+        """
+        return Snapshot(self)
+
+    def get_employee_by_id(self, employee_id):
+        """ Busca O(1) pelo identificador estável do funcionário (None se não existir). """
+        return self._employees_by_id.get(employee_id)
+
+    def index_of_id(self, employee_id):
+        """ Posição do funcionário nas listas paralelas pelo id, em O(1) (None se não existir). """
+        if self._positions is None:
+            self._positions = {employee.employee_id: index for index, employee in enumerate(self.employees_list)}
+        return self._positions.get(employee_id)
+
+    def enable_punch_log(self, path):
+        """
+        Ativa o armazenamento de pontos em log binário (mmap) para todo o sistema.
+        Os pontos fechados já em memória são migrados para o log. O arquivo deve ser
+        novo ou vazio: um log com pontos é reaberto pelo snapshot (load_organization).
+        """
+        try:
+            if self.punch_log is not None:
+                raise HRSystemException(f"Log de pontos já está ativo em '{self.punch_log.path}'")
+            punch_log = PunchLog(path)
+            if len(punch_log):
+                # Os ids do log vêm de Employee._id_sequence, que recomeça a cada execução: pontos de
+                # outra sessão só são válidos junto do snapshot que restaurou os mesmos ids (load_organization)
+                punch_log.close()
+                raise HRSystemException(
+                    f"Log de pontos '{path}' já contém {len(punch_log)} registros de outra sessão; "
+                    f"reabra-o carregando o snapshot da organização que o gravou"
+                )
+            self.punch_log = punch_log
+            for attendance in self.attendance_list:
+                attendance.attach_punch_log(self.punch_log)
+            return self.punch_log
+        except HRSystemException:
+            raise
+        except Exception as e:
+            raise HRSystemException(f"Erro inesperado ao ativar log de pontos: {str(e)}")
+
+    def compact_attendance(self, horizon_days=DEFAULT_COMPACTION_HORIZON_DAYS,
+                           archive_dir=DEFAULT_ARCHIVE_DIR, now=None):
+        """
+        Job de compactação: arquiva os pontos mais antigos que o horizonte de todos
+        os funcionários, mantendo em memória apenas a janela recente.
+        """
+        try:
+            compacted = sum(
+                attendance.compact(horizon_days, archive_dir, now) for attendance in self.attendance_list
+            )
+            print(f"{compacted} registros de frequência compactados em '{archive_dir}'.")
+            return compacted
+        except HRSystemException:
+            raise
+        except Exception as e:
+            raise HRSystemException(f"Erro inesperado ao compactar frequência: {str(e)}")
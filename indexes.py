@@ -0,0 +1,516 @@
+# indexes.py
+"""
+Índices da organização inteira, mantidos incrementalmente pelo HRSystem.
+
+Cada índice é atualizado no mesmo método que altera o dado de origem (ex:
+Compliance.add_violation), de modo que as consultas da empresa toda não
+precisam varrer todos os funcionários.
+"""
+
+import heapq
+import itertools
+import unicodedata
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime, date, timedelta
+
+from exceptions import InvalidDateException, InvalidTimeException, InvalidSeverityException
+
+SEVERITY_LEVELS = {
+    "baixa": 1, "low": 1,
+    "média": 2, "media": 2, "medium": 2,
+    "alta": 3, "high": 3,
+    "crítica": 4, "critica": 4, "critical": 4,
+}
+SEVERITY_NAMES = {1: "Baixa", 2: "Média", 3: "Alta", 4: "Crítica"}
+# Peso de cada gravidade no score de risco do funcionário
+SEVERITY_WEIGHTS = {1: 1, 2: 3, 3: 7, 4: 15}
+
+
+def parse_date(value, field="Data") -> date:
+    """ Converte 'YYYY-MM-DD' (ou date/datetime) em date. """
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    try:
+        return datetime.strptime(str(value).strip(), "%Y-%m-%d").date()
+    except ValueError:
+        raise InvalidDateException(f"{field} deve estar no formato YYYY-MM-DD, recebido: '{value}'")
+
+
+def parse_datetime(date_value, time_value, field="Data/Horário") -> datetime:
+    """ Combina 'YYYY-MM-DD' e 'HH:MM' em um datetime. """
+    day = parse_date(date_value, field)
+    try:
+        moment = datetime.strptime(str(time_value).strip(), "%H:%M").time()
+    except ValueError:
+        raise InvalidTimeException(f"Horário deve estar no formato HH:MM, recebido: '{time_value}'")
+    return datetime.combine(day, moment)
+
+
+def parse_severity(value) -> int:
+    """ Normaliza a gravidade (texto livre ou 1-4) para um nível de 1 (Baixa) a 4 (Crítica). """
+    if isinstance(value, int) and not isinstance(value, bool) and value in SEVERITY_NAMES:
+        return value
+    level = SEVERITY_LEVELS.get(str(value).strip().lower())
+    if level is None:
+        raise InvalidSeverityException(
+            f"Gravidade deve ser Baixa, Média, Alta, Crítica ou 1-4, recebido: '{value}'"
+        )
+    return level
+
+
+class ViolationIndex:
+    """
+    Índice de violações de compliance da empresa.
+    - '_by_severity': por gravidade, dict dia -> {seq: employee_id} (na ordem de
+      inserção); '_days' guarda, por gravidade, os dias com violações em ordem.
+      Incluir ou remover uma violação em um dia que já existe é O(1); só um dia
+      novo (ou que ficou vazio) mexe na lista de dias, cujo tamanho é o número de
+      dias distintos e não o de violações. Consultas por período usam busca
+      binária nos dias.
+    - '_scores': score de risco por funcionário (soma dos pesos das violações).
+    - '_heap': heap de (-score, employee_id) com invalidação preguiçosa; entradas
+      cujo score não confere mais com '_scores' são descartadas ao aparecer.
+    """
+    def __init__(self):
+        self._by_severity = {level: {} for level in SEVERITY_NAMES}
+        self._days = {level: [] for level in SEVERITY_NAMES}
+        self._count = 0
+        self._scores = {}
+        self._heap = []
+        self._seq = itertools.count()
+
+    def __len__(self):
+        return self._count
+
+    def add(self, employee_id: int, day: date, severity: int):
+        """ Indexa uma violação e retorna a chave usada para removê-la depois. """
+        key = (day, next(self._seq), employee_id)
+        by_day = self._by_severity[severity]
+        entries = by_day.get(day)
+        if entries is None:
+            entries = by_day[day] = {}
+            insort(self._days[severity], day)
+        entries[key[1]] = employee_id
+        self._count += 1
+        self._update_score(employee_id, SEVERITY_WEIGHTS[severity])
+        return key
+
+    def remove(self, key, severity: int):
+        day, seq, employee_id = key
+        by_day = self._by_severity[severity]
+        entries = by_day.get(day)
+        if entries is None or entries.pop(seq, None) is None:
+            return
+        if not entries:
+            del by_day[day]
+            days = self._days[severity]
+            del days[bisect_left(days, day)]
+        self._count -= 1
+        self._update_score(employee_id, -SEVERITY_WEIGHTS[severity])
+
+    def _update_score(self, employee_id: int, delta: int):
+        score = self._scores.get(employee_id, 0) + delta
+        if score > 0:
+            self._scores[employee_id] = score
+            heapq.heappush(self._heap, (-score, employee_id))
+        else:
+            self._scores.pop(employee_id, None)
+        # Evita que entradas obsoletas dominem o heap
+        if len(self._heap) > 2 * len(self._scores) + 64:
+            self._heap = [(-s, e) for e, s in self._scores.items()]
+            heapq.heapify(self._heap)
+
+    def risk_score(self, employee_id: int) -> int:
+        return self._scores.get(employee_id, 0)
+
+    def query(self, min_severity: int = 1, start: date = None, end: date = None) -> list:
+        """
+        Violações com gravidade >= 'min_severity' e data em [start, end], ordenadas por data.
+        Retorna tuplas (data, employee_id, gravidade).
+        """
+        result = []
+        for severity in range(min_severity, max(SEVERITY_NAMES) + 1):
+            days, by_day = self._days[severity], self._by_severity[severity]
+            lo = bisect_left(days, start) if start is not None else 0
+            hi = bisect_right(days, end) if end is not None else len(days)
+            for day in days[lo:hi]:
+                result.extend((day, employee_id, severity) for employee_id in by_day[day].values())
+        result.sort(key=lambda item: item[0])
+        return result
+
+    def top_risk(self, k: int = 50) -> list:
+        """ Os 'k' funcionários de maior risco, como (employee_id, score), em O(k log n). """
+        result, valid = [], []
+        seen = set()
+        while self._heap and len(result) < k:
+            neg_score, employee_id = heapq.heappop(self._heap)
+            if employee_id in seen or self._scores.get(employee_id) != -neg_score:
+                continue
+            seen.add(employee_id)
+            valid.append((neg_score, employee_id))
+            result.append((employee_id, -neg_score))
+        for entry in valid:
+            heapq.heappush(self._heap, entry)
+        return result
+
+
+class LeaveIndex:
+    """
+    Índice de afastamentos da empresa por extremidades ordenadas, em camadas por duração.
+    A camada k guarda, ordenados pela data de início, os afastamentos de
+    2**k - 1 a 2**(k+1) - 2 dias; um afastamento dessa camada ativo em [X, Y] tem
+    início em [X - (2**(k+1) - 2), Y], e só esse trecho de cada camada é examinado.
+    Um afastamento longo alarga apenas a janela da sua camada, e a camada deixa de
+    existir quando o último afastamento dela é removido.
+    """
+    def __init__(self):
+        self._layers = {}  # k -> chaves (início, fim, seq, employee_id) ordenadas
+        self._count = 0
+        self._seq = itertools.count()
+
+    def __len__(self):
+        return self._count
+
+    @staticmethod
+    def _layer(start: date, end: date) -> int:
+        return ((end - start).days + 1).bit_length() - 1
+
+    def add(self, employee_id: int, start: date, end: date):
+        """ Indexa o afastamento [start, end] (inclusivo) e retorna sua chave. """
+        key = (start, end, next(self._seq), employee_id)
+        insort(self._layers.setdefault(self._layer(start, end), []), key)
+        self._count += 1
+        return key
+
+    def remove(self, key):
+        layer = self._layer(key[0], key[1])
+        intervals = self._layers.get(layer)
+        if not intervals:
+            return
+        position = bisect_left(intervals, key)
+        if position < len(intervals) and intervals[position] == key:
+            del intervals[position]
+            self._count -= 1
+            if not intervals:
+                del self._layers[layer]
+
+    def out_between(self, start: date, end: date) -> set:
+        """ Ids dos funcionários com algum dia de afastamento em [start, end]. """
+        first, last = start.toordinal(), end.toordinal() + 1
+        result = set()
+        for layer, intervals in self._layers.items():
+            max_days = 2 ** (layer + 1) - 2
+            lo = bisect_left(intervals, (date.fromordinal(max(1, first - max_days)),))
+            hi = bisect_left(intervals, (date.fromordinal(last),))
+            result.update(employee_id for _, leave_end, _, employee_id in intervals[lo:hi] if leave_end >= start)
+        return result
+
+    def out_on(self, day: date) -> set:
+        """ Ids dos funcionários afastados no dia 'day'. """
+        return self.out_between(day, day)
+
+
+class TrainingCalendar:
+    """
+    Calendário de treinamentos da empresa.
+    Uma sessão é identificada por (início, descrição); '_sessions' mantém as sessões
+    ordenadas pelo início, '_attendees' os participantes de cada uma e '_by_day'
+    as sessões de cada dia.
+    """
+    def __init__(self):
+        self._sessions = []
+        self._attendees = {}
+        self._by_day = {}
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def add(self, employee_id: int, start: datetime, description: str):
+        session = (start, description)
+        attendees = self._attendees.get(session)
+        if attendees is None:
+            attendees = self._attendees[session] = set()
+            insort(self._sessions, session)
+            self._by_day.setdefault(start.date(), set()).add(session)
+        attendees.add(employee_id)
+
+    def remove(self, employee_id: int, start: datetime, description: str):
+        session = (start, description)
+        attendees = self._attendees.get(session)
+        if attendees is None:
+            return
+        attendees.discard(employee_id)
+        if not attendees:
+            del self._attendees[session]
+            position = bisect_left(self._sessions, session)
+            del self._sessions[position]
+            day_sessions = self._by_day[start.date()]
+            day_sessions.discard(session)
+            if not day_sessions:
+                del self._by_day[start.date()]
+
+    def upcoming(self, days: int = 7, now: datetime = None) -> list:
+        """ Sessões com início em [now, now + days), como (início, descrição, nº de participantes). """
+        now = now or datetime.now()
+        lo = bisect_left(self._sessions, (now,))
+        hi = bisect_left(self._sessions, (now + timedelta(days=days),))
+        return [(start, description, len(self._attendees[(start, description)]))
+                for start, description in self._sessions[lo:hi]]
+
+    def sessions_on(self, day: date) -> list:
+        return sorted(self._by_day.get(day, ()))
+
+    def attendees(self, start: datetime, description: str) -> set:
+        return set(self._attendees.get((start, description), ()))
+
+
+class PerformanceAnalytics:
+    """
+    Distribuição das avaliações de performance por departamento e por cargo.
+    Cada grupo guarda a contagem por nível ([_, Good, Average, Bad]) e
+    '_trending' guarda, por departamento, os funcionários tendendo a Bad; as
+    consultas da empresa somam os grupos, em O(departamentos).
+    """
+    def __init__(self):
+        self._by_department = {}
+        self._by_role = {}
+        self._trending = {}
+
+    def record(self, department: str, role: str, level: int, delta: int):
+        """ Soma 'delta' avaliações de nível 'level' ao departamento e ao cargo. """
+        for groups, key in ((self._by_department, department), (self._by_role, role)):
+            counts = groups.setdefault(key, [0, 0, 0, 0])
+            counts[level] += delta
+            if not any(counts):
+                del groups[key]
+
+    def set_trending(self, employee_id: int, department: str, trending: bool):
+        members = self._trending.setdefault(department, set())
+        if trending:
+            members.add(employee_id)
+        else:
+            members.discard(employee_id)
+        if not members:
+            del self._trending[department]
+
+    def distribution(self, department: str = None, role: str = None) -> dict:
+        """ Contagem por nível (1: Good, 2: Average, 3: Bad) da empresa, de um departamento ou de um cargo. """
+        if department is not None:
+            groups = [self._by_department.get(department, [0, 0, 0, 0])]
+        elif role is not None:
+            groups = [self._by_role.get(role, [0, 0, 0, 0])]
+        else:
+            groups = self._by_department.values()
+        totals = [0, 0, 0, 0]
+        for counts in groups:
+            for level in (1, 2, 3):
+                totals[level] += counts[level]
+        return {level: totals[level] for level in (1, 2, 3)}
+
+    def departments(self) -> list:
+        return sorted(self._by_department)
+
+    def roles(self) -> list:
+        return sorted(self._by_role)
+
+    def trending_to_bad(self, department: str = None) -> set:
+        if department is not None:
+            return set(self._trending.get(department, ()))
+        return set().union(*self._trending.values())
+
+
+def normalize_text(value: str) -> str:
+    """ Minúsculas e sem acentos, para que 'emidio' encontre 'Emídio'. """
+    decomposed = unicodedata.normalize("NFKD", str(value).lower())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+class EmployeeSearchIndex:
+    """
+    Busca por nome/email.
+    - '_tokens': lista ordenada de (palavra, employee_id) do nome e do email,
+      para busca por prefixo com bisect.
+    - '_trigrams': trigrama -> ids, para busca por substring (consultas com 3+
+      caracteres intersectam os conjuntos e confirmam no texto normalizado).
+    """
+    def __init__(self):
+        self._tokens = []
+        self._trigrams = {}
+        self._texts = {}
+        self._names = {}
+
+    def __len__(self):
+        return len(self._texts)
+
+    @staticmethod
+    def _split(name: str, email: str):
+        local = email.partition("@")[0]
+        words = normalize_text(name).split() + [normalize_text(local), normalize_text(email)]
+        return sorted(set(word for word in words if word)), normalize_text(f"{name} {email}")
+
+    def add(self, employee_id: int, name: str, email: str):
+        tokens, text = self._split(name, email)
+        for token in tokens:
+            insort(self._tokens, (token, employee_id))
+        for i in range(len(text) - 2):
+            self._trigrams.setdefault(text[i:i + 3], set()).add(employee_id)
+        self._texts[employee_id] = text
+        self._names[employee_id] = normalize_text(name)
+
+    def remove(self, employee_id: int, name: str, email: str):
+        tokens, text = self._split(name, email)
+        for token in tokens:
+            position = bisect_left(self._tokens, (token, employee_id))
+            if position < len(self._tokens) and self._tokens[position] == (token, employee_id):
+                del self._tokens[position]
+        for i in range(len(text) - 2):
+            members = self._trigrams.get(text[i:i + 3])
+            if members is not None:
+                members.discard(employee_id)
+                if not members:
+                    del self._trigrams[text[i:i + 3]]
+        self._texts.pop(employee_id, None)
+        self._names.pop(employee_id, None)
+
+    def _prefix_matches(self, prefix: str) -> set:
+        hi = bisect_left(self._tokens, (prefix + "\U0010ffff",))
+        return {employee_id for _, employee_id in self._tokens[bisect_left(self._tokens, (prefix,)):hi]}
+
+    def search(self, query: str) -> list:
+        """
+        Ids que casam com a consulta, ordenados pelo nome: primeiro os que têm uma
+        palavra começando pela consulta, depois os que só a contêm no meio.
+        """
+        query = normalize_text(query).strip()
+        if not query:
+            return []
+        prefix = self._prefix_matches(query) if " " not in query else set()
+        if len(query) >= 3:
+            candidates = None
+            for i in range(len(query) - 2):
+                members = self._trigrams.get(query[i:i + 3], set())
+                candidates = members if candidates is None else candidates & members
+                if not candidates:
+                    break
+            substring = {employee_id for employee_id in candidates or () if query in self._texts[employee_id]}
+        else:
+            substring = set()
+        by_name = lambda employee_id: (self._names[employee_id], employee_id)
+        return sorted(prefix, key=by_name) + sorted(substring - prefix, key=by_name)
+
+
+class PresenceIndex:
+    """
+    Quem está com o ponto aberto agora (entrou e ainda não saiu).
+    '_present' mapeia employee_id -> departamento e '_by_department' mapeia
+    departamento -> {employee_id: horário de entrada}; clock in, clock out e
+    mudança de departamento atualizam os dois em O(1).
+    'watcher' (ex: ShiftScheduler) é avisado de cada turno aberto e fechado.
+    """
+    def __init__(self):
+        self._present = {}
+        self._by_department = {}
+        self.watcher = None
+
+    def __len__(self):
+        return len(self._present)
+
+    def __contains__(self, employee_id):
+        return employee_id in self._present
+
+    def clock_in(self, employee_id: int, department: str, since: datetime, attendance=None):
+        if employee_id in self._present:
+            self.clock_out(employee_id)
+        self._present[employee_id] = department
+        self._by_department.setdefault(department, {})[employee_id] = since
+        if self.watcher is not None:
+            self.watcher.shift_opened(employee_id, since, attendance)
+
+    def clock_out(self, employee_id: int):
+        """ Remove o funcionário dos presentes e retorna o horário de entrada (ou None). """
+        department = self._present.pop(employee_id, None)
+        if department is None:
+            return None
+        members = self._by_department[department]
+        since = members.pop(employee_id)
+        if not members:
+            del self._by_department[department]
+        if self.watcher is not None:
+            self.watcher.shift_closed(employee_id)
+        return since
+
+    def move(self, employee_id: int, department: str):
+        """ Mudança de departamento de quem está presente: a contagem acompanha (o turno continua o mesmo). """
+        current = self._present.get(employee_id)
+        if current is not None and current != department:
+            members = self._by_department[current]
+            since = members.pop(employee_id)
+            if not members:
+                del self._by_department[current]
+            self._present[employee_id] = department
+            self._by_department.setdefault(department, {})[employee_id] = since
+
+    def since(self, employee_id: int):
+        department = self._present.get(employee_id)
+        return self._by_department[department][employee_id] if department is not None else None
+
+    def present(self, department: str = None) -> list:
+        """ (employee_id, horário de entrada) de quem está presente, opcionalmente só de um departamento. """
+        if department is not None:
+            return list(self._by_department.get(department, {}).items())
+        return [(employee_id, since) for members in self._by_department.values() for employee_id, since in members.items()]
+
+    def count(self, department: str = None) -> int:
+        if department is None:
+            return len(self._present)
+        return len(self._by_department.get(department, ()))
+
+    def by_department(self) -> dict:
+        return {department: len(members) for department, members in self._by_department.items()}
+
+
+class SortedListing:
+    """
+    Todos os funcionários em ordem por uma chave de listagem (listing.py), terminada
+    no id. Mantida por busca binária: contratação, desligamento e alteração do campo
+    inserem ou retiram um único item, sem reordenar a empresa.
+    """
+    def __init__(self, sort_key, employees):
+        self._sort_key = sort_key
+        entries = sorted((sort_key(employee), employee) for employee in employees)
+        self.keys = [key for key, _ in entries]
+        self.employees = [employee for _, employee in entries]
+
+    def __len__(self):
+        return len(self.keys)
+
+    def add(self, employee):
+        key = self._sort_key(employee)
+        position = bisect_left(self.keys, key)
+        self.keys.insert(position, key)
+        self.employees.insert(position, employee)
+
+    def remove(self, employee):
+        """ Retira o funcionário; deve ser chamado antes de alterar o campo da chave. """
+        position = bisect_left(self.keys, self._sort_key(employee))
+        if position < len(self.employees) and self.employees[position] is employee:
+            del self.keys[position]
+            del self.employees[position]
+
+
+class EmployeeIndexes:
+    """
+    Índices alimentados pelos registros do próprio Employee (afastamentos,
+    treinamentos, avaliações de performance, nome/email, presença). O HRSystem possui uma instância e a associa a cada
+    funcionário contratado.
+    """
+    def __init__(self):
+        self.leaves = LeaveIndex()
+        self.trainings = TrainingCalendar()
+        self.performance = PerformanceAnalytics()
+        self.search = EmployeeSearchIndex()
+        self.presence = PresenceIndex()
+        # Listagem ordenada (listing.py): ordenação -> SortedListing, criada na primeira consulta
+        self.listings = {}
@@ -0,0 +1,125 @@
+# listing.py
+"""
+Listagem paginada por cursor dos funcionários.
+
+O cursor guarda o valor da chave de ordenação do último item entregue (e o id
+do funcionário como desempate), e não uma posição na lista. Assim, contratações
+e desligamentos entre uma página e outra não deslocam nem repetem itens.
+"""
+
+import base64
+import json
+from bisect import bisect_right
+
+from indexes import SortedListing, normalize_text
+from exceptions import HRSystemException
+
+SORT_KEYS = {
+    "id": lambda employee: (employee.employee_id,),
+    "name": lambda employee: (normalize_text(employee.name), employee.employee_id),
+    "salary": lambda employee: (employee.salary_per_hour, employee.employee_id),
+    "department": lambda employee: (employee.department, employee.employee_id),
+    "hire_date": lambda employee: (str(employee.hire_date), employee.employee_id),
+}
+
+FILTERS = {
+    "department": lambda value: lambda employee: employee.department == value,
+    "position": lambda value: lambda employee: employee.work_position == value,
+    "type": lambda value: lambda employee: type(employee).__name__ == value,
+    "min_salary": lambda value: lambda employee: employee.salary_per_hour >= value,
+    "max_salary": lambda value: lambda employee: employee.salary_per_hour <= value,
+}
+
+
+class EmployeePage:
+    """ Uma página de resultados: 'items' (tupla imutável) e o cursor da próxima página (None no fim). """
+    def __init__(self, items, next_cursor):
+        self.items = tuple(items)
+        self.next_cursor = next_cursor
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+
+def encode_cursor(sort_by: str, key: tuple) -> str:
+    raw = json.dumps([sort_by, list(key)], ensure_ascii=False).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_cursor(cursor: str, sort_by: str) -> tuple:
+    try:
+        cursor_sort, key = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (ValueError, TypeError, AttributeError):
+        raise HRSystemException(f"Cursor inválido: '{cursor}'")
+    if cursor_sort != sort_by:
+        raise HRSystemException(f"Cursor gerado para ordenação '{cursor_sort}', mas a consulta usa '{sort_by}'")
+    return tuple(key)
+
+
+def compile_filters(filters) -> callable:
+    """ Converte um dict de filtros (ex: {'department': 'Vendas'}) ou um callable em um predicado. """
+    if filters is None:
+        return lambda employee: True
+    if callable(filters):
+        return filters
+    unknown = set(filters) - set(FILTERS)
+    if unknown:
+        raise HRSystemException(
+            f"Filtros desconhecidos: {', '.join(sorted(unknown))}. Disponíveis: {', '.join(FILTERS)}"
+        )
+    predicates = [FILTERS[name](value) for name, value in filters.items()]
+    return lambda employee: all(predicate(employee) for predicate in predicates)
+
+
+def _sorted_listing(hr_system, sort_by: str) -> SortedListing:
+    """ Ordem mantida de 'sort_by' em EmployeeIndexes, ordenada uma única vez na primeira consulta. """
+    listings = hr_system.indexes.listings
+    listing = listings.get(sort_by)
+    if listing is None:
+        listing = listings[sort_by] = SortedListing(SORT_KEYS[sort_by], hr_system.employees_list)
+    return listing
+
+
+def page_employees(hr_system, cursor=None, limit=50, sort_by="id", filters=None) -> EmployeePage:
+    """
+    Retorna a página seguinte ao 'cursor'.
+    Ordenado por id, percorre o índice de ids a partir do cursor (busca binária)
+    e para ao completar a página. As demais ordenações fazem o mesmo sobre a
+    ordem por chave mantida em EmployeeIndexes (SortedListing): ordenada uma vez,
+    e depois só atualizada item a item por contratações, desligamentos e alterações
+    do campo, então páginas entre contratações não reordenam a empresa.
+    """
+    if sort_by not in SORT_KEYS:
+        raise HRSystemException(f"Ordenação desconhecida: '{sort_by}'. Disponíveis: {', '.join(SORT_KEYS)}")
+    if not isinstance(limit, int) or limit <= 0:
+        raise HRSystemException(f"Limite deve ser um número inteiro positivo, recebido: {limit}")
+    predicate = compile_filters(filters)
+    sort_key = SORT_KEYS[sort_by]
+    after = decode_cursor(cursor, sort_by) if cursor is not None else None
+
+    if sort_by == "id":
+        employee_ids = hr_system.employee_ids
+        position = bisect_right(employee_ids, after[0]) if after is not None else 0
+        items = []
+        while position < len(employee_ids) and len(items) <= limit:
+            employee = hr_system.get_employee_by_id(employee_ids[position])
+            if predicate(employee):
+                items.append(employee)
+            position += 1
+    else:
+        listing = _sorted_listing(hr_system, sort_by)
+        keys, employees = listing.keys, listing.employees
+        position = bisect_right(keys, after) if after is not None else 0
+        items = []
+        while position < len(employees) and len(items) <= limit:
+            employee = employees[position]
+            if predicate(employee):
+                items.append(employee)
+            position += 1
+
+    page, has_more = items[:limit], len(items) > limit
+    next_cursor = encode_cursor(sort_by, sort_key(page[-1])) if has_more else None
+    return EmployeePage(page, next_cursor)
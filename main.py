@@ -1,13 +1,16 @@
 # main.py
 
+import argparse
+import os
 from facade import HRFacade
 from models import Observer, Employee, Department, OrganizationalComponent
 from hr_system import HRSystem
 from commands import AddTrainingCommand, AddPerformanceEvaluationCommand, CommandInvoker
+from batch import BatchRunner
 from exceptions import (
     InvalidEmployeeIndexException, InvalidEmployeeDataException,
     InvalidEmployeeTypeException, InvalidIndexException,
-    InvalidPerformanceLevelException, HRSystemException
+    InvalidPerformanceLevelException, PersistenceException, HRSystemException
 )
 
 class PayrollNotifier(Observer):
@@ -19,6 +22,54 @@ class PayrollNotifier(Observer):
         print(f"----------------------")
 
 
+EMPLOYEES_PER_PAGE = 10
+
+
+def select_employee(facade: HRFacade, prompt: str):
+    """
+    Seletor paginado com busca: mostra uma página por vez e aceita o número do
+    funcionário, um texto para buscar por nome/email, 'n'/'p' para navegar ou
+    Enter vazio para cancelar. Retorna o índice do funcionário ou None.
+    """
+    query = ""
+    page = 0
+    cursors = [None]  # cursor de início de cada página já visitada da listagem completa
+    while True:
+        if query:
+            # Busca uma entrada a mais só para saber se existe próxima página
+            found = facade.search_employees(query, EMPLOYEES_PER_PAGE + 1, page * EMPLOYEES_PER_PAGE)
+            page_items, has_next = found[:EMPLOYEES_PER_PAGE], len(found) > EMPLOYEES_PER_PAGE
+        else:
+            listing = facade.list_employees(cursors[page], EMPLOYEES_PER_PAGE)
+            page_items, has_next = list(listing), listing.next_cursor is not None
+            del cursors[page + 1:]
+            if has_next:
+                cursors.append(listing.next_cursor)
+        
+        header = f"Busca: '{query}'" if query else "Todos os funcionários"
+        print(f"\n{header} - página {page + 1}")
+        if not page_items:
+            print("Nenhum funcionário encontrado.")
+        for i, emp in enumerate(page_items, 1):
+            print(f"({i}) {emp.name} <{emp.email}>")
+        
+        navigation = ["texto = buscar"] + (["n = próxima"] if has_next else []) + (["p = anterior"] if page > 0 else [])
+        answer = input(f"{prompt} ({', '.join(navigation)}, Enter = cancelar): ").strip()
+        if not answer:
+            return None
+        if answer.lower() == "n" and has_next:
+            page += 1
+        elif answer.lower() == "p" and page > 0:
+            page -= 1
+        elif answer.isdigit():
+            choice = int(answer)
+            if 1 <= choice <= len(page_items):
+                return facade.index_of(page_items[choice - 1])
+            print(f"Erro: Índice inválido. Escolha um número entre 1 e {len(page_items)}")
+        else:
+            query, page = answer, 0
+
+
 def setup_organization(facade: HRFacade) -> Department:
     """
     Função auxiliar para montar a hierarquia da empresa
@@ -46,21 +97,57 @@ def setup_organization(facade: HRFacade) -> Department:
     
     return company_root, marcela
 
-def main():
+def main(argv=None):
     """
     Função principal que executa o loop da aplicação.
     Agora, o 'main' interage principalmente com a 'HRFacade'.
+    Com '--snapshot', a organização é carregada do snapshot binário (se existir)
+    e gravada nele ao sair. Com '--batch', executa o roteiro de comandos (batch.py)
+    sem menus e retorna 1 se algum comando falhou.
     """
+    parser = argparse.ArgumentParser(description="Sistema de Gestão de RH")
+    parser.add_argument("--snapshot", help="Arquivo de snapshot binário da organização")
+    parser.add_argument("--tax-config", help="Tabela de imposto progressivo e bônus em JSON (ex: tax_config.json)")
+    parser.add_argument("--batch", metavar="ROTEIRO",
+                        help="Executa os comandos do arquivo ('-' para stdin) sem menus e sai")
+    args = parser.parse_args(argv)
 
     hr_facade = HRFacade()
+    payroll_system = PayrollNotifier()
+    if args.tax_config:
+        hr_facade.configure_tax_engine(args.tax_config)
     
-    company, marcela = setup_organization(hr_facade)
+    if args.snapshot and os.path.exists(args.snapshot):
+        try:
+            company = hr_facade.load_organization(args.snapshot)
+        except PersistenceException as e:
+            print(f"Erro ao carregar a organização de '{args.snapshot}': {str(e)}")
+            return 1
+        # Observers não fazem parte do snapshot: reconecta o PayrollNotifier
+        for employee in hr_facade.iter_employees():
+            employee.attach(payroll_system)
+        print(f"Organização carregada de '{args.snapshot}' ({len(hr_facade.get_employee_list())} funcionários).")
+    elif args.batch:
+        company = None  # o lote começa de uma empresa vazia (ou do snapshot)
+    else:
+        company, marcela = setup_organization(hr_facade)
 
-    payroll_system = PayrollNotifier()
-    marcela.attach(payroll_system)
+        marcela.attach(payroll_system)
 
-    print("\n>>> MUDANDO O SALÁRIO DA MARCELA PARA DEMONSTRAR O OBSERVER <<<")
-    marcela.salary_per_hour = 55 
+        print("\n>>> MUDANDO O SALÁRIO DA MARCELA PARA DEMONSTRAR O OBSERVER <<<")
+        marcela.salary_per_hour = 55 
+
+    if args.batch:
+        try:
+            result = BatchRunner(hr_facade).run_file(args.batch)
+        except HRSystemException as e:
+            print(f"Erro no sistema de RH: {str(e)}")
+            return 1
+        print(result.summary())
+        if args.snapshot:
+            size = hr_facade.save_organization(args.snapshot, company)
+            print(f"Organização salva em '{args.snapshot}' ({size} bytes).")
+        return 0 if result.ok else 1
 
     while True:
         print("\n============== Human Resources Management System (Facade) ==============\n")
@@ -149,16 +236,8 @@ def main():
                                 print("Nenhum funcionário cadastrado para remover")
                                 continue
                             
-                            for i, emp in enumerate(employees):
-                                print(f"({i+1}) {emp.name}")
-                            
-                            try:
-                                remove_index = int(input("Enter the number of the employee to remove: ")) - 1
-                                if remove_index < 0 or remove_index >= len(employees):
-                                    print(f"Erro: Índice inválido. Escolha um número entre 1 e {len(employees)}")
-                                    continue
-                            except ValueError:
-                                print("Erro: Por favor, digite um número válido")
+                            remove_index = select_employee(hr_facade, "Enter the number of the employee to remove")
+                            if remove_index is None:
                                 continue
                             
                             try:
@@ -175,16 +254,8 @@ def main():
                         print("Nenhum funcionário cadastrado para gerenciar")
                         continue
                     
-                    for i, emp in enumerate(employees):
-                        print(f"({i+1}) {emp.name}")
-                    
-                    try:
-                        mgmt_index = int(input("Choose employee to manage: ")) - 1
-                        if mgmt_index < 0 or mgmt_index >= len(employees):
-                            print(f"Erro: Índice inválido. Escolha um número entre 1 e {len(employees)}")
-                            continue
-                    except ValueError:
-                        print("Erro: Por favor, digite um número válido")
+                    mgmt_index = select_employee(hr_facade, "Choose employee to manage")
+                    if mgmt_index is None:
                         continue
                     
                     employee = employees[mgmt_index]
@@ -240,16 +311,8 @@ def main():
                         print("Nenhum funcionário cadastrado para calcular pagamento")
                         continue
                     
-                    for i, emp in enumerate(employees):
-                        print(f"({i+1}) {emp.name}")
-                    
-                    try:
-                        person_index = int(input("Choose employee to calculate salary: ")) - 1
-                        if person_index < 0 or person_index >= len(employees):
-                            print(f"Erro: Índice inválido. Escolha um número entre 1 e {len(employees)}")
-                            continue
-                    except ValueError:
-                        print("Erro: Por favor, digite um número válido")
+                    person_index = select_employee(hr_facade, "Choose employee to calculate salary")
+                    if person_index is None:
                         continue
                     
                     try:
@@ -265,16 +328,8 @@ def main():
                         print("Nenhum funcionário cadastrado para gerar relatório")
                         continue
                     
-                    for i, emp in enumerate(employees):
-                        print(f"({i+1}) {emp.name}")
-                    
-                    try:
-                        rep_index = int(input("Choose employee for report: ")) - 1
-                        if rep_index < 0 or rep_index >= len(employees):
-                            print(f"Erro: Índice inválido. Escolha um número entre 1 e {len(employees)}")
-                            continue
-                    except ValueError:
-                        print("Erro: Por favor, digite um número válido")
+                    rep_index = select_employee(hr_facade, "Choose employee for report")
+                    if rep_index is None:
                         continue
                     
                     print("\n(1) Attendance Report\n(2) Compliance Report")
@@ -299,9 +354,15 @@ def main():
 
                 case 5:
                     print("\n--- Company Organizational Hierarchy ---")
+                    if company is None:
+                        print("Nenhuma hierarquia cadastrada.")
+                        continue
                     company.display_hierarchy()
 
                 case 6:
+                    if args.snapshot:
+                        size = hr_facade.save_organization(args.snapshot, company)
+                        print(f"Organização salva em '{args.snapshot}' ({size} bytes).")
                     print("Exiting system. Goodbye!")
                     return
 
@@ -320,4 +381,4 @@ def main():
             print("Por favor, tente novamente ou reinicie o sistema.")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    raise SystemExit(main())
\ No newline at end of file
@@ -1,12 +1,65 @@
 # models.py
 from abc import ABC, abstractmethod
+from bisect import bisect_right
+from datetime import timedelta
+from indexes import parse_date, parse_datetime
+from snapshots import Versioned
+from hierarchy import number_nested_sets, render_hierarchy
 from exceptions import (
     InvalidNameException, InvalidAgeException, InvalidEmailException,
     InvalidDepartmentException, InvalidSalaryException, InvalidIndexException,
     InvalidPerformanceLevelException, BenefitAlreadyExistsException,
-    BenefitNotFoundException
+    BenefitNotFoundException, InvalidDateException, LeaveOverlapException,
+    TrainingConflictException
 )
 
+# Duração considerada para cada sessão de treinamento ao detectar conflitos de agenda
+TRAINING_SLOT = timedelta(minutes=60)
+
+PERFORMANCE_LEVELS = {1: "Good", 2: "Average", 3: "Bad"}
+# Média móvel das últimas avaliações; a partir deste valor o funcionário "tende a Bad"
+ROLLING_WINDOW = 3
+TRENDING_BAD_THRESHOLD = 2.5
+# Faixa aceita pelo setter de salário (e verificada antes pelos comandos de reajuste em lote)
+MIN_SALARY_PER_HOUR = 1.0
+MAX_SALARY_PER_HOUR = 10000.0
+# Consultas de ancestralidade com a árvore alterada, por componente, antes de renumerá-la (ver is_under)
+RENUMBER_STALE_RATIO = 32
+
+class IdSequence:
+    """
+    Gerador dos ids de funcionário: 'start', 'start + step', ...
+    'step' > 1 separa os ids dos shards (sharding.py); 'peek' e 'advance_to'
+    permitem gravar e restaurar o próximo id (persistence.py) sem consumi-lo.
+    """
+    def __init__(self, start: int = 1, step: int = 1):
+        self._next = start
+        self.step = step
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> int:
+        value = self._next
+        self._next += self.step
+        return value
+
+    def peek(self) -> int:
+        return self._next
+
+    def advance_to(self, minimum: int):
+        """ Garante que o próximo id seja >= 'minimum', mantendo o passo (e o shard) da sequência. """
+        if self._next < minimum:
+            self._next += -(-(minimum - self._next) // self.step) * self.step
+
+def find_training_conflict(starts, start):
+    """ Vizinho em 'starts' (inícios ordenados) a menos de TRAINING_SLOT de 'start', ou None. """
+    position = bisect_right(starts, start)
+    for neighbor in starts[max(0, position - 1):position + 1]:
+        if abs(neighbor - start) < TRAINING_SLOT:
+            return neighbor
+    return None
+
 # Padrão Observer - Classes Base
 class Observer(ABC):
     @abstractmethod
@@ -14,6 +67,10 @@ class Observer(ABC):
         pass
 
 class Subject(ABC):
+    # Enquanto não for None (lote de comandos em andamento), 'notify' só marca o
+    # sujeito como pendente; 'flush_notifications' avisa cada um uma única vez.
+    _pending_notifications = None
+
     def __init__(self):
         self._observers = []
 
@@ -25,14 +82,87 @@ class Subject(ABC):
         self._observers.remove(observer)
 
     def notify(self):
+        if Subject._pending_notifications is not None:
+            Subject._pending_notifications[id(self)] = self
+            return
         for observer in self._observers:
             observer.update(self)
 
+    @staticmethod
+    def defer_notifications():
+        if Subject._pending_notifications is None:
+            Subject._pending_notifications = {}
+
+    @staticmethod
+    def flush_notifications(discard: bool = False) -> int:
+        """ Encerra o adiamento e notifica os sujeitos pendentes (ou os descarta). Retorna quantos eram. """
+        pending, Subject._pending_notifications = Subject._pending_notifications or {}, None
+        if not discard:
+            for subject in pending.values():
+                subject.notify()
+        return len(pending)
+
 # PADRÃO ESTRUTURAL 1: COMPOSITE (Interface)
 # Objetivo: Definir uma interface comum para objetos 'folha' (Employee)
 # e objetos 'compostos' (Department), permitindo que sejam tratados uniformemente.
 class OrganizationalComponent(ABC):
-    
+    # Índice de ancestralidade: ponteiro para o departamento pai e intervalo do
+    # nested set (raiz, versão da árvore, esquerda, direita). Depois de uma alteração,
+    # as consultas sobem pelos pais até que a renumeração em lote compense (ver is_under)
+    _parent = None
+    _interval = None
+    _tree_version = 0
+    _numbered_nodes = 0   # na raiz: componentes na última numeração
+    _stale_queries = 0    # na raiz: consultas respondidas pelos pais desde a última numeração
+
+    @property
+    def parent(self):
+        return self._parent
+
+    def ancestors(self) -> list:
+        """ Departamentos acima do componente, do mais próximo até a raiz: O(profundidade). """
+        chain = []
+        node = self._parent
+        while node is not None:
+            chain.append(node)
+            node = node._parent
+        return chain
+
+    def get_root(self):
+        node = self
+        while node._parent is not None:
+            node = node._parent
+        return node
+
+    def _fresh_interval(self):
+        interval = self._interval
+        if interval is None or interval[1] != interval[0]._tree_version:
+            return None
+        return interval
+
+    def is_under(self, department) -> bool:
+        """
+        Se o componente está em qualquer nível abaixo de 'department' (ou é ele).
+        O(1) com o nested set em dia. Com a árvore alterada desde a última numeração,
+        responde subindo pelos pais (O(profundidade)) e só renumera a árvore depois de
+        1/RENUMBER_STALE_RATIO do seu tamanho em consultas assim: alternar escritas e
+        consultas custa O(profundidade + RENUMBER_STALE_RATIO) amortizado por consulta.
+        """
+        inner = self._fresh_interval()
+        outer = department._fresh_interval()
+        if inner is not None and outer is not None:
+            return inner[0] is outer[0] and outer[2] <= inner[2] and inner[3] <= outer[3]
+        found = self is department
+        node = self
+        while node._parent is not None:
+            node = node._parent
+            found = found or node is department
+        node._stale_queries += 1
+        if node._stale_queries * RENUMBER_STALE_RATIO >= node._numbered_nodes:
+            number_nested_sets(node)
+            node._stale_queries = 0
+        return found
+
     @abstractmethod
     def display_hierarchy(self, indent_level: int = 0):
         """ Exibe a hierarquia organizacional. """
@@ -44,11 +174,14 @@ class OrganizationalComponent(ABC):
         pass
 
 
-class Person(ABC):
+class Person(Versioned, ABC):
     """
     Classe Abstrata que serve como um modelo base para qualquer 'pessoa' no sistema.
     """
+    _versioned_fields = ("_name", "_age", "_email")
+
     def __init__(self, name, age, email):
+        self._start_versioning()
         self._name = name
         self._age = age
         self._email = email
@@ -66,7 +199,12 @@ class Person(ABC):
                 raise InvalidNameException("Nome não pode ser vazio ou conter apenas espaços em branco")
             if len(value) > 100:
                 raise InvalidNameException("Nome não pode ter mais de 100 caracteres")
+            self._before_write()
+            old_name = self._name
+            listings = self._unlist("name")
             self._name = value.strip()
+            self._relist(listings)
+            self._identity_changed(old_name, self._email)
         except (TypeError, InvalidNameException) as e:
             raise InvalidNameException(f"Erro ao definir nome: {str(e)}")
     
@@ -87,6 +225,7 @@ class Person(ABC):
                 raise InvalidAgeException(f"Idade mínima permitida é 16 anos, recebido: {value}")
             if value > 100:
                 raise InvalidAgeException(f"Idade máxima permitida é 100 anos, recebido: {value}")
+            self._before_write()
             self._age = value
         except (TypeError, InvalidAgeException) as e:
             raise InvalidAgeException(f"Erro ao definir idade: {str(e)}")
@@ -110,10 +249,17 @@ class Person(ABC):
                 raise InvalidEmailException("Email deve ter um domínio válido (ex: exemplo@dominio.com)")
             if len(value) > 255:
                 raise InvalidEmailException("Email não pode ter mais de 255 caracteres")
+            self._before_write()
+            old_email = self._email
             self._email = value.strip().lower()
+            self._identity_changed(self._name, old_email)
         except (TypeError, InvalidEmailException) as e:
             raise InvalidEmailException(f"Erro ao definir email: {str(e)}")
     
+    def _identity_changed(self, old_name, old_email):
+        """ Gancho chamado após alterar nome ou email (ex: para reindexar a busca). """
+        pass
+
     @abstractmethod
     def get_role(self):
         pass
@@ -124,20 +270,36 @@ class Person(ABC):
 
 class Employee(Person, Subject, OrganizationalComponent):
     number_of_employees = 0
+    _id_sequence = IdSequence()
+    # Campos lidos pela folha e pelos relatórios, congelados pelos snapshots
+    _versioned_fields = Person._versioned_fields + (
+        "_department", "_work_position", "_salary_per_hour", "_hire_date",
+        "_benefits", "_performance", "_performance_counts", "_training", "_training_starts", "_requests"
+    )
     
     def __init__(self, name, age, email, department, work_position, salary_per_hour, hire_date):
         Person.__init__(self, name, age, email)
         Subject.__init__(self) 
+        self._employee_id = next(Employee._id_sequence)
         self._department = department
         self._work_position = work_position
         self._salary_per_hour = salary_per_hour
         self._hire_date = hire_date
         self._benefits = []
         self._performance = []
+        self._performance_counts = [0, 0, 0, 0]
         self._training = []
+        self._training_starts = []
         self._requests = []
+        self._leave_keys = []
+        self._indexes = None
         Employee.number_of_employees += 1
     
+    @property
+    def employee_id(self):
+        """ Identificador único e imutável, ao contrário da posição nas listas do HRSystem. """
+        return self._employee_id
+
     @property
     def department(self):
         return self._department
@@ -151,7 +313,14 @@ class Employee(Person, Subject, OrganizationalComponent):
                 raise InvalidDepartmentException("Departamento não pode ser vazio ou conter apenas espaços")
             if len(value) > 100:
                 raise InvalidDepartmentException("Departamento não pode ter mais de 100 caracteres")
+            self._before_write()
+            old_department = self._department
+            listings = self._unlist("department")
             self._department = value.strip()
+            self._relist(listings)
+            self._move_performance_group(old_department, self._work_position)
+            if self._indexes is not None:
+                self._indexes.presence.move(self._employee_id, self._department)
         except (TypeError, InvalidDepartmentException) as e:
             raise InvalidDepartmentException(f"Erro ao definir departamento: {str(e)}")
     
@@ -161,7 +330,10 @@ class Employee(Person, Subject, OrganizationalComponent):
     
     @work_position.setter
     def work_position(self, value):
+        self._before_write()
+        old_position = self._work_position
         self._work_position = value
+        self._move_performance_group(self._department, old_position)
     
     @property
     def salary_per_hour(self):
@@ -174,11 +346,14 @@ class Employee(Person, Subject, OrganizationalComponent):
                 raise TypeError(f"Salário deve ser um número, recebido: {type(value).__name__}")
             if value <= 0:
                 raise InvalidSalaryException(f"Salário deve ser um número positivo, recebido: {value}")
-            if value < 1.0:
+            if value < MIN_SALARY_PER_HOUR:
                 raise InvalidSalaryException(f"Salário por hora deve ser no mínimo R$ 1,00, recebido: R$ {value:.2f}")
-            if value > 10000.0:
+            if value > MAX_SALARY_PER_HOUR:
                 raise InvalidSalaryException(f"Salário por hora não pode exceder R$ 10.000,00, recebido: R$ {value:.2f}")
+            self._before_write()
+            listings = self._unlist("salary")
             self._salary_per_hour = float(value)
+            self._relist(listings)
             self.notify() 
         except (TypeError, InvalidSalaryException) as e:
             raise InvalidSalaryException(f"Erro ao definir salário: {str(e)}")
@@ -189,7 +364,10 @@ class Employee(Person, Subject, OrganizationalComponent):
     
     @hire_date.setter
     def hire_date(self, value):
+        self._before_write()
+        listings = self._unlist("hire_date")
         self._hire_date = value
+        self._relist(listings)
     
     def get_role(self):
         return f"Employee - {self._work_position}"
@@ -212,9 +390,73 @@ class Employee(Person, Subject, OrganizationalComponent):
         indent = "  " * indent_level
         print(f"{indent}- {self.name} ({self.get_role()})")
 
+    def attach_indexes(self, indexes):
+        """ Associa os índices da empresa (EmployeeIndexes) e indexa os registros já existentes. """
+        self._indexes = indexes
+        self._leave_keys = [
+            indexes.leaves.add(self._employee_id, leave["f_Date"], leave["s_Date"]) for leave in self._requests
+        ]
+        for start, session in zip(self._training_starts, self._training):
+            indexes.trainings.add(self._employee_id, start, session["Description"])
+        for level in (1, 2, 3):
+            indexes.performance.record(self._department, self._work_position, level, self._performance_counts[level])
+        indexes.performance.set_trending(self._employee_id, self._department, self.is_trending_to_bad)
+        indexes.search.add(self._employee_id, self._name, self._email)
+        for listing in indexes.listings.values():
+            listing.add(self)
+
+    def _unlist(self, sort_by: str) -> list:
+        """ Retira o funcionário da ordem de listagem 'sort_by' (se existir) antes de alterar o campo. """
+        listing = self._indexes.listings.get(sort_by) if self._indexes is not None else None
+        if listing is None:
+            return []
+        listing.remove(self)
+        return [listing]
+
+    def _relist(self, listings):
+        for listing in listings:
+            listing.add(self)
+
+    def detach_indexes(self):
+        """ Remove os registros deste funcionário dos índices da empresa (ex: desligamento). """
+        if self._indexes is not None:
+            for key in self._leave_keys:
+                self._indexes.leaves.remove(key)
+            for start, session in zip(self._training_starts, self._training):
+                self._indexes.trainings.remove(self._employee_id, start, session["Description"])
+            for level in (1, 2, 3):
+                self._indexes.performance.record(
+                    self._department, self._work_position, level, -self._performance_counts[level])
+            self._indexes.performance.set_trending(self._employee_id, self._department, False)
+            self._indexes.search.remove(self._employee_id, self._name, self._email)
+            self._indexes.presence.clock_out(self._employee_id)
+            for listing in self._indexes.listings.values():
+                listing.remove(self)
+        self._indexes = None
+        self._leave_keys = [None] * len(self._requests)
+
     def add_leave_request(self, start_date, end_date, reason):
-        leave = {"f_Date": start_date, "s_Date": end_date, "Description": reason}
-        self._requests.append(leave)
+        """
+        Registra um afastamento de 'start_date' a 'end_date' (YYYY-MM-DD, inclusivo).
+        '_requests' fica ordenada pela data de início, então a checagem de
+        sobreposição só precisa olhar os vizinhos da posição de inserção.
+        """
+        start = parse_date(start_date, "Data de início do afastamento")
+        end = parse_date(end_date, "Data de fim do afastamento")
+        if end < start:
+            raise InvalidDateException(f"Fim do afastamento ({end}) não pode ser anterior ao início ({start})")
+        position = bisect_right(self._requests, start, key=lambda leave: leave["f_Date"])
+        for neighbor in self._requests[max(0, position - 1):position + 1]:
+            if neighbor["f_Date"] <= end and start <= neighbor["s_Date"]:
+                raise LeaveOverlapException(
+                    f"Afastamento de {start} a {end} se sobrepõe ao afastamento de "
+                    f"{neighbor['f_Date']} a {neighbor['s_Date']} ({neighbor['Description']})"
+                )
+        leave = {"f_Date": start, "s_Date": end, "Description": reason}
+        self._before_write()
+        key = self._indexes.leaves.add(self._employee_id, start, end) if self._indexes is not None else None
+        self._requests.insert(position, leave)
+        self._leave_keys.insert(position, key)
     
     def remove_leave_request(self, index):
         try:
@@ -226,7 +468,11 @@ class Employee(Person, Subject, OrganizationalComponent):
                 raise InvalidIndexException(f"Índice {index} está fora do range. Total de solicitações: {len(self._requests)}")
             if len(self._requests) == 0:
                 raise InvalidIndexException("Não há solicitações de afastamento para remover")
+            self._before_write()
             self._requests.pop(index)
+            key = self._leave_keys.pop(index)
+            if self._indexes is not None:
+                self._indexes.leaves.remove(key)
         except (TypeError, InvalidIndexException) as e:
             raise InvalidIndexException(f"Erro ao remover solicitação de afastamento: {str(e)}")
     
@@ -238,9 +484,30 @@ class Employee(Person, Subject, OrganizationalComponent):
             for i, leave in enumerate(self._requests, 1):
                 print(f"{i}) {leave['f_Date']} to {leave['s_Date']} - {leave['Description']}")
 
+    def training_conflict(self, start):
+        """ Início do treinamento já agendado que conflita com 'start', ou None. """
+        return find_training_conflict(self._training_starts, start)
+
     def add_training(self, date_str, time_str, description):
-        session = {"Date": date_str, "Time": time_str, "Description": description}
-        self._training.append(session)
+        """
+        Agenda uma sessão (YYYY-MM-DD, HH:MM). '_training_starts' mantém os inícios
+        em ordem, paralela a '_training', para detectar choques de horário com busca binária.
+        """
+        start = parse_datetime(date_str, time_str, "Data do treinamento")
+        neighbor = self.training_conflict(start)
+        if neighbor is not None:
+            raise TrainingConflictException(
+                f"{self._name} já tem um treinamento em {neighbor.strftime('%Y-%m-%d %H:%M')}, "
+                f"conflitante com {start.strftime('%Y-%m-%d %H:%M')}"
+            )
+        position = bisect_right(self._training_starts, start)
+        session = {"Date": start.strftime("%Y-%m-%d"), "Time": start.strftime("%H:%M"), "Description": description}
+        self._before_write()
+        self._training.insert(position, session)
+        self._training_starts.insert(position, start)
+        if self._indexes is not None:
+            self._indexes.trainings.add(self._employee_id, start, description)
+        return position
     
     def remove_training(self, index):
         try:
@@ -252,7 +519,11 @@ class Employee(Person, Subject, OrganizationalComponent):
                 raise InvalidIndexException(f"Índice {index} está fora do range. Total de treinamentos: {len(self._training)}")
             if len(self._training) == 0:
                 raise InvalidIndexException("Não há treinamentos para remover")
-            self._training.pop(index)
+            self._before_write()
+            session = self._training.pop(index)
+            start = self._training_starts.pop(index)
+            if self._indexes is not None:
+                self._indexes.trainings.remove(self._employee_id, start, session["Description"])
         except (TypeError, InvalidIndexException) as e:
             raise InvalidIndexException(f"Erro ao remover treinamento: {str(e)}")
     
@@ -264,16 +535,60 @@ class Employee(Person, Subject, OrganizationalComponent):
             for i, session in enumerate(self._training, 1):
                 print(f"{i}) {session['Date']} at {session['Time']} - {session['Description']}")
     
+    @property
+    def rolling_performance_average(self):
+        """ Média das últimas ROLLING_WINDOW avaliações (None se não houver avaliações). """
+        window = self._performance[-ROLLING_WINDOW:]
+        return sum(window) / len(window) if window else None
+
+    @property
+    def is_trending_to_bad(self):
+        average = self.rolling_performance_average
+        return len(self._performance) >= 2 and average >= TRENDING_BAD_THRESHOLD
+
+    def performance_summary(self) -> dict:
+        """ Estatísticas mantidas incrementalmente: contagem por nível, última avaliação e média móvel. """
+        return {
+            "counts": {PERFORMANCE_LEVELS[level]: self._performance_counts[level] for level in (1, 2, 3)},
+            "latest": PERFORMANCE_LEVELS[self._performance[-1]] if self._performance else None,
+            "rolling_average": self.rolling_performance_average,
+            "trending_to_bad": self.is_trending_to_bad,
+        }
+
+    def _identity_changed(self, old_name, old_email):
+        if self._indexes is not None:
+            self._indexes.search.remove(self._employee_id, old_name, old_email)
+            self._indexes.search.add(self._employee_id, self._name, self._email)
+
+    def _record_performance(self, level, delta):
+        self._performance_counts[level] += delta
+        if self._indexes is not None:
+            self._indexes.performance.record(self._department, self._work_position, level, delta)
+            self._indexes.performance.set_trending(self._employee_id, self._department, self.is_trending_to_bad)
+
+    def _move_performance_group(self, old_department, old_position):
+        """ Move as estatísticas de performance para o novo departamento/cargo nos índices da empresa. """
+        if self._indexes is None or (old_department, old_position) == (self._department, self._work_position):
+            return
+        analytics = self._indexes.performance
+        for level in (1, 2, 3):
+            analytics.record(old_department, old_position, level, -self._performance_counts[level])
+            analytics.record(self._department, self._work_position, level, self._performance_counts[level])
+        analytics.set_trending(self._employee_id, old_department, False)
+        analytics.set_trending(self._employee_id, self._department, self.is_trending_to_bad)
+
     def add_performance_evaluation(self, level):
         try:
-            performance_levels = {1: "Good", 2: "Average", 3: "Bad"}
             if not isinstance(level, int):
                 raise TypeError(f"Nível de performance deve ser um número inteiro, recebido: {type(level).__name__}")
-            if level not in performance_levels:
+            if level not in PERFORMANCE_LEVELS:
                 raise InvalidPerformanceLevelException(
                     f"Nível de performance deve ser 1 (Good), 2 (Average) ou 3 (Bad), recebido: {level}"
                 )
+            self._before_write()
             self._performance.append(level)
+            self._record_performance(level, 1)
+            return len(self._performance) - 1
         except (TypeError, InvalidPerformanceLevelException) as e:
             raise InvalidPerformanceLevelException(f"Erro ao adicionar avaliação de performance: {str(e)}")
     
@@ -287,16 +602,20 @@ class Employee(Person, Subject, OrganizationalComponent):
                 raise InvalidIndexException(f"Índice {index} está fora do range. Total de avaliações: {len(self._performance)}")
             if len(self._performance) == 0:
                 raise InvalidIndexException("Não há avaliações de performance para remover")
-            self._performance.pop(index)
+            self._before_write()
+            level = self._performance.pop(index)
+            self._record_performance(level, -1)
         except (TypeError, InvalidIndexException) as e:
             raise InvalidIndexException(f"Erro ao remover avaliação de performance: {str(e)}")
     
     def show_performance(self):
-        performance_levels = {1: "Good", 2: "Average", 3: "Bad"}
         print(f"\nPerformance of {self._name}:")
         if self._performance:
             for i, level in enumerate(self._performance, 1):
-                print(f"{i}) {performance_levels[level]}")
+                print(f"{i}) {PERFORMANCE_LEVELS[level]}")
+            summary = self.performance_summary()
+            counts = ", ".join(f"{name}: {count}" for name, count in summary["counts"].items())
+            print(f"Summary: {counts} | Rolling average: {summary['rolling_average']:.2f}")
         else:
             print("No evaluations found.")
 
@@ -308,6 +627,7 @@ class Employee(Person, Subject, OrganizationalComponent):
                 raise ValueError("Benefício não pode ser vazio ou conter apenas espaços")
             if benefit in self._benefits:
                 raise BenefitAlreadyExistsException(f"O benefício '{benefit}' já foi adicionado para este funcionário")
+            self._before_write()
             self._benefits.append(benefit.strip())
         except (TypeError, ValueError, BenefitAlreadyExistsException) as e:
             raise BenefitAlreadyExistsException(f"Erro ao adicionar benefício: {str(e)}")
@@ -320,6 +640,7 @@ class Employee(Person, Subject, OrganizationalComponent):
                 raise BenefitNotFoundException(f"O benefício '{benefit}' não foi encontrado para este funcionário")
             if len(self._benefits) == 0:
                 raise BenefitNotFoundException("Não há benefícios para remover")
+            self._before_write()
             self._benefits.remove(benefit)
         except (TypeError, BenefitNotFoundException) as e:
             raise BenefitNotFoundException(f"Erro ao remover benefício: {str(e)}")
@@ -374,25 +695,47 @@ class Department(OrganizationalComponent):
         self._name = name
         self._children: list[OrganizationalComponent] = []
 
+    def _structure_changed(self):
+        # Invalida o nested set da árvore inteira; até a renumeração em lote, is_under sobe pelos pais
+        self.get_root()._tree_version += 1
+
     def add_component(self, component: OrganizationalComponent):
+        if component._parent is not None:
+            raise ValueError(f"Componente '{component.get_role()}' já pertence a '{component._parent._name}'")
+        root = self.get_root()
+        if component is root:
+            # 'component' não tem pai, então só forma ciclo se for a raiz desta árvore
+            raise ValueError(f"Componente '{component.get_role()}' não pode ser adicionado abaixo de si mesmo")
         self._children.append(component)
+        component._parent = self
+        component._tree_version += 1  # deixa de ser raiz: a numeração antiga não vale mais
+        root._tree_version += 1
 
     def remove_component(self, component: OrganizationalComponent):
         try:
             if component is None:
                 raise ValueError("Componente não pode ser None")
-            if component not in self._children:
+            if component._parent is not self:
                 raise ValueError(f"Componente '{component.get_role() if hasattr(component, 'get_role') else str(component)}' não encontrado no departamento")
             self._children.remove(component)
+            component._parent = None
+            self._structure_changed()
+            # A sub-árvore removida vira uma árvore própria, com numeração nova
+            component._tree_version += 1
         except (ValueError, AttributeError) as e:
             raise ValueError(f"Erro ao remover componente: {str(e)}")
 
+    def contains(self, component: OrganizationalComponent) -> bool:
+        """ Se 'component' está em qualquer nível abaixo deste departamento (ou é ele). """
+        return component.is_under(self)
+
+    def path(self) -> str:
+        """ Caminho de nomes a partir da raiz, no formato aceito por render_hierarchy(subtree=...). """
+        return "/".join(department._name for department in reversed([self] + self.ancestors()))
+
     def get_role(self) -> str:
         return f"Department - {self._name}"
 
     def display_hierarchy(self, indent_level: int = 0):
-        indent = "  " * indent_level
-        print(f"{indent}+ {self._name} (Departamento)")
-        
-        for child in self._children:
-            child.display_hierarchy(indent_level + 1)
\ No newline at end of file
+        # Percurso iterativo (hierarchy.py): árvores profundas não estouram o limite de recursão
+        render_hierarchy(self, indent_level=indent_level)
\ No newline at end of file
@@ -0,0 +1,277 @@
+# persistence.py
+"""
+Snapshot binário da organização inteira para partida rápida.
+
+Formato (versionado): cabeçalho struct '<8sHQI' (MAGIC, versão, tamanho e CRC32
+do conteúdo) seguido de um único bloco 'marshal' com tipos simples (tuplas,
+listas, números e strings). Datas viram ordinais e horários viram texto ISO 8601
+(datetime.fromisoformat é o jeito mais rápido de recriá-los). A hierarquia é
+gravada em pré-ordem plana (sem recursão).
+
+A carga reconstrói os objetos direto pelos construtores e atributos internos,
+sem Builder/Factory nem revalidação campo a campo (os dados já foram validados
+quando entraram no sistema); os índices da empresa são reconstruídos ao final.
+"""
+
+import marshal
+import os
+import struct
+import zlib
+from datetime import date, datetime
+
+from models import Employee, Manager, Intern, Department, PERFORMANCE_LEVELS
+from services import Attendance, Compliance
+from punch_log import PunchLog
+from indexes import parse_severity
+from exceptions import PersistenceException, HRSystemException
+
+MAGIC = b"HRORGSNP"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<8sHQI")  # magic, versão, tamanho do conteúdo, CRC32 do conteúdo
+MARSHAL_VERSION = 4
+
+EMPLOYEE_TYPES = {"Employee": Employee, "Manager": Manager, "Intern": Intern}
+
+
+def _encode_employee(employee: Employee) -> tuple:
+    kind = type(employee).__name__
+    if kind not in EMPLOYEE_TYPES:
+        raise PersistenceException(f"Tipo de funcionário sem suporte no snapshot: {kind}")
+    if kind == "Manager":
+        extra = (employee._team_size, [managed.employee_id for managed in employee._managed_employees])
+    elif kind == "Intern":
+        extra = employee._mentor.employee_id if employee._mentor is not None else None
+    else:
+        extra = None
+    return (
+        kind, employee.employee_id, employee._name, employee._age, employee._email,
+        employee._department, employee._work_position, employee._salary_per_hour, employee._hire_date,
+        list(employee._benefits), list(employee._performance),
+        [(start.isoformat(), session["Description"]) for start, session in zip(employee._training_starts, employee._training)],
+        [(leave["f_Date"].toordinal(), leave["s_Date"].toordinal(), leave["Description"]) for leave in employee._requests],
+        extra,
+    )
+
+
+def _encode_attendance(attendance: Attendance) -> tuple:
+    return (
+        [(record["in"].isoformat(), record["out"].isoformat() if record["out"] is not None else None)
+         for record in attendance._record],
+        [(day.toordinal(), seconds) for day, seconds in attendance._daily.items()],
+        [(day.toordinal(), seconds, count) for day, (seconds, count) in attendance._archived.items()],
+        [(segment["path"], segment["first"].isoformat(), segment["last"].isoformat(), segment["count"])
+         for segment in attendance._archive_segments],
+    )
+
+
+def _encode_compliance(compliance: Compliance) -> list:
+    return [
+        (violation["Date"], violation["Description"], violation["Severity"])
+        for violation in compliance._violations
+    ]
+
+
+def _encode_hierarchy(root, employees_by_id: dict) -> list:
+    """
+    Pré-ordem plana: ('D', nome, nº de filhos) para departamentos e ('E', id) para funcionários.
+    Funcionários que não estão mais no sistema (desligados) ficam de fora.
+    """
+    nodes = []
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, Department):
+            children = [
+                child for child in node._children
+                if isinstance(child, Department) or employees_by_id.get(child.employee_id) is child
+            ]
+            nodes.append(("D", node._name, len(children)))
+            stack.extend(reversed(children))
+        else:
+            nodes.append(("E", node.employee_id))
+    return nodes
+
+
+def save_organization(path: str, hr_system, hierarchy: Department = None) -> int:
+    """ Grava o estado do HRSystem (e, opcionalmente, a hierarquia) em 'path'. Retorna o tamanho em bytes. """
+    try:
+        data = {
+            "next_id": Employee._id_sequence.peek(),
+            "punch_log": hr_system.punch_log.path if hr_system.punch_log is not None else None,
+            "punch_log_records": len(hr_system.punch_log) if hr_system.punch_log is not None else 0,
+            "employees": [_encode_employee(employee) for employee in hr_system.employees_list],
+            "attendance": [_encode_attendance(attendance) for attendance in hr_system.attendance_list],
+            "compliance": [_encode_compliance(compliance) for compliance in hr_system.compliance_list],
+            "hierarchy": _encode_hierarchy(hierarchy, hr_system._employees_by_id) if hierarchy is not None else None,
+        }
+        payload = marshal.dumps(data, MARSHAL_VERSION)
+        temporary = f"{path}.tmp"
+        with open(temporary, "wb") as f:
+            f.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(payload), zlib.crc32(payload)))
+            f.write(payload)
+        os.replace(temporary, path)
+        return HEADER.size + len(payload)
+    except PersistenceException:
+        raise
+    except (OSError, ValueError, AttributeError, KeyError) as e:
+        raise PersistenceException(f"Erro ao gravar snapshot da organização: {str(e)}")
+
+
+def _read_payload(path: str) -> dict:
+    with open(path, "rb") as f:
+        header = f.read(HEADER.size)
+        if len(header) < HEADER.size:
+            raise PersistenceException(f"Arquivo '{path}' não é um snapshot da organização (cabeçalho incompleto)")
+        magic, version, size, checksum = HEADER.unpack(header)
+        if magic != MAGIC:
+            raise PersistenceException(f"Arquivo '{path}' não é um snapshot da organização")
+        if version != FORMAT_VERSION:
+            raise PersistenceException(
+                f"Versão de snapshot não suportada: {version} (esperada: {FORMAT_VERSION})"
+            )
+        payload = f.read()
+    if len(payload) != size or zlib.crc32(payload) != checksum:
+        raise PersistenceException(f"Snapshot '{path}' está corrompido ou truncado")
+    return marshal.loads(payload)
+
+
+def _decode_employee(raw: tuple) -> Employee:
+    (kind, employee_id, name, age, email, department, position, salary, hire_date,
+     benefits, performance, trainings, leaves, extra) = raw
+    if kind == "Manager":
+        employee = Manager(name, age, email, department, salary, hire_date, extra[0])
+    elif kind == "Intern":
+        employee = Intern(name, age, email, department, salary, hire_date)
+    elif kind == "Employee":
+        employee = Employee(name, age, email, department, position, salary, hire_date)
+    else:
+        raise PersistenceException(f"Tipo de funcionário desconhecido no snapshot: {kind}")
+    employee._employee_id = employee_id
+    employee._work_position = position
+    employee._benefits = benefits
+    employee._performance = performance
+    counts = [0] * (len(PERFORMANCE_LEVELS) + 1)
+    for level in performance:
+        counts[level] += 1
+    employee._performance_counts = counts
+    employee._training_starts = [datetime.fromisoformat(start) for start, _ in trainings]
+    employee._training = [
+        {"Date": start.strftime("%Y-%m-%d"), "Time": start.strftime("%H:%M"), "Description": description}
+        for start, (_, description) in zip(employee._training_starts, trainings)
+    ]
+    employee._requests = [
+        {"f_Date": date.fromordinal(start), "s_Date": date.fromordinal(end), "Description": description}
+        for start, end, description in leaves
+    ]
+    employee._leave_keys = [None] * len(leaves)
+    return employee
+
+
+def _decode_attendance(employee: Employee, raw: tuple, punch_log) -> Attendance:
+    records, daily, archived, segments = raw
+    attendance = Attendance(employee, punch_log)
+    attendance._record = [
+        {"in": datetime.fromisoformat(in_time), "out": datetime.fromisoformat(out_time) if out_time is not None else None}
+        for in_time, out_time in records
+    ]
+    attendance._daily = {date.fromordinal(day): seconds for day, seconds in daily}
+    attendance._daily_days = sorted(attendance._daily)
+    attendance._archived = {date.fromordinal(day): [seconds, count] for day, seconds, count in archived}
+    attendance._archived_days = sorted(attendance._archived)
+    attendance._archive_segments = [
+        {"path": path, "first": datetime.fromisoformat(first), "last": datetime.fromisoformat(last), "count": count}
+        for path, first, last, count in segments
+    ]
+    return attendance
+
+
+def _decode_compliance(employee: Employee, raw: list, violation_index) -> Compliance:
+    compliance = Compliance(employee, violation_index)
+    for date_str, description, severity in raw:
+        day = date.fromisoformat(date_str)
+        level = parse_severity(severity)
+        key = violation_index.add(employee.employee_id, day, level) if violation_index is not None else None
+        compliance._violations.append({"Date": date_str, "Description": description, "Severity": severity})
+        compliance._violation_keys.append((day, level, key))
+    return compliance
+
+
+def _decode_hierarchy(nodes: list, employees_by_id: dict):
+    if not nodes:
+        return None
+    root = None
+    stack = []  # [departamento, filhos restantes]
+    for node in nodes:
+        if node[0] == "D":
+            component = Department(node[1])
+        else:
+            component = employees_by_id.get(node[1])
+            if component is None:
+                raise PersistenceException(f"Hierarquia referencia o funcionário {node[1]}, ausente do snapshot")
+        if stack:
+            stack[-1][0].add_component(component)
+            stack[-1][1] -= 1
+        else:
+            root = component
+        if node[0] == "D" and node[2] > 0:
+            stack.append([component, node[2]])
+        while stack and stack[-1][1] == 0:
+            stack.pop()
+    return root
+
+
+def _align_punch_log(punch_log: PunchLog, saved_records):
+    """
+    Deixa o log de pontos no estado do snapshot. Pontos gravados depois dele pertencem
+    a uma sessão que não foi salva (inclusive de funcionários contratados nela), então
+    são descartados; e os ids vistos no log não são reemitidos, para que nenhum
+    contratado novo herde pontos antigos. 'saved_records' é None em snapshots antigos.
+    """
+    Employee._id_sequence.advance_to(punch_log.max_employee_id() + 1)
+    if saved_records is None:
+        return
+    if len(punch_log) < saved_records:
+        punch_log.close()
+        raise PersistenceException(
+            f"Log de pontos '{punch_log.path}' tem {len(punch_log)} registros, mas o snapshot "
+            f"foi gravado com {saved_records}: o log não corresponde a este snapshot"
+        )
+    punch_log.truncate(saved_records)
+
+
+def load_organization(path: str, hr_system):
+    """
+    Restaura em 'hr_system' (vazio) o estado gravado por save_organization.
+    Retorna a raiz da hierarquia (ou None, se não foi gravada).
+    """
+    try:
+        if hr_system.employees_list:
+            raise PersistenceException("O snapshot só pode ser carregado em um sistema sem funcionários")
+        data = _read_payload(path)
+        punch_log = PunchLog(data["punch_log"]) if data["punch_log"] is not None else None
+        if punch_log is not None:
+            _align_punch_log(punch_log, data.get("punch_log_records"))
+        employees = [_decode_employee(raw) for raw in data["employees"]]
+        employees_by_id = {employee.employee_id: employee for employee in employees}
+        for employee, raw in zip(employees, data["employees"]):
+            extra = raw[-1]
+            if isinstance(employee, Manager):
+                employee._managed_employees = [
+                    employees_by_id[managed_id] for managed_id in extra[1] if managed_id in employees_by_id
+                ]
+            elif isinstance(employee, Intern) and extra is not None:
+                employee._mentor = employees_by_id.get(extra)
+        attendance_list = [
+            _decode_attendance(employee, raw, punch_log) for employee, raw in zip(employees, data["attendance"])
+        ]
+        compliance_list = [
+            _decode_compliance(employee, raw, hr_system.violation_index)
+            for employee, raw in zip(employees, data["compliance"])
+        ]
+        hr_system.restore(employees, attendance_list, compliance_list, punch_log)
+        Employee._id_sequence.advance_to(data["next_id"])
+        return _decode_hierarchy(data["hierarchy"], employees_by_id)
+    except (PersistenceException, HRSystemException):
+        raise
+    except (OSError, ValueError, EOFError, TypeError, KeyError, IndexError) as e:
+        raise PersistenceException(f"Erro ao carregar snapshot da organização: {str(e)}")
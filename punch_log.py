@@ -0,0 +1,249 @@
+# punch_log.py
+"""
+Log binário de pontos, somente de anexação, lido via mmap.
+
+Cada ponto fechado ocupa um registro de largura fixa (id do funcionário, entrada e
+saída em segundos desde 1970-01-01), sem objetos Python por registro. As leituras
+usam visões sobre o arquivo mapeado: com NumPy, arrays estruturados sem cópia;
+sem NumPy, memoryview + struct.
+"""
+
+import mmap
+import os
+import struct
+from array import array
+from bisect import bisect_left
+from datetime import datetime, timedelta
+
+from exceptions import AttendanceException
+
+try:
+    import numpy as np
+except ImportError:  # NumPy é opcional; sem ele usamos memoryview/struct
+    np = None
+
+MAGIC = b"HRPUNCH1"
+HEADER_SIZE = len(MAGIC)
+RECORD = struct.Struct("<Iqq")  # employee_id (uint32), entrada (int64), saída (int64)
+EPOCH = datetime(1970, 1, 1)
+
+if np is not None:
+    RECORD_DTYPE = np.dtype([("employee_id", "<u4"), ("in", "<i8"), ("out", "<i8")])
+
+
+def to_epoch(value: datetime) -> int:
+    """ Converte um datetime (ingênuo, horário local) em segundos desde EPOCH. """
+    return int((value - EPOCH).total_seconds())
+
+
+def from_epoch(seconds: int) -> datetime:
+    return EPOCH + timedelta(seconds=seconds)
+
+
+class PunchLog:
+    """
+    Arquivo de pontos com índice de posições por funcionário.
+    '_positions' mapeia employee_id -> array('Q') com os números dos registros no
+    arquivo, então as consultas de um funcionário não varrem o log inteiro.
+    """
+    def __init__(self, path: str):
+        try:
+            self._path = path
+            is_new = not os.path.exists(path) or os.path.getsize(path) == 0
+            self._file = open(path, "ab")
+            if is_new:
+                self._file.write(MAGIC)
+                self._file.flush()
+            size = os.path.getsize(path)
+            with open(path, "rb") as f:
+                if f.read(HEADER_SIZE) != MAGIC:
+                    raise ValueError(f"Arquivo '{path}' não é um log de pontos válido")
+            if (size - HEADER_SIZE) % RECORD.size:
+                raise ValueError(f"Arquivo '{path}' está truncado ({size} bytes)")
+            self._count = (size - HEADER_SIZE) // RECORD.size
+            self._mmap = None
+            self._mapped_count = 0
+            self._positions = {}
+            self._build_index()
+        except (OSError, ValueError) as e:
+            raise AttendanceException(f"Erro ao abrir log de pontos: {str(e)}")
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def path(self):
+        return self._path
+
+    def _view(self):
+        """ Mapeia o arquivo (remapeando se cresceu) e retorna os bytes dos registros. """
+        if self._count == 0:
+            return memoryview(b"")
+        if self._mmap is None or self._mapped_count != self._count:
+            if not self._file.closed:
+                self._file.flush()
+            with open(self._path, "rb") as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._mapped_count = self._count
+        return memoryview(self._mmap)[HEADER_SIZE:HEADER_SIZE + self._count * RECORD.size]
+
+    def _records(self):
+        """ Visão estruturada (NumPy) sobre o arquivo mapeado, sem cópia. """
+        return np.frombuffer(self._view(), dtype=RECORD_DTYPE, count=self._count)
+
+    def _build_index(self):
+        if self._count == 0:
+            return
+        if np is not None:
+            ids = self._records()["employee_id"]
+            order = np.argsort(ids, kind="stable")
+            unique_ids, starts = np.unique(ids[order], return_index=True)
+            for employee_id, chunk in zip(unique_ids.tolist(), np.split(order, starts[1:])):
+                positions = array("Q")
+                positions.frombytes(chunk.astype("<u8").tobytes())
+                self._positions[employee_id] = positions
+        else:
+            for position, (employee_id, _, _) in enumerate(RECORD.iter_unpack(self._view())):
+                self._positions.setdefault(employee_id, array("Q")).append(position)
+
+    def append(self, employee_id: int, in_time: datetime, out_time: datetime):
+        """ Anexa um ponto fechado ao final do log. """
+        try:
+            self._file.write(RECORD.pack(employee_id, to_epoch(in_time), to_epoch(out_time)))
+            self._positions.setdefault(employee_id, array("Q")).append(self._count)
+            self._count += 1
+        except (OSError, struct.error) as e:
+            raise AttendanceException(f"Erro ao gravar ponto no log: {str(e)}")
+
+    def _positions_for(self, employee_id: int, upto: int = None):
+        # As posições de cada funcionário são crescentes: 'upto' corta o que foi gravado depois
+        positions = self._positions.get(employee_id)
+        if positions and upto is not None and positions[-1] >= upto:
+            positions = positions[:bisect_left(positions, upto)]
+        return positions
+
+    def max_employee_id(self) -> int:
+        """ Maior id de funcionário com pontos no log (0 se vazio). """
+        return max(self._positions, default=0)
+
+    def truncate(self, count: int):
+        """ Descarta os registros a partir do número 'count' (ex: gravados depois do snapshot carregado). """
+        if count >= self._count:
+            return
+        try:
+            self._file.flush()
+            self._file.truncate(HEADER_SIZE + count * RECORD.size)
+        except OSError as e:
+            raise AttendanceException(f"Erro ao truncar log de pontos: {str(e)}")
+        self._count = count
+        self._mmap = None
+        self._mapped_count = 0
+        for employee_id in list(self._positions):
+            positions = self._positions[employee_id]
+            kept = bisect_left(positions, count)
+            if kept == 0:
+                del self._positions[employee_id]
+            else:
+                del positions[kept:]
+
+    def view(self, upto: int):
+        """ Visão somente leitura dos primeiros 'upto' registros (usada pelos snapshots). """
+        return PunchLogView(self, upto)
+
+    def count_for(self, employee_id: int, upto: int = None) -> int:
+        return len(self._positions_for(employee_id, upto) or ())
+
+    def totals(self, employee_id: int, start: datetime = None, end: datetime = None, upto: int = None):
+        """ Retorna (segundos, registros) do funcionário com entrada em [start, end). """
+        positions = self._positions_for(employee_id, upto)
+        if not positions:
+            return 0.0, 0
+        lo = to_epoch(start) if start is not None else None
+        hi = to_epoch(end) if end is not None else None
+        if np is not None:
+            records = self._records()[np.frombuffer(positions, dtype=np.uint64)]
+            mask = np.ones(len(records), dtype=bool)
+            if lo is not None:
+                mask &= records["in"] >= lo
+            if hi is not None:
+                mask &= records["in"] < hi
+            selected = records[mask]
+            return float((selected["out"] - selected["in"]).sum()), int(mask.sum())
+        view = self._view()
+        seconds, count = 0, 0
+        for position in positions:
+            _, in_epoch, out_epoch = RECORD.unpack_from(view, position * RECORD.size)
+            if (lo is None or in_epoch >= lo) and (hi is None or in_epoch < hi):
+                seconds += out_epoch - in_epoch
+                count += 1
+        return float(seconds), count
+
+    def totals_by_employee(self, start: datetime = None, end: datetime = None, upto: int = None) -> dict:
+        """
+        Segundos trabalhados por funcionário em uma única passada pelo log inteiro
+        (folha da empresa toda). Retorna employee_id -> segundos.
+        """
+        count = self._count if upto is None else min(upto, self._count)
+        if count == 0:
+            return {}
+        lo = to_epoch(start) if start is not None else None
+        hi = to_epoch(end) if end is not None else None
+        if np is not None:
+            records = self._records()[:count]
+            mask = np.ones(count, dtype=bool)
+            if lo is not None:
+                mask &= records["in"] >= lo
+            if hi is not None:
+                mask &= records["in"] < hi
+            ids = records["employee_id"][mask]
+            sums = np.bincount(ids, weights=(records["out"][mask] - records["in"][mask]))
+            present = np.nonzero(np.bincount(ids))[0]
+            return dict(zip(present.tolist(), sums[present].tolist()))
+        totals = {}
+        for employee_id, in_epoch, out_epoch in RECORD.iter_unpack(self._view()[:count * RECORD.size]):
+            if (lo is None or in_epoch >= lo) and (hi is None or in_epoch < hi):
+                totals[employee_id] = totals.get(employee_id, 0) + (out_epoch - in_epoch)
+        return {employee_id: float(seconds) for employee_id, seconds in totals.items()}
+
+    def records(self, employee_id: int, start: datetime = None, end: datetime = None, upto: int = None) -> list:
+        """ Materializa os pontos do funcionário no período (para exibição), ordenados pela entrada. """
+        lo = to_epoch(start) if start is not None else None
+        hi = to_epoch(end) if end is not None else None
+        view = self._view()
+        result = []
+        for position in self._positions_for(employee_id, upto) or ():
+            _, in_epoch, out_epoch = RECORD.unpack_from(view, position * RECORD.size)
+            if (lo is None or in_epoch >= lo) and (hi is None or in_epoch < hi):
+                result.append({"in": from_epoch(in_epoch), "out": from_epoch(out_epoch)})
+        result.sort(key=lambda record: record["in"])
+        return result
+
+    def close(self):
+        self._file.close()
+        self._mmap = None
+
+
+class PunchLogView:
+    """ Os primeiros 'upto' registros de um PunchLog, congelados: gravações posteriores não aparecem. """
+    def __init__(self, punch_log: PunchLog, upto: int):
+        self._log = punch_log
+        self._upto = upto
+
+    def __len__(self):
+        return self._upto
+
+    @property
+    def path(self):
+        return self._log.path
+
+    def count_for(self, employee_id: int) -> int:
+        return self._log.count_for(employee_id, self._upto)
+
+    def totals(self, employee_id: int, start: datetime = None, end: datetime = None):
+        return self._log.totals(employee_id, start, end, self._upto)
+
+    def totals_by_employee(self, start: datetime = None, end: datetime = None) -> dict:
+        return self._log.totals_by_employee(start, end, self._upto)
+
+    def records(self, employee_id: int, start: datetime = None, end: datetime = None) -> list:
+        return self._log.records(employee_id, start, end, self._upto)
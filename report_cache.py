@@ -0,0 +1,111 @@
+# report_cache.py
+"""
+Cache incremental dos fragmentos de relatório.
+
+Cada relatório (Attendance/Compliance) tem suas linhas já formatadas guardadas
+por seção ("records", "archived", "violations"), na mesma ordem dos registros.
+A lista de linhas é sempre um prefixo dos registros: gerar o relatório formata
+apenas os registros além desse prefixo e reaproveita o resto. As escritas
+invalidam com precisão a partir da posição alterada (ex: o clock out troca o
+último turno, então só a última linha é descartada; um ponto novo no fim não
+invalida nada).
+
+A memória total é limitada por 'max_chars' (soma do tamanho das linhas): ao
+passar do limite, os relatórios menos usados recentemente são descartados.
+"""
+
+import weakref
+from collections import OrderedDict
+
+DEFAULT_MAX_CHARS = 16 * 1024 * 1024
+
+
+class _Fragments:
+    def __init__(self, report):
+        self.ref = weakref.ref(report)
+        self.sections = {}
+        self.size = 0
+
+
+class ReportCache:
+    """ LRU de fragmentos por relatório, limitado pelo total de caracteres das linhas. """
+    def __init__(self, max_chars: int = DEFAULT_MAX_CHARS):
+        self.max_chars = max_chars
+        self._entries = OrderedDict()  # id(relatório) -> _Fragments
+        self.size = 0
+        self.rendered = 0  # linhas formatadas
+        self.reused = 0    # linhas servidas do cache
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _entry(self, report, create: bool = False):
+        key = id(report)
+        entry = self._entries.get(key)
+        if entry is not None and entry.ref() is not report:
+            # O id foi reaproveitado por outro objeto: a entrada é de um relatório que já não existe
+            self._drop(key)
+            entry = None
+        if entry is None and create:
+            entry = self._entries[key] = _Fragments(report)
+        return entry
+
+    def _drop(self, key):
+        entry = self._entries.pop(key)
+        self.size -= entry.size
+
+    def lines(self, report, section: str, items, lo: int, hi: int, render) -> list:
+        """
+        Linhas de items[lo:hi], formatando com 'render' só as que ainda não estão no cache.
+        'items' deve ser a sequência completa da seção (as posições são as do cache).
+        """
+        entry = self._entry(report, create=True)
+        self._entries.move_to_end(id(report))
+        cached = entry.sections.setdefault(section, [])
+        start = len(cached)
+        if start < hi:
+            new_lines = [render(item) for item in items[start:hi]]
+            cached.extend(new_lines)
+            grown = sum(map(len, new_lines))
+            entry.size += grown
+            self.size += grown
+            self.rendered += len(new_lines)
+        self.reused += max(0, min(start, hi) - lo)
+        result = cached[lo:hi]
+        self._evict()
+        return result
+
+    def _evict(self):
+        while self.size > self.max_chars and self._entries:
+            self._drop(next(iter(self._entries)))
+
+    def invalidate(self, report, section: str = None, position: int = 0):
+        """ Descarta as linhas da 'section' a partir de 'position' (sem 'section': o relatório inteiro). """
+        entry = self._entry(report)
+        if entry is None:
+            return
+        if section is None:
+            self._drop(id(report))
+            return
+        cached = entry.sections.get(section)
+        if cached is not None and position < len(cached):
+            removed = sum(map(len, cached[position:]))
+            del cached[position:]
+            entry.size -= removed
+            self.size -= removed
+
+    def discard(self, report):
+        self.invalidate(report)
+
+    def clear(self):
+        self._entries.clear()
+        self.size = 0
+
+    def resize(self, max_chars: int):
+        if not isinstance(max_chars, int) or max_chars < 0:
+            raise ValueError(f"Limite do cache deve ser um inteiro não negativo, recebido: {max_chars}")
+        self.max_chars = max_chars
+        self._evict()
+
+
+REPORT_CACHE = ReportCache()
@@ -0,0 +1,196 @@
+# scheduler.py
+"""
+Turnos esquecidos: fechamento ou sinalização automática de pontos sem clock out.
+
+'TimingWheel' é uma roda de tempo hierárquica: 'levels' rodas de 'slots'
+posições, em que cada posição do nível N cobre slots**N ticks. Um prazo entra
+no nível mais baixo que o alcança e desce de nível ("cascata") quando a roda de
+baixo dá a volta, até vencer no nível 0. Cada posição é um dict, e um índice
+chave -> posição permite agendar e cancelar em O(1), independente de quantos
+turnos estão abertos; avançar o relógio custa O(ticks) mais os prazos vencidos
+ou em cascata.
+
+'ShiftScheduler' acompanha todos os turnos abertos pelo índice de presença
+(EmployeeIndexes.presence): cada clock in agenda o prazo 'entrada + max_shift'
+e cada clock out o cancela. 'run_due' vence os prazos até agora e, conforme
+'action', fecha o turno no limite ("close", o turno conta na folha com a
+duração máxima) ou apenas o sinaliza em 'flagged' ("flag", para revisão do RH).
+Um turno que não pode ser fechado também vai para 'flagged'.
+O clock in de quem tem um turno esquecido também roda o scheduler antes de
+recusar a entrada.
+"""
+
+from datetime import datetime, timedelta
+
+from exceptions import SchedulerException, HRSystemException
+
+DEFAULT_MAX_SHIFT = timedelta(hours=12)
+DEFAULT_TICK = timedelta(minutes=1)
+ACTIONS = ("close", "flag")
+# Origem dos ticks (datetimes do sistema são "naive", em horário local)
+EPOCH = datetime(2000, 1, 1)
+
+
+class TimingWheel:
+    """ Roda de tempo hierárquica sobre ticks inteiros. O alcance sem overflow é slots**levels ticks. """
+    def __init__(self, slots: int = 64, levels: int = 4, start: int = 0):
+        if not isinstance(slots, int) or slots < 2:
+            raise ValueError(f"A roda precisa de pelo menos 2 posições, recebido: {slots}")
+        if not isinstance(levels, int) or levels < 1:
+            raise ValueError(f"A roda precisa de pelo menos 1 nível, recebido: {levels}")
+        self._slots = slots
+        self._levels = levels
+        self._spans = [slots ** level for level in range(levels + 1)]  # ticks por posição em cada nível
+        self._wheels = [[{} for _ in range(slots)] for _ in range(levels)]
+        self._overflow = {}  # prazos além do alcance da roda mais alta
+        self._due = {}       # prazos que já venceram ao serem agendados
+        self._buckets = {}   # chave -> dict (posição) onde ela está
+        self.now = start
+
+    def __len__(self):
+        return len(self._buckets)
+
+    def __contains__(self, key):
+        return key in self._buckets
+
+    def _place(self, key, deadline: int, payload):
+        delta = deadline - self.now
+        if delta <= 0:
+            bucket = self._due
+        else:
+            bucket = self._overflow
+            for level in range(self._levels):
+                if delta < self._spans[level + 1]:
+                    bucket = self._wheels[level][(deadline // self._spans[level]) % self._slots]
+                    break
+        bucket[key] = (deadline, payload)
+        self._buckets[key] = bucket
+
+    def schedule(self, key, deadline: int, payload=None):
+        """ Agenda (ou reagenda) 'key' para vencer no tick 'deadline'. """
+        self.cancel(key)
+        self._place(key, deadline, payload)
+
+    def cancel(self, key) -> bool:
+        bucket = self._buckets.pop(key, None)
+        if bucket is None:
+            return False
+        del bucket[key]
+        return True
+
+    def _cascade(self, bucket):
+        entries = list(bucket.items())
+        bucket.clear()
+        for key, (deadline, payload) in entries:
+            self._place(key, deadline, payload)
+
+    def _expire(self, bucket, expired):
+        for key, (deadline, payload) in bucket.items():
+            del self._buckets[key]
+            expired.append((key, deadline, payload))
+        bucket.clear()
+
+    def advance(self, to: int) -> list:
+        """ Avança o relógio até o tick 'to'. Retorna os vencidos como (chave, prazo, payload). """
+        expired = []
+        self._expire(self._due, expired)
+        slots, spans = self._slots, self._spans
+        while self.now < to:
+            if not self._buckets:
+                self.now = to
+                break
+            self.now += 1
+            tick = self.now
+            if tick % spans[-1] == 0 and self._overflow:
+                self._cascade(self._overflow)
+            # Cascata de cima para baixo: o que desce pode cair na posição que desce em seguida
+            for level in range(self._levels - 1, 0, -1):
+                if tick % spans[level] == 0:
+                    bucket = self._wheels[level][(tick // spans[level]) % slots]
+                    if bucket:
+                        self._cascade(bucket)
+            bucket = self._wheels[0][tick % slots]
+            if bucket:
+                self._expire(bucket, expired)
+            if self._due:
+                self._expire(self._due, expired)
+        return expired
+
+
+class ShiftScheduler:
+    """
+    Vigia os turnos abertos da empresa e trata os que passam de 'max_shift'.
+    'closed' guarda (employee_id, entrada, saída) dos turnos fechados automaticamente;
+    'flagged' mapeia employee_id -> (entrada, prazo) dos sinalizados ainda em aberto.
+    """
+    def __init__(self, hr_system, max_shift: timedelta = DEFAULT_MAX_SHIFT, action: str = "close",
+                 tick: timedelta = DEFAULT_TICK, now: datetime = None):
+        if not isinstance(max_shift, timedelta) or max_shift <= timedelta(0):
+            raise SchedulerException(f"Duração máxima do turno deve ser um timedelta positivo, recebido: {max_shift}")
+        if not isinstance(tick, timedelta) or not timedelta(0) < tick <= max_shift:
+            raise SchedulerException(f"Resolução deve ser positiva e no máximo a duração do turno, recebido: {tick}")
+        if action not in ACTIONS:
+            raise SchedulerException(f"Ação inválida: {action} (opções: {', '.join(ACTIONS)})")
+        self._hr_system = hr_system
+        self.max_shift = max_shift
+        self.action = action
+        self._tick = tick
+        self._wheel = TimingWheel(start=self._floor_tick(now or datetime.now()))
+        presence = hr_system.indexes.presence
+        if presence.watcher is not None:
+            raise SchedulerException("Já há um ShiftScheduler ativo para este sistema")
+        self.closed = []
+        self.flagged = {}
+        for attendance in hr_system.attendance_list:
+            if attendance.is_clocked_in():
+                self.shift_opened(attendance._employee.employee_id, attendance._record[-1]["in"], attendance)
+        presence.watcher = self
+
+    def __len__(self):
+        return len(self._wheel)
+
+    def _floor_tick(self, moment: datetime) -> int:
+        return (moment - EPOCH) // self._tick
+
+    def _ceil_tick(self, moment: datetime) -> int:
+        return -((EPOCH - moment) // self._tick)
+
+    def shift_opened(self, employee_id: int, since: datetime, attendance):
+        self._wheel.schedule(employee_id, self._ceil_tick(since + self.max_shift), (since, attendance))
+
+    def shift_closed(self, employee_id: int):
+        self._wheel.cancel(employee_id)
+        self.flagged.pop(employee_id, None)
+
+    def run_due(self, now: datetime = None) -> list:
+        """
+        Trata os turnos que passaram de 'max_shift' até 'now'.
+        Retorna (funcionário, entrada, prazo) de cada turno fechado ou sinalizado.
+        """
+        handled = []
+        for employee_id, _, (since, attendance) in self._wheel.advance(self._floor_tick(now or datetime.now())):
+            deadline = since + self.max_shift
+            employee = attendance._employee
+            if self.action == "close":
+                try:
+                    attendance.close_open_shift(deadline)
+                except HRSystemException as e:
+                    if not attendance.is_clocked_in():
+                        continue  # o turno já foi fechado por outro caminho
+                    # O prazo já saiu da roda: sinaliza o turno para que não fique sem vigilância
+                    self.flagged[employee_id] = (since, deadline)
+                    print(f"Aviso: turno de {employee.name} não pôde ser fechado e foi sinalizado: {str(e)}")
+                else:
+                    self.closed.append((employee_id, since, deadline))
+                    print(f"Turno esquecido de {employee.name} fechado em {deadline.strftime('%Y-%m-%d %H:%M:%S')}")
+            else:
+                self.flagged[employee_id] = (since, deadline)
+                print(f"Turno de {employee.name} em aberto desde {since.strftime('%Y-%m-%d %H:%M:%S')} passou do máximo")
+            handled.append((employee, since, deadline))
+        return handled
+
+    def stop(self):
+        """ Desliga o scheduler (os turnos abertos deixam de ser vigiados). """
+        presence = self._hr_system.indexes.presence
+        if presence.watcher is self:
+            presence.watcher = None
@@ -1,7 +1,14 @@
 # services.py
-from datetime import datetime
+import gzip
+import json
+import os
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime, date, timedelta
 from abc import ABC, abstractmethod
 from models import Employee
+from indexes import parse_date, parse_severity
+from snapshots import Versioned
+from report_cache import REPORT_CACHE
 from exceptions import (
     ClockInWithoutClockOutException, ClockOutWithoutClockInException,
     NoAttendanceRecordsException, InvalidPaymentCalculationException,
@@ -12,14 +19,20 @@ from exceptions import (
 # PADRÃO COMPORTAMENTAL 3: TEMPLATE METHOD
 # Objetivo: Definir o esqueleto de um algoritmo, adiando a implementação de
 # passos específicos para as subclasses.
-class Report(ABC):
+class Report(Versioned, ABC):
     def __init__(self, employee: Employee):
+        self._start_versioning()
         self._employee = employee
     
-    def generate_report(self):
-        """ Gera um relatório completo seguindo uma estrutura pré-definida. """
+    def generate_report(self, start: datetime = None, end: datetime = None):
+        """
+        Gera um relatório completo seguindo uma estrutura pré-definida.
+        Se 'start'/'end' forem informados, o corpo cobre apenas o período [start, end).
+        """
         header = self._generate_header()
-        body = self._generate_body()
+        if start is not None or end is not None:
+            header += f"\nPeríodo: {_format_period(start, end)}"
+        body = self._generate_body(start, end)
         footer = self._generate_footer()
         
         report = f"{header}\n{'-'*40}\n{body}\n{'-'*40}\n{footer}"
@@ -31,30 +44,312 @@ class Report(ABC):
         pass
 
     @abstractmethod
-    def _generate_body(self) -> str:
-        """ Gera o corpo principal do relatório. """
+    def _generate_body(self, start: datetime = None, end: datetime = None) -> str:
+        """ Gera o corpo principal do relatório (opcionalmente restrito a um período). """
         pass
 
     def _generate_footer(self) -> str:
         """ Gera um rodapé padrão para todos os relatórios. """
         return f"Relatório gerado em: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
 
+    def _cached_lines(self, section: str, items, lo: int, hi: int, render) -> list:
+        """ Linhas de items[lo:hi] via REPORT_CACHE (só formata o que é novo); snapshots formatam direto. """
+        if "_snapshot_epoch" in self.__dict__:
+            return [render(item) for item in items[lo:hi]]
+        return REPORT_CACHE.lines(self, section, items, lo, hi, render)
+
+    def discard_report_cache(self):
+        """ Libera as linhas em cache deste relatório (ex: desligamento do funcionário). """
+        REPORT_CACHE.discard(self)
+
+    def _invalidate_report(self, section: str = None, position: int = 0):
+        """ Descarta as linhas em cache da 'section' a partir de 'position' (sem 'section': todas). """
+        REPORT_CACHE.invalidate(self, section, position)
+
+
+def _format_period(start: datetime, end: datetime) -> str:
+    start_str = start.strftime('%Y-%m-%d %H:%M') if start else "início"
+    end_str = end.strftime('%Y-%m-%d %H:%M') if end else "hoje"
+    return f"{start_str} a {end_str}"
+
+
+def _clock_in_key(record):
+    return record["in"]
+
+
+def _split_by_day(in_time: datetime, out_time: datetime):
+    """ Divide um turno em (dia, segundos), cortando à meia-noite (turnos noturnos). """
+    current = in_time
+    while current < out_time:
+        next_midnight = datetime.combine(current.date() + timedelta(days=1), datetime.min.time())
+        segment_end = min(next_midnight, out_time)
+        yield current.date(), (segment_end - current).total_seconds()
+        current = segment_end
+
+
+DEFAULT_COMPACTION_HORIZON_DAYS = 90
+# Taxas usadas pelos Decorators de pagamento (e pela simulação em simulation.py)
+MANAGER_BONUS_RATE = 0.20
+TAX_RATE = 0.15
+DEFAULT_ARCHIVE_DIR = "attendance_archive"
+
+
+def _format_seconds(seconds: float) -> str:
+    return f"{int(seconds // 3600)}h {int((seconds % 3600) // 60)}min"
+
+
+def _format_record_line(record) -> str:
+    in_time = record['in'].strftime('%Y-%m-%d %H:%M:%S')
+    out_time = record['out'].strftime('%Y-%m-%d %H:%M:%S') if record['out'] else "Ainda trabalhando"
+    return f" - Entrada: {in_time} | Saída: {out_time}\n"
+
+
+def _format_violation_line(violation) -> str:
+    return f" - {violation['Date']} | {violation['Description']} (Gravidade: {violation['Severity']})\n"
+
 
 class Attendance(Report):
-    def __init__(self, employee: Employee):
+    """
+    Registros de ponto de um funcionário.
+    '_record' é mantido ordenado pelo horário de entrada, o que funciona como um
+    índice temporal: consultas por período usam busca binária e só tocam os
+    registros da janela, independentemente do tamanho do histórico.
+    '_daily' é o rollup diário (dia -> segundos trabalhados), atualizado a cada
+    turno fechado, com '_daily_days' guardando os dias em ordem.
+    Pontos antigos podem ser compactados (ver 'compact'): saem de '_record' para
+    um segmento gzip em disco e ficam resumidos em '_archived' (dia de entrada ->
+    [segundos, registros]), que continua valendo para folha e relatórios.
+    Com um 'punch_log' (PunchLog), os pontos fechados vão para o log binário em
+    disco e '_record' guarda apenas o turno em aberto.
+    Os registros não são alterados no lugar (o clock out troca o dict do turno),
+    o que permite aos snapshots compartilhar '_record' até a próxima escrita.
+    """
+    _versioned_fields = (
+        "_record", "_daily", "_daily_days", "_archived", "_archived_days", "_archive_segments", "_punch_log"
+    )
+
+    def __init__(self, employee: Employee, punch_log=None):
         super().__init__(employee)
+        self._punch_log = punch_log
         self._record = []
+        self._daily = {}
+        self._daily_days = []
+        self._archived = {}
+        self._archived_days = []
+        self._archive_segments = []
+
+    def _insert_record(self, record):
+        # Pontos ao vivo chegam em ordem (append O(1)); importações fora de ordem são inseridas na posição.
+        if not self._record or record["in"] >= self._record[-1]["in"]:
+            self._record.append(record)
+        else:
+            position = bisect_right(self._record, record["in"], key=_clock_in_key)
+            self._record.insert(position, record)
+            self._invalidate_report("records", position)
+
+    def attach_punch_log(self, punch_log):
+        """ Passa a armazenar os pontos no log binário, migrando os pontos fechados em memória. """
+        self._before_write()
+        for record in self._record:
+            if record["out"] is not None:
+                punch_log.append(self._employee.employee_id, record["in"], record["out"])
+        self._record = [record for record in self._record if record["out"] is None]
+        self._punch_log = punch_log
+        self._invalidate_report()
+
+    def _update_presence(self, since):
+        # Índice de presença da empresa (EmployeeIndexes.presence): 'since' None = saiu
+        indexes = self._employee._indexes
+        if indexes is not None:
+            if since is None:
+                indexes.presence.clock_out(self._employee.employee_id)
+            else:
+                indexes.presence.clock_in(self._employee.employee_id, self._employee.department, since, self)
+
+    def is_clocked_in(self) -> bool:
+        return bool(self._record) and self._record[-1]["out"] is None
+
+    def _store_closed_record(self, record):
+        if self._punch_log is not None:
+            self._punch_log.append(self._employee.employee_id, record["in"], record["out"])
+        else:
+            self._insert_record(record)
+
+    def records_between(self, start: datetime = None, end: datetime = None) -> list:
+        """ Retorna os registros com entrada em [start, end), via busca binária no índice temporal. """
+        if self._punch_log is not None:
+            records = self._punch_log.records(self._employee.employee_id, start, end)
+            records.extend(
+                record for record in self._record
+                if (start is None or record["in"] >= start) and (end is None or record["in"] < end)
+            )
+            return records
+        lo, hi = self._record_bounds(start, end)
+        return self._record[lo:hi]
+
+    def _record_bounds(self, start: datetime = None, end: datetime = None):
+        lo = bisect_left(self._record, start, key=_clock_in_key) if start is not None else 0
+        hi = bisect_left(self._record, end, key=_clock_in_key) if end is not None else len(self._record)
+        return lo, hi
+
+    def _add_to_rollup(self, in_time: datetime, out_time: datetime):
+        for day, seconds in _split_by_day(in_time, out_time):
+            if day not in self._daily:
+                self._daily[day] = 0.0
+                if not self._daily_days or day > self._daily_days[-1]:
+                    self._daily_days.append(day)
+                else:
+                    insort(self._daily_days, day)
+            self._daily[day] += seconds
+
+    def _archived_day_bounds(self, start: datetime = None, end: datetime = None):
+        # Dentro do histórico compactado a resolução é o dia de entrada.
+        lo = bisect_left(self._archived_days, start.date()) if start is not None else 0
+        if end is None:
+            hi = len(self._archived_days)
+        elif end.time() == datetime.min.time():
+            hi = bisect_left(self._archived_days, end.date())
+        else:
+            hi = bisect_right(self._archived_days, end.date())
+        return lo, hi
+
+    def _archived_day_range(self, start: datetime = None, end: datetime = None):
+        lo, hi = self._archived_day_bounds(start, end)
+        return self._archived_days[lo:hi]
+
+    def archived_totals(self, start: datetime = None, end: datetime = None):
+        """ Retorna (segundos, registros) dos pontos compactados com entrada no período. """
+        seconds, count = 0.0, 0
+        for day in self._archived_day_range(start, end):
+            day_seconds, day_count = self._archived[day]
+            seconds += day_seconds
+            count += day_count
+        return seconds, count
+
+    def worked_totals(self, start: datetime = None, end: datetime = None):
+        """
+        Retorna (segundos, registros fechados) com entrada em [start, end), somando
+        os resumos compactados e, no modo log binário, as visões sobre o log.
+        """
+        seconds, count = self.archived_totals(start, end)
+        if self._punch_log is not None:
+            log_seconds, log_count = self._punch_log.totals(self._employee.employee_id, start, end)
+            return seconds + log_seconds, count + log_count
+        for i, record in enumerate(self.records_between(start, end), 1):
+            if record["out"] is None:
+                continue
+            worked = (record["out"] - record["in"]).total_seconds()
+            if worked < 0:
+                raise InvalidTimeException(
+                    f"Registro {i} possui tempo trabalhado negativo: {record['out'] - record['in']}"
+                )
+            seconds += worked
+            count += 1
+        return seconds, count
+
+    def compact(self, horizon_days: int = DEFAULT_COMPACTION_HORIZON_DAYS,
+                archive_dir: str = DEFAULT_ARCHIVE_DIR, now: datetime = None) -> int:
+        """
+        Move os pontos fechados com entrada anterior a 'now - horizon_days' (à meia-noite)
+        para um segmento gzip em 'archive_dir' e os resume por dia em '_archived'.
+        Retorna a quantidade de registros compactados.
+        """
+        try:
+            if not isinstance(horizon_days, int) or horizon_days < 0:
+                raise ValueError(f"Horizonte deve ser um número inteiro não negativo, recebido: {horizon_days}")
+            if self._punch_log is not None:
+                return 0  # o log binário já mantém o histórico fora da memória
+            now = now or datetime.now()
+            cutoff = datetime.combine((now - timedelta(days=horizon_days)).date(), datetime.min.time())
+            hi = bisect_left(self._record, cutoff, key=_clock_in_key)
+            if hi and self._record[hi - 1]["out"] is None:
+                hi -= 1
+            if hi == 0:
+                return 0
+            
+            self._before_write()
+            old_records = self._record[:hi]
+            os.makedirs(archive_dir, exist_ok=True)
+            first, last = old_records[0]["in"], old_records[-1]["in"]
+            path = os.path.join(
+                archive_dir,
+                f"employee-{self._employee.employee_id}-{first:%Y%m%d%H%M%S}-{last:%Y%m%d%H%M%S}.jsonl.gz"
+            )
+            with gzip.open(path, "wt", encoding="utf-8") as segment:
+                for record in old_records:
+                    segment.write(json.dumps({"in": record["in"].isoformat(), "out": record["out"].isoformat()}) + "\n")
+            
+            for record in old_records:
+                day = record["in"].date()
+                if day not in self._archived:
+                    self._archived[day] = [0.0, 0]
+                    insort(self._archived_days, day)
+                day_seconds, day_count = self._archived[day]
+                self._archived[day] = [day_seconds + (record["out"] - record["in"]).total_seconds(), day_count + 1]
+            self._archive_segments.append({"path": path, "first": first, "last": last, "count": hi})
+            del self._record[:hi]
+            self._invalidate_report()
+            return hi
+        except ValueError as e:
+            raise AttendanceException(f"Erro ao compactar registros de frequência: {str(e)}")
+        except OSError as e:
+            raise AttendanceException(f"Erro ao gravar arquivo de frequência compactada: {str(e)}")
+
+    def load_archived(self, start: datetime = None, end: datetime = None) -> list:
+        """ Recupera do disco o detalhe dos pontos compactados com entrada em [start, end). """
+        try:
+            records = []
+            for segment in self._archive_segments:
+                if (start is not None and segment["last"] < start) or (end is not None and segment["first"] >= end):
+                    continue
+                with gzip.open(segment["path"], "rt", encoding="utf-8") as f:
+                    for line in f:
+                        raw = json.loads(line)
+                        in_time = datetime.fromisoformat(raw["in"])
+                        if (start is None or in_time >= start) and (end is None or in_time < end):
+                            records.append({"in": in_time, "out": datetime.fromisoformat(raw["out"])})
+            records.sort(key=_clock_in_key)
+            return records
+        except (OSError, ValueError, KeyError) as e:
+            raise AttendanceException(f"Erro ao ler arquivo de frequência compactada: {str(e)}")
+
+    def daily_summary(self, start: date = None, end: date = None) -> dict:
+        """ Segundos trabalhados por dia civil em [start, end], servidos do rollup. """
+        lo = bisect_left(self._daily_days, start) if start is not None else 0
+        hi = bisect_right(self._daily_days, end) if end is not None else len(self._daily_days)
+        return {day: self._daily[day] for day in self._daily_days[lo:hi]}
+
+    def weekly_summary(self, start: date = None, end: date = None) -> dict:
+        """ Segundos trabalhados por semana ISO ((ano, semana) -> segundos). """
+        weeks = {}
+        for day, seconds in self.daily_summary(start, end).items():
+            key = tuple(day.isocalendar())[:2]
+            weeks[key] = weeks.get(key, 0.0) + seconds
+        return weeks
+
+    def monthly_summary(self, start: date = None, end: date = None) -> dict:
+        """ Segundos trabalhados por mês ((ano, mês) -> segundos). """
+        months = {}
+        for day, seconds in self.daily_summary(start, end).items():
+            key = (day.year, day.month)
+            months[key] = months.get(key, 0.0) + seconds
+        return months
     
     def clock_in(self):
         try:
             now = datetime.now()
+            if self._record and self._record[-1]["out"] is None:
+                # Turno esquecido: o ShiftScheduler (se ativo) fecha os que já passaram do máximo
+                self._run_shift_scheduler(now)
             # Verifica se há um registro anterior sem clock out
             if self._record and self._record[-1]["out"] is None:
                 raise ClockInWithoutClockOutException(
                     f"Não é possível fazer clock in: há um registro anterior sem clock out. "
                     f"Último clock in: {self._record[-1]['in'].strftime('%Y-%m-%d %H:%M:%S')}"
                 )
-            self._record.append({"in": now, "out": None})
+            self._before_write()
+            self._insert_record({"in": now, "out": None})
+            self._update_presence(now)
             print(f"{self._employee.name} clocked in at {now.strftime('%H:%M:%S')}")
         except ClockInWithoutClockOutException:
             raise
@@ -80,19 +375,79 @@ class Attendance(Report):
                     f"Clock in: {self._record[-1]['in'].strftime('%Y-%m-%d %H:%M:%S')}, "
                     f"Clock out tentado: {now.strftime('%Y-%m-%d %H:%M:%S')}"
                 )
-            self._record[-1]["out"] = now
+            self._close_open_record(now)
             print(f"{self._employee.name} clocked out at {now.strftime('%H:%M:%S')}")
         except (ClockOutWithoutClockInException, InvalidTimeException) as e:
             raise
         except Exception as e:
             raise AttendanceException(f"Erro ao registrar saída: {str(e)}")
-    
+
+    def close_open_shift(self, out_time: datetime):
+        """ Fecha o turno em aberto com saída em 'out_time' (ex: turno esquecido, fechado pelo ShiftScheduler). """
+        try:
+            if not isinstance(out_time, datetime):
+                raise TypeError("Saída deve ser um objeto datetime")
+            if not self.is_clocked_in():
+                raise ClockOutWithoutClockInException(
+                    f"Não há turno em aberto para {self._employee.name}"
+                )
+            if out_time < self._record[-1]["in"]:
+                raise InvalidTimeException(
+                    f"Clock out não pode ser anterior ao clock in. "
+                    f"Clock in: {self._record[-1]['in'].strftime('%Y-%m-%d %H:%M:%S')}, "
+                    f"Clock out tentado: {out_time.strftime('%Y-%m-%d %H:%M:%S')}"
+                )
+            self._close_open_record(out_time)
+        except (ClockOutWithoutClockInException, InvalidTimeException):
+            raise
+        except Exception as e:
+            raise AttendanceException(f"Erro ao fechar turno em aberto: {str(e)}")
+
+    def _close_open_record(self, out_time):
+        self._before_write()
+        self._record[-1] = {"in": self._record[-1]["in"], "out": out_time}
+        self._invalidate_report("records", len(self._record) - 1)
+        self._update_presence(None)
+        self._add_to_rollup(self._record[-1]["in"], out_time)
+        if self._punch_log is not None:
+            self._store_closed_record(self._record.pop())
+
+    def _run_shift_scheduler(self, now):
+        indexes = self._employee._indexes
+        if indexes is not None and indexes.presence.watcher is not None:
+            indexes.presence.watcher.run_due(now)
+
+    def add_record(self, in_time: datetime, out_time: datetime):
+        """ Registra um ponto completo (entrada e saída) já ocorrido, ex: importação de histórico. """
+        try:
+            if not isinstance(in_time, datetime) or not isinstance(out_time, datetime):
+                raise TypeError("Entrada e saída devem ser objetos datetime")
+            if out_time < in_time:
+                raise InvalidTimeException(
+                    f"Clock out não pode ser anterior ao clock in. "
+                    f"Clock in: {in_time.strftime('%Y-%m-%d %H:%M:%S')}, "
+                    f"Clock out: {out_time.strftime('%Y-%m-%d %H:%M:%S')}"
+                )
+            if self._record and self._record[-1]["out"] is None and in_time >= self._record[-1]["in"]:
+                raise ClockInWithoutClockOutException(
+                    f"Não é possível importar registro: há um registro em aberto desde "
+                    f"{self._record[-1]['in'].strftime('%Y-%m-%d %H:%M:%S')}"
+                )
+            self._before_write()
+            self._store_closed_record({"in": in_time, "out": out_time})
+            self._add_to_rollup(in_time, out_time)
+        except (InvalidTimeException, ClockInWithoutClockOutException):
+            raise
+        except Exception as e:
+            raise AttendanceException(f"Erro ao importar registro: {str(e)}")
+
     def show_records(self):
         try:
-            if not self._record:
+            records = self.records_between()
+            if not records:
                 raise NoAttendanceRecordsException(f"Não há registros de frequência para {self._employee.name}")
             print(f"\nRecords of {self._employee.name}: ")
-            for i, record in enumerate(self._record, 1):
+            for i, record in enumerate(records, 1):
                 try:
                     in_time = record['in'].strftime('%Y-%m-%d %H:%M:%S')
                     out_time = record['out'].strftime('%Y-%m-%d %H:%M:%S') if record['out'] else "Still working"
@@ -106,45 +461,24 @@ class Attendance(Report):
         except Exception as e:
             raise AttendanceException(f"Erro ao exibir registros: {str(e)}")
 
-    def worked_hours_per_day(self):
+    def worked_hours_per_day(self, start: date = None, end: date = None):
+        """ Exibe as horas por dia civil a partir do rollup (turnos noturnos divididos à meia-noite). """
         try:
-            if not self._record:
+            if not self._daily and not self.records_between():
                 raise NoAttendanceRecordsException(f"Não há registros de frequência para calcular horas trabalhadas de {self._employee.name}")
             
-            print(f"\nWorked hours for {self._employee.name}:")
-            total_seconds = 0
-            valid_records = 0
-            
-            for i, record in enumerate(self._record, 1):
-                try:
-                    if "in" not in record:
-                        raise AttendanceException(f"Registro {i} não possui campo 'in'")
-                    if record["out"] is not None:
-                        if "out" not in record:
-                            raise AttendanceException(f"Registro {i} não possui campo 'out'")
-                        worked = record["out"] - record["in"]
-                        if worked.total_seconds() < 0:
-                            raise InvalidTimeException(
-                                f"Registro {i}: tempo trabalhado negativo. "
-                                f"Clock in: {record['in']}, Clock out: {record['out']}"
-                            )
-                        total_seconds += worked.total_seconds()
-                        valid_records += 1
-                        print(f"- {record['in'].strftime('%Y-%m-%d')}: {worked}")
-                except KeyError as e:
-                    raise AttendanceException(f"Erro ao processar registro {i}: campo '{e}' não encontrado")
-                except (AttributeError, TypeError) as e:
-                    raise AttendanceException(f"Erro ao processar registro {i}: {str(e)}")
-            
-            if valid_records == 0:
+            summary = self.daily_summary(start, end)
+            if not summary:
                 raise NoAttendanceRecordsException(
                     f"Não há registros completos (com clock out) para {self._employee.name}"
                 )
             
-            total_hours = total_seconds // 3600
-            total_minutes = (total_seconds % 3600) // 60
-            print(f"\nTotal worked time: {int(total_hours)}h {int(total_minutes)}min\n")
-        except (NoAttendanceRecordsException, AttendanceException, InvalidTimeException) as e:
+            print(f"\nWorked hours for {self._employee.name}:")
+            for day, seconds in summary.items():
+                print(f"- {day.strftime('%Y-%m-%d')}: {_format_seconds(seconds)}")
+            
+            print(f"\nTotal worked time: {_format_seconds(sum(summary.values()))}\n")
+        except NoAttendanceRecordsException:
             raise
         except Exception as e:
             raise AttendanceException(f"Erro ao calcular horas trabalhadas: {str(e)}")
@@ -152,16 +486,23 @@ class Attendance(Report):
     def _generate_header(self) -> str:
         return f"Relatório de Frequência para {self._employee.name}"
 
-    def _generate_body(self) -> str:
-        if not self._record:
+    def _format_archived_line(self, day) -> str:
+        seconds, count = self._archived[day]
+        return f" - Arquivado {day.strftime('%Y-%m-%d')}: {_format_seconds(seconds)} ({count} registros)\n"
+
+    def _generate_body(self, start: datetime = None, end: datetime = None) -> str:
+        # As linhas vêm do REPORT_CACHE: só os registros novos ou alterados desde o último relatório são formatados
+        if self._punch_log is not None:
+            record_lines = [_format_record_line(record) for record in self.records_between(start, end)]
+        else:
+            lo, hi = self._record_bounds(start, end)
+            record_lines = self._cached_lines("records", self._record, lo, hi, _format_record_line)
+        day_lo, day_hi = self._archived_day_bounds(start, end)
+        archived_lines = self._cached_lines("archived", self._archived_days, day_lo, day_hi, self._format_archived_line)
+        if not record_lines and not archived_lines:
             return "Nenhum registro de frequência encontrado."
         
-        body_str = "Registros:\n"
-        for record in self._record:
-            in_time = record['in'].strftime('%Y-%m-%d %H:%M:%S')
-            out_time = record['out'].strftime('%Y-%m-%d %H:%M:%S') if record['out'] else "Ainda trabalhando"
-            body_str += f" - Entrada: {in_time} | Saída: {out_time}\n"
-        return body_str
+        return "Registros:\n" + "".join(archived_lines) + "".join(record_lines)
 
 
 # PADRÃO COMPORTAMENTAL 1: STRATEGY
@@ -169,42 +510,26 @@ class Attendance(Report):
 class PaymentStrategy(ABC):
     """ A Interface da Estratégia declara operações comuns a todos os algoritmos suportados. """
     @abstractmethod
-    def calculate(self, attendance: Attendance, salary_per_hour: float) -> float:
+    def calculate(self, attendance: Attendance, salary_per_hour: float,
+                  start: datetime = None, end: datetime = None) -> float:
         pass
 
 class HourlyPaymentStrategy(PaymentStrategy):
-    """ Estratégia Concreta: Calcula o pagamento com base nas horas trabalhadas. """
-    def calculate(self, attendance: Attendance, salary_per_hour: float) -> float:
+    """
+    Estratégia Concreta: Calcula o pagamento com base nas horas trabalhadas.
+    Com 'start'/'end', considera apenas os pontos com entrada no período de pagamento.
+    """
+    def calculate(self, attendance: Attendance, salary_per_hour: float,
+                  start: datetime = None, end: datetime = None) -> float:
         try:
-            if not attendance._record:
-                raise NoAttendanceRecordsException(
-                    f"Não há registros de frequência para calcular pagamento de {attendance._employee.name}"
-                )
             if salary_per_hour <= 0:
                 raise InvalidPaymentCalculationException(f"Salário por hora deve ser positivo, recebido: {salary_per_hour}")
             
-            total_seconds = 0
-            valid_records = 0
-            
-            for i, record in enumerate(attendance._record, 1):
-                try:
-                    if "in" not in record or "out" not in record:
-                        continue
-                    if record["in"] and record["out"]:
-                        worked = record["out"] - record["in"]
-                        worked_seconds = worked.total_seconds()
-                        if worked_seconds < 0:
-                            raise InvalidPaymentCalculationException(
-                                f"Registro {i} possui tempo trabalhado negativo: {worked}"
-                            )
-                        total_seconds += worked_seconds
-                        valid_records += 1
-                except (KeyError, AttributeError, TypeError) as e:
-                    raise InvalidPaymentCalculationException(f"Erro ao processar registro {i}: {str(e)}")
-            
+            total_seconds, valid_records = attendance.worked_totals(start, end)
             if valid_records == 0:
                 raise NoAttendanceRecordsException(
-                    f"Não há registros completos (com clock in e clock out) para calcular pagamento"
+                    f"Não há registros completos (com clock in e clock out) para calcular pagamento de {attendance._employee.name}"
+                    + (f" no período {_format_period(start, end)}" if start or end else "")
                 )
             
             total_hours = total_seconds / 3600
@@ -224,7 +549,8 @@ class HourlyPaymentStrategy(PaymentStrategy):
 
 class MonthlyPaymentStrategy(PaymentStrategy):
     """ Estratégia Concreta: Calcula um pagamento fixo mensal (ex: 160 horas de trabalho). """
-    def calculate(self, attendance: Attendance, salary_per_hour: float) -> float:
+    def calculate(self, attendance: Attendance, salary_per_hour: float,
+                  start: datetime = None, end: datetime = None) -> float:
         try:
             FIXED_HOURS_PER_MONTH = 160
             if salary_per_hour <= 0:
@@ -254,9 +580,10 @@ class PaymentContext:
     def set_strategy(self, strategy: PaymentStrategy):
         self._strategy = strategy
 
-    def calculate_payment(self, attendance: Attendance, salary_per_hour: float):
+    def calculate_payment(self, attendance: Attendance, salary_per_hour: float,
+                          start: datetime = None, end: datetime = None):
         """ O Contexto delega o trabalho de cálculo para o objeto da Estratégia. """
-        return self._strategy.calculate(attendance, salary_per_hour)
+        return self._strategy.calculate(attendance, salary_per_hour, start, end)
 
 
 # PADRÃO ESTRUTURAL 2: DECORATOR
@@ -273,21 +600,23 @@ class BasePaymentDecorator(PaymentStrategy):
     def __init__(self, strategy: PaymentStrategy):
         self._wrapped_strategy = strategy
 
-    def calculate(self, attendance: Attendance, salary_per_hour: float) -> float:
-        return self._wrapped_strategy.calculate(attendance, salary_per_hour)
+    def calculate(self, attendance: Attendance, salary_per_hour: float,
+                  start: datetime = None, end: datetime = None) -> float:
+        return self._wrapped_strategy.calculate(attendance, salary_per_hour, start, end)
 
 class ManagerBonusDecorator(BasePaymentDecorator):
     """
     Este Decorator Concreto adiciona um bônus de 20% para gerentes.
     """
-    def calculate(self, attendance: Attendance, salary_per_hour: float) -> float:
+    def calculate(self, attendance: Attendance, salary_per_hour: float,
+                  start: datetime = None, end: datetime = None) -> float:
         try:
-            base_pay = self._wrapped_strategy.calculate(attendance, salary_per_hour)
+            base_pay = self._wrapped_strategy.calculate(attendance, salary_per_hour, start, end)
             
             if base_pay < 0:
                 raise NegativePaymentException(f"Pagamento base é negativo: R$ {base_pay:.2f}")
             
-            bonus = base_pay * 0.20
+            bonus = base_pay * MANAGER_BONUS_RATE
             if bonus < 0:
                 raise InvalidPaymentCalculationException(f"Bônus calculado é negativo: R$ {bonus:.2f}")
             
@@ -306,14 +635,15 @@ class TaxDeductionDecorator(BasePaymentDecorator):
     """
     Este Decorator Concreto aplica um desconto de 15% de imposto.
     """
-    def calculate(self, attendance: Attendance, salary_per_hour: float) -> float:
+    def calculate(self, attendance: Attendance, salary_per_hour: float,
+                  start: datetime = None, end: datetime = None) -> float:
         try:
-            gross_pay = self._wrapped_strategy.calculate(attendance, salary_per_hour)
+            gross_pay = self._wrapped_strategy.calculate(attendance, salary_per_hour, start, end)
             
             if gross_pay < 0:
                 raise NegativePaymentException(f"Pagamento bruto é negativo: R$ {gross_pay:.2f}")
             
-            tax = gross_pay * 0.15
+            tax = gross_pay * TAX_RATE
             if tax < 0:
                 raise InvalidPaymentCalculationException(f"Imposto calculado é negativo: R$ {tax:.2f}")
             if tax > gross_pay:
@@ -337,15 +667,38 @@ class TaxDeductionDecorator(BasePaymentDecorator):
 
 
 class Compliance(Report):
-    def __init__(self, employee: Employee):
+    """
+    Violações de compliance de um funcionário.
+    '_violation_keys' é paralela a '_violations' e guarda (data, nível de gravidade,
+    chave no índice da empresa), usados pelo ViolationIndex e pelos filtros por período.
+    """
+    _versioned_fields = ("_violations", "_violation_keys")
+
+    def __init__(self, employee: Employee, violation_index=None):
         super().__init__(employee)
         self._violations = []
+        self._violation_keys = []
+        self._violation_index = violation_index
     
     def add_violation(self, date_str, description, severity):
-        violation = {"Date": date_str, "Description": description, "Severity": severity}
+        day = parse_date(date_str, "Data da violação")
+        level = parse_severity(severity)
+        self._before_write()
+        key = None
+        if self._violation_index is not None:
+            key = self._violation_index.add(self._employee.employee_id, day, level)
+        violation = {"Date": day.strftime("%Y-%m-%d"), "Description": description, "Severity": severity}
         self._violations.append(violation)
+        self._violation_keys.append((day, level, key))
         print(f"Violation added for {self._employee.name}")
 
+    def detach_index(self):
+        """ Remove todas as violações deste funcionário do índice da empresa (ex: desligamento). """
+        if self._violation_index is not None:
+            for _, level, key in self._violation_keys:
+                self._violation_index.remove(key, level)
+        self._violation_index = None
+
     def remove_violation(self, index):
         try:
             if not isinstance(index, int):
@@ -356,7 +709,12 @@ class Compliance(Report):
                 raise InvalidIndexException("Não há violações para remover")
             if index >= len(self._violations):
                 raise InvalidIndexException(f"Índice {index} está fora do range. Total de violações: {len(self._violations)}")
+            self._before_write()
             self._violations.pop(index)
+            _, level, key = self._violation_keys.pop(index)
+            self._invalidate_report("violations", index)
+            if self._violation_index is not None:
+                self._violation_index.remove(key, level)
         except (TypeError, InvalidIndexException) as e:
             raise InvalidIndexException(f"Erro ao remover violação: {str(e)}")
 
@@ -372,11 +730,18 @@ class Compliance(Report):
     def _generate_header(self) -> str:
         return f"Relatório de Compliance para {self._employee.name}"
 
-    def _generate_body(self) -> str:
-        if not self._violations:
+    def _generate_body(self, start: datetime = None, end: datetime = None) -> str:
+        lines = self._cached_lines("violations", self._violations, 0, len(self._violations), _format_violation_line)
+        if start is not None or end is not None:
+            # Mesma regra de Attendance._archived_day_bounds: o dia de 'end' entra, a menos que 'end' seja meia-noite
+            last_day = None
+            if end is not None:
+                last_day = end.date() if end.time() != datetime.min.time() else end.date() - timedelta(days=1)
+            lines = [
+                line for line, (day, _, _) in zip(lines, self._violation_keys)
+                if (start is None or day >= start.date()) and (last_day is None or day <= last_day)
+            ]
+        if not lines:
             return "Nenhuma violação registrada."
         
-        body_str = f"Total de Violações: {len(self._violations)}\n"
-        for v in self._violations:
-            body_str += f" - {v['Date']} | {v['Description']} (Gravidade: {v['Severity']})\n"
-        return body_str
\ No newline at end of file
+        return f"Total de Violações: {len(lines)}\n" + "".join(lines)
\ No newline at end of file
@@ -0,0 +1,362 @@
+# sharding.py
+"""
+Modo particionado (sharded): os funcionários são distribuídos entre processos
+worker pelo id (shard = id % número de shards). Cada worker tem o seu próprio
+HRSystem (o Singleton é por processo), com frequência e compliance do
+funcionário no mesmo shard. O ShardedHRSystem é o coordenador: encaminha as
+chamadas por id ao shard dono e faz scatter-gather das operações da empresa
+inteira (folha, violações, ranking de risco). O transporte é multiprocessing
+(Pipe), então tudo roda em uma única máquina.
+"""
+
+import contextlib
+import heapq
+import io
+import itertools
+import multiprocessing
+import os
+import sys
+
+import exceptions
+from exceptions import HRSystemException, InvalidEmployeeDataException, InvalidEmployeeTypeException
+from validation import EMPLOYEE_SCHEMA, FieldError
+
+
+class _ShardServer:
+    """ Executa, dentro do worker, as operações pedidas pelo coordenador (ids, nunca índices). """
+    def __init__(self, shard_id: int, num_shards: int):
+        # Importações locais: o estado do sistema deve nascer dentro do processo worker
+        from facade import HRFacade
+        from factories import EmployeeFactory
+        from hr_system import HRSystem
+        from models import Employee, IdSequence
+
+        HRSystem._instance = None
+        # Ids deste shard: todos com id % num_shards == shard_id, únicos na empresa
+        Employee._id_sequence = IdSequence(shard_id or num_shards, num_shards)
+        self._hr_system = HRSystem.get_instance()
+        self._facade = HRFacade()
+        self._factory = EmployeeFactory
+
+    def _employee(self, employee_id):
+        employee = self._hr_system.get_employee_by_id(employee_id)
+        if employee is None:
+            raise exceptions.InvalidEmployeeIndexException(f"Funcionário {employee_id} não existe neste shard")
+        return employee
+
+    def _index(self, employee_id) -> int:
+        return self._facade.index_of_id(self._employee(employee_id).employee_id)
+
+    def hire(self, records) -> list:
+        """
+        Contrata registros já validados e normalizados pelo coordenador (EMPLOYEE_SCHEMA).
+        Nunca interrompe o lote: retorna, por registro, o id ou o FieldError da falha.
+        """
+        results = []
+        for record in records:
+            try:
+                employee = self._factory.create_from_record(record)
+                self._hr_system.add_employee(employee)
+                results.append(employee.employee_id)
+            except HRSystemException as e:
+                results.append(FieldError("record", str(e), type(e)))
+        return results
+
+    def remove(self, employee_id):
+        self._facade.remove_employee(self._index(employee_id))
+
+    def remove_many(self, employee_ids):
+        for employee_id in employee_ids:
+            self.remove(employee_id)
+
+    def count(self) -> int:
+        return len(self._hr_system.employees_list)
+
+    def employee_ids(self) -> list:
+        return list(self._hr_system.employee_ids)
+
+    def employee_info(self, employee_id) -> dict:
+        employee = self._employee(employee_id)
+        return {
+            "employee_id": employee.employee_id, "name": employee.name, "email": employee.email,
+            "department": employee.department, "position": employee.work_position,
+            "salary_per_hour": employee.salary_per_hour, "role": employee.get_role(),
+        }
+
+    def add_records(self, records):
+        attendance_by_id = {
+            attendance._employee.employee_id: attendance for attendance in self._hr_system.attendance_list
+        }
+        for employee_id, in_time, out_time in records:
+            attendance = attendance_by_id.get(employee_id)
+            if attendance is None:
+                raise exceptions.InvalidEmployeeIndexException(f"Funcionário {employee_id} não existe neste shard")
+            attendance.add_record(in_time, out_time)
+        return len(records)
+
+    def clock_in(self, employee_id):
+        self._hr_system.attendance_list[self._index(employee_id)].clock_in()
+
+    def clock_out(self, employee_id):
+        self._hr_system.attendance_list[self._index(employee_id)].clock_out()
+
+    def add_violation(self, employee_id, date_str, description, severity):
+        self._hr_system.compliance_list[self._index(employee_id)].add_violation(date_str, description, severity)
+
+    def calculate_payment(self, employee_id, start=None, end=None) -> float:
+        return self._facade.calculate_payment(self._index(employee_id), start, end)
+
+    def payroll(self, start=None, end=None):
+        """ Folha do shard inteiro: (id -> valor líquido, id -> erro) para quem não pôde ser pago. """
+        payments, errors = {}, {}
+        with self._facade.snapshot() as snapshot:
+            for index, employee in enumerate(snapshot.employees_list):
+                try:
+                    payments[employee.employee_id] = self._facade.calculate_payment(index, start, end, snapshot=snapshot)
+                except HRSystemException as e:
+                    errors[employee.employee_id] = str(e)
+        return payments, errors
+
+    def report(self, kind, employee_id, start=None, end=None) -> str:
+        index = self._index(employee_id)
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            if kind == "attendance":
+                self._facade.generate_attendance_report(index, start, end)
+            else:
+                self._facade.generate_compliance_report(index, start, end)
+        return output.getvalue()
+
+    def find_violations(self, min_severity=3, start=None, end=None) -> list:
+        return [
+            (day, employee.employee_id, severity)
+            for day, employee, severity in self._facade.find_violations(min_severity, start, end)
+        ]
+
+    def top_risk(self, k) -> list:
+        return [(employee.employee_id, score) for employee, score in self._facade.top_risk_employees(k)]
+
+
+def _shard_worker(connection, shard_id: int, num_shards: int, quiet: bool):
+    """ Laço do processo worker: recebe (método, args, kwargs) e devolve ('ok', valor) ou ('error', classe, msg). """
+    if quiet:
+        sys.stdout = open(os.devnull, "w")
+    server = _ShardServer(shard_id, num_shards)
+    while True:
+        try:
+            message = connection.recv()
+        except EOFError:
+            break
+        if message is None:
+            break
+        method, args, kwargs = message
+        try:
+            connection.send(("ok", getattr(server, method)(*args, **kwargs)))
+        except Exception as e:
+            connection.send(("error", type(e).__name__, str(e)))
+    connection.close()
+
+
+class ShardedHRSystem:
+    """
+    Coordenador local dos shards. As operações por funcionário usam o id retornado
+    na contratação; as da empresa inteira são enviadas a todos os shards de uma
+    vez (que processam em paralelo) e os resultados são combinados aqui.
+    """
+    def __init__(self, num_shards: int = None, start_method: str = None, quiet: bool = True):
+        try:
+            num_shards = num_shards or os.cpu_count() or 1
+            if not isinstance(num_shards, int) or num_shards <= 0:
+                raise ValueError(f"Número de shards deve ser um inteiro positivo, recebido: {num_shards}")
+            context = multiprocessing.get_context(start_method)
+            self._num_shards = num_shards
+            self._connections = []
+            self._processes = []
+            for shard_id in range(num_shards):
+                parent, child = context.Pipe()
+                process = context.Process(
+                    target=_shard_worker, args=(child, shard_id, num_shards, quiet), daemon=True
+                )
+                process.start()
+                child.close()
+                self._connections.append(parent)
+                self._processes.append(process)
+            # Contratações em rodízio: o k-ésimo contratado recebe o id k (ver _ShardServer)
+            self._next_shard = 1 % num_shards
+        except (ValueError, OSError) as e:
+            raise HRSystemException(f"Erro ao iniciar shards: {str(e)}")
+
+    @property
+    def num_shards(self) -> int:
+        return self._num_shards
+
+    def shard_for(self, employee_id: int) -> int:
+        return employee_id % self._num_shards
+
+    @staticmethod
+    def _unwrap(response):
+        if response[0] == "ok":
+            return response[1]
+        _, name, message = response
+        exception_class = getattr(exceptions, name, None)
+        if not (isinstance(exception_class, type) and issubclass(exception_class, HRSystemException)):
+            exception_class = HRSystemException
+        raise exception_class(message)
+
+    def _call(self, shard_id: int, method: str, *args, **kwargs):
+        try:
+            connection = self._connections[shard_id]
+            connection.send((method, args, kwargs))
+            return self._unwrap(connection.recv())
+        except (EOFError, OSError, BrokenPipeError) as e:
+            raise HRSystemException(f"Shard {shard_id} indisponível: {str(e)}")
+
+    def _scatter(self, method: str, per_shard_args=None, *args, **kwargs) -> list:
+        """ Envia a todos os shards antes de esperar qualquer resposta, para que rodem em paralelo. """
+        try:
+            for shard_id, connection in enumerate(self._connections):
+                shard_args = per_shard_args[shard_id] if per_shard_args is not None else args
+                connection.send((method, shard_args, kwargs))
+            responses = [connection.recv() for connection in self._connections]
+        except (EOFError, OSError, BrokenPipeError) as e:
+            raise HRSystemException(f"Shard indisponível: {str(e)}")
+        return [self._unwrap(response) for response in responses]
+
+    def hire_employee(self, emp_type, name, age, email, dept, pos, salary, hire_date) -> int:
+        """ Contrata no próximo shard do rodízio e retorna o id do funcionário. """
+        return self.hire_employees([(emp_type, name, age, email, dept, pos, salary, hire_date)])[0]
+
+    def hire_employees(self, records) -> list:
+        """
+        Contratação em lote: uma mensagem por shard. Retorna os ids na ordem dos registros.
+        O lote é tudo ou nada: todos os registros são validados aqui (EMPLOYEE_SCHEMA) antes
+        de qualquer envio, e se algum shard ainda falhar as contratações dos demais são desfeitas.
+        A exceção traz em 'rejected' a lista de (posição do registro, [FieldError]).
+        """
+        validated, rejected = [], []
+        for position, values in enumerate(records):
+            try:
+                result = EMPLOYEE_SCHEMA.validate(*values)
+            except TypeError as e:
+                rejected.append((position, [FieldError("record", str(e))]))
+                continue
+            if result.ok:
+                validated.append(result.value)
+            else:
+                rejected.append((position, result.errors))
+        if rejected:
+            self._raise_rejected(rejected, "Nenhum funcionário contratado")
+        by_shard = [[] for _ in range(self._num_shards)]
+        positions = [[] for _ in range(self._num_shards)]
+        shard_id = self._next_shard
+        for position, record in enumerate(validated):
+            by_shard[shard_id].append(record)
+            positions[shard_id].append(position)
+            shard_id = (shard_id + 1) % self._num_shards
+        self._next_shard = shard_id
+        employee_ids = [None] * len(validated)
+        hired = [[] for _ in range(self._num_shards)]
+        for shard_id, results in enumerate(self._scatter("hire", [(batch,) for batch in by_shard])):
+            for position, result in zip(positions[shard_id], results):
+                if isinstance(result, FieldError):
+                    rejected.append((position, [result]))
+                else:
+                    employee_ids[position] = result
+                    hired[shard_id].append(result)
+        if rejected:
+            self._scatter("remove_many", [(ids,) for ids in hired])
+            self._raise_rejected(sorted(rejected, key=lambda item: item[0]), "Contratações do lote desfeitas")
+        return employee_ids
+
+    @staticmethod
+    def _raise_rejected(rejected, outcome: str):
+        errors = [error for _, field_errors in rejected for error in field_errors]
+        error_class = InvalidEmployeeDataException
+        if any(error.error_class is InvalidEmployeeTypeException for error in errors):
+            error_class = InvalidEmployeeTypeException
+        details = "; ".join(
+            f"registro {position}: {error.message}" for position, field_errors in rejected for error in field_errors
+        )
+        exception = error_class(f"{outcome}: {details}")
+        exception.rejected = rejected
+        raise exception
+
+    def remove_employee(self, employee_id: int):
+        self._call(self.shard_for(employee_id), "remove", employee_id)
+
+    def employee_count(self) -> int:
+        return sum(self._scatter("count"))
+
+    def employee_ids(self) -> list:
+        return list(heapq.merge(*self._scatter("employee_ids")))
+
+    def employee_info(self, employee_id: int) -> dict:
+        return self._call(self.shard_for(employee_id), "employee_info", employee_id)
+
+    def add_records(self, records) -> int:
+        """ Importa pontos (id, entrada, saída) em lote, agrupados por shard. """
+        by_shard = [[] for _ in range(self._num_shards)]
+        for record in records:
+            by_shard[self.shard_for(record[0])].append(record)
+        return sum(self._scatter("add_records", [(batch,) for batch in by_shard]))
+
+    def clock_in(self, employee_id: int):
+        self._call(self.shard_for(employee_id), "clock_in", employee_id)
+
+    def clock_out(self, employee_id: int):
+        self._call(self.shard_for(employee_id), "clock_out", employee_id)
+
+    def add_violation(self, employee_id: int, date_str, description, severity):
+        self._call(self.shard_for(employee_id), "add_violation", employee_id, date_str, description, severity)
+
+    def calculate_payment(self, employee_id: int, start=None, end=None) -> float:
+        return self._call(self.shard_for(employee_id), "calculate_payment", employee_id, start, end)
+
+    def run_payroll(self, start=None, end=None):
+        """
+        Folha da empresa inteira, calculada em paralelo pelos shards.
+        Retorna (id -> valor líquido, id -> motivo) para quem não pôde ser pago.
+        """
+        payments, errors = {}, {}
+        for shard_payments, shard_errors in self._scatter("payroll", None, start, end):
+            payments.update(shard_payments)
+            errors.update(shard_errors)
+        return payments, errors
+
+    def generate_attendance_report(self, employee_id: int, start=None, end=None) -> str:
+        report = self._call(self.shard_for(employee_id), "report", "attendance", employee_id, start, end)
+        print(report, end="")
+        return report
+
+    def generate_compliance_report(self, employee_id: int, start=None, end=None) -> str:
+        report = self._call(self.shard_for(employee_id), "report", "compliance", employee_id, start, end)
+        print(report, end="")
+        return report
+
+    def find_violations(self, min_severity=3, start=None, end=None) -> list:
+        """ Violações de todos os shards, intercaladas por data: (data, id, nível). """
+        return list(heapq.merge(*self._scatter("find_violations", None, min_severity, start, end)))
+
+    def top_risk_employees(self, k: int = 50) -> list:
+        """ Os 'k' maiores scores da empresa: cada shard envia o seu top-k e o coordenador combina. """
+        candidates = itertools.chain.from_iterable(self._scatter("top_risk", None, k))
+        return heapq.nlargest(k, candidates, key=lambda item: (item[1], -item[0]))
+
+    def close(self):
+        for connection in self._connections:
+            try:
+                connection.send(None)
+                connection.close()
+            except (OSError, BrokenPipeError):
+                pass
+        for process in self._processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        self._connections, self._processes = [], []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,193 @@
+# simulation.py
+"""
+Simulação de folha "e se" (what-if) sobre uma visão colunar congelada.
+
+'PayrollFrame' lê um snapshot uma única vez e guarda, em colunas, o salário por
+hora, as horas trabalhadas no período, o departamento e o tipo de cada
+funcionário. Cada 'Scenario' (reajuste geral ou por departamento, outra
+taxa de bônus de gerente, outra alíquota de imposto ou outra tabela progressiva)
+é avaliado sobre essas colunas com operações vetorizadas do NumPy, sem alterar
+nenhum Employee (e, portanto, sem notificar Observers). Sem NumPy, as mesmas
+contas são feitas em Python puro.
+
+A conta é a mesma da Facade: bruto = horas * salário * (1 + bônus do tipo) e
+líquido = bruto - imposto, com o imposto fixo (TAX_RATE) ou pela tabela do
+TaxEngine configurado. Funcionários sem registros completos no período (que
+calculate_payment rejeitaria) ficam fora da simulação.
+"""
+
+from services import MANAGER_BONUS_RATE, TAX_RATE
+from exceptions import SimulationException, HRSystemException
+
+try:
+    import numpy as np
+except ImportError:  # NumPy é opcional; sem ele as contas são feitas em Python puro
+    np = None
+
+
+class Scenario:
+    """
+    Um cenário de folha. 'salary_raise' vale para todos e 'department_raises'
+    (departamento -> fração) se acumula a ele, ex: Scenario("Vendas +5%", department_raises={"Vendas": 0.05}).
+    'manager_bonus', 'tax_rate' (alíquota fixa) e 'tax_engine' (TaxEngine) substituem
+    as regras atuais; o que não for informado segue o que a Facade usaria.
+    """
+    def __init__(self, name: str, salary_raise: float = 0.0, department_raises: dict = None,
+                 manager_bonus: float = None, tax_rate: float = None, tax_engine=None):
+        if not isinstance(name, str) or len(name.strip()) == 0:
+            raise SimulationException("Nome do cenário não pode ser vazio")
+        department_raises = dict(department_raises or {})
+        for label, rate in [("Reajuste", salary_raise), *department_raises.items()]:
+            if not isinstance(rate, (int, float)) or rate <= -1:
+                raise SimulationException(f"{label}: reajuste deve ser um número maior que -100%, recebido: {rate}")
+        if manager_bonus is not None and (not isinstance(manager_bonus, (int, float)) or manager_bonus < 0):
+            raise SimulationException(f"Bônus de gerente deve ser um número não negativo, recebido: {manager_bonus}")
+        if tax_rate is not None and (not isinstance(tax_rate, (int, float)) or not 0 <= tax_rate <= 1):
+            raise SimulationException(f"Imposto deve estar entre 0 e 1, recebido: {tax_rate}")
+        self.name = name.strip()
+        self.salary_raise = float(salary_raise)
+        self.department_raises = department_raises
+        self.manager_bonus = float(manager_bonus) if manager_bonus is not None else None
+        self.tax_rate = float(tax_rate) if tax_rate is not None else None
+        self.tax_engine = tax_engine
+
+    def __repr__(self):
+        return f"Scenario({self.name!r})"
+
+
+class ScenarioResult:
+    """ Totais de um cenário; 'delta' é a diferença do líquido para o cenário atual (sem mudanças). """
+    def __init__(self, scenario: Scenario, gross: float, net: float, by_department: dict, net_by_employee):
+        self.scenario = scenario
+        self.gross = gross
+        self.net = net
+        self.tax = gross - net
+        self.by_department = by_department
+        self.net_by_employee = net_by_employee
+        self.delta = 0.0
+
+    def __repr__(self):
+        return f"ScenarioResult({self.scenario.name!r}, net={self.net:.2f}, delta={self.delta:+.2f})"
+
+
+class PayrollFrame:
+    """
+    Colunas da folha (um item por funcionário pagável), lidas de um snapshot.
+    'skipped' lista os ids que calculate_payment rejeitaria (sem horas no período).
+    """
+    def __init__(self, source, start=None, end=None):
+        employee_ids, salaries, hours, type_codes, department_codes = [], [], [], [], []
+        self.departments = []
+        self.types = []
+        codes = {}
+        types = {}
+        self.skipped = []
+        log_totals = None
+        if source.punch_log is not None:
+            # Modo log binário: as horas de todos saem de uma única passada vetorizada sobre o log
+            log_totals = source.punch_log.totals_by_employee(start, end)
+        for employee, attendance in zip(source.employees_list, source.attendance_list):
+            try:
+                if log_totals is not None:
+                    seconds = log_totals.get(employee.employee_id, 0.0)
+                    count = 1 if employee.employee_id in log_totals else 0
+                else:
+                    seconds, count = attendance.worked_totals(start, end)
+            except HRSystemException:
+                count = 0
+            if count == 0 or seconds <= 0 or employee.salary_per_hour <= 0:
+                self.skipped.append(employee.employee_id)
+                continue
+            department = employee.department
+            if department not in codes:
+                codes[department] = len(self.departments)
+                self.departments.append(department)
+            employee_ids.append(employee.employee_id)
+            salaries.append(employee.salary_per_hour)
+            hours.append(seconds / 3600)
+            employee_type = type(employee).__name__
+            if employee_type not in types:
+                types[employee_type] = len(self.types)
+                self.types.append(employee_type)
+            type_codes.append(types[employee_type])
+            department_codes.append(codes[department])
+        self._codes = codes
+        if np is not None:
+            self.employee_ids = np.array(employee_ids, dtype=np.int64)
+            self.salaries = np.array(salaries, dtype=np.float64)
+            self.hours = np.array(hours, dtype=np.float64)
+            self.type_codes = np.array(type_codes, dtype=np.int64)
+            self.department_codes = np.array(department_codes, dtype=np.int64)
+            self.base_pay = self.hours * self.salaries
+        else:
+            self.employee_ids = employee_ids
+            self.salaries = salaries
+            self.hours = hours
+            self.type_codes = type_codes
+            self.department_codes = department_codes
+            self.base_pay = [h * s for h, s in zip(hours, salaries)]
+
+    def __len__(self):
+        return len(self.employee_ids)
+
+    def _department_factors(self, scenario: Scenario) -> list:
+        factors = [1.0 + scenario.salary_raise] * len(self.departments)
+        for department, rate in scenario.department_raises.items():
+            code = self._codes.get(department)
+            if code is not None:
+                factors[code] *= 1.0 + rate
+        return factors
+
+    def _bonus_factors(self, scenario: Scenario, engine) -> list:
+        if engine is not None:
+            rates = dict(engine.bonus_rates)
+        else:
+            rates = {"Manager": MANAGER_BONUS_RATE}
+        if scenario.manager_bonus is not None:
+            rates["Manager"] = scenario.manager_bonus
+        return [1.0 + rates.get(employee_type, 0.0) for employee_type in self.types]
+
+    def evaluate(self, scenario: Scenario, tax_engine=None) -> ScenarioResult:
+        """ Avalia o cenário; 'tax_engine' é a tabela em uso (a do cenário tem precedência). """
+        engine = scenario.tax_engine or tax_engine
+        factors = self._department_factors(scenario)
+        bonuses = self._bonus_factors(scenario, engine)
+        flat_rate = scenario.tax_rate if scenario.tax_rate is not None else (TAX_RATE if engine is None else None)
+        if np is not None:
+            gross = self.base_pay * np.asarray(factors)[self.department_codes] * np.asarray(bonuses)[self.type_codes]
+            net = gross * (1.0 - flat_rate) if flat_rate is not None else gross - engine.tax_batch(gross)
+            totals = np.bincount(self.department_codes, weights=net, minlength=len(self.departments))
+            return ScenarioResult(
+                scenario, float(gross.sum()), float(net.sum()),
+                dict(zip(self.departments, totals.tolist())), net,
+            )
+        gross = [
+            base * factors[code] * bonuses[type_code]
+            for base, code, type_code in zip(self.base_pay, self.department_codes, self.type_codes)
+        ]
+        taxes = [amount * flat_rate for amount in gross] if flat_rate is not None else engine.tax_batch(gross)
+        net = [amount - tax for amount, tax in zip(gross, taxes)]
+        totals = [0.0] * len(self.departments)
+        for code, amount in zip(self.department_codes, net):
+            totals[code] += amount
+        return ScenarioResult(scenario, sum(gross), sum(net), dict(zip(self.departments, totals)), net)
+
+
+def simulate_payroll(source, scenarios, start=None, end=None, tax_engine=None) -> list:
+    """
+    Avalia os cenários sobre o snapshot/HRSystem 'source' no período [start, end).
+    'tax_engine' é a tabela em uso hoje (None = percentuais fixos).
+    Retorna [atual, *cenários] como ScenarioResult, com 'delta' em relação ao atual.
+    """
+    scenarios = list(scenarios)
+    for scenario in scenarios:
+        if not isinstance(scenario, Scenario):
+            raise SimulationException(f"Cenário deve ser uma instância de Scenario, recebido: {type(scenario).__name__}")
+    frame = source if isinstance(source, PayrollFrame) else PayrollFrame(source, start, end)
+    baseline = frame.evaluate(Scenario("Atual"), tax_engine)
+    results = [baseline]
+    for scenario in scenarios:
+        result = frame.evaluate(scenario, tax_engine)
+        result.delta = result.net - baseline.net
+        results.append(result)
+    return results
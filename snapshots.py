@@ -0,0 +1,201 @@
+# snapshots.py
+"""
+Snapshots consistentes (isolamento ponto-no-tempo) com cópia na escrita.
+
+Criar um snapshot só incrementa a época global e guarda três referências: O(1).
+Cada objeto versionado (HRSystem, Attendance, Compliance, Employee) lembra a época
+da sua última escrita. Na primeira escrita depois de um snapshot ainda aberto, o
+objeto congela o estado atual dos seus campos em '_frozen_versions' e continua
+escrevendo em cópias rasas. Quem lê pelo snapshot encontra o estado congelado;
+objetos que não mudaram são compartilhados, sem cópia nenhuma. Ao fechar um
+snapshot, o registro descarta as versões que nenhum snapshot aberto ainda lê,
+inclusive as de objetos que não voltam a ser escritos.
+"""
+
+import copy
+from bisect import bisect_left
+
+from exceptions import ReadOnlySnapshotException
+
+
+class SnapshotRegistry:
+    """
+    Época global de escrita e épocas dos snapshots abertos (ordenadas).
+    '_holders' mapeia a época da versão congelada mais antiga de cada objeto -> objetos,
+    para que 'close' libere as versões sem esperar pela próxima escrita do objeto.
+    """
+    def __init__(self):
+        self.epoch = 0
+        self._open = []
+        self._holders = {}
+
+    def open(self) -> int:
+        self.epoch += 1
+        self._open.append(self.epoch)
+        return self.epoch
+
+    def close(self, epoch: int):
+        position = bisect_left(self._open, epoch)
+        if position < len(self._open) and self._open[position] == epoch:
+            del self._open[position]
+            self.epoch += 1
+            self._release()
+
+    def track(self, versioned, epoch: int):
+        """ Registra que 'versioned' guarda versões a partir da época 'epoch'. """
+        self._holders.setdefault(epoch, []).append(versioned)
+
+    def _release(self):
+        oldest = self.oldest
+        for epoch in [epoch for epoch in self._holders if oldest is None or epoch < oldest]:
+            for versioned in self._holders.pop(epoch):
+                versioned._prune_versions(oldest)
+                versions = versioned.__dict__.get("_frozen_versions")
+                if versions:
+                    self.track(versioned, versions[0][0])
+
+    @property
+    def latest(self) -> int:
+        return self._open[-1] if self._open else 0
+
+    @property
+    def oldest(self):
+        return self._open[0] if self._open else None
+
+
+REGISTRY = SnapshotRegistry()
+
+
+class Versioned:
+    """
+    Mixin de cópia na escrita. As subclasses listam em '_versioned_fields' os
+    atributos que um snapshot precisa enxergar e chamam '_before_write()' antes
+    de alterá-los (listas e dicts são copiados; os elementos não são alterados
+    no lugar, apenas substituídos).
+    """
+    _versioned_fields = ()
+
+    def _start_versioning(self):
+        self._written_epoch = REGISTRY.epoch
+
+    def _before_write(self):
+        state = self.__dict__
+        if "_snapshot_epoch" in state:
+            raise ReadOnlySnapshotException(
+                f"{type(self).__name__} pertence ao snapshot da época {state['_snapshot_epoch']} e é somente leitura"
+            )
+        epoch = REGISTRY.epoch
+        written = state.get("_written_epoch", epoch)
+        if written == epoch:
+            return
+        self._written_epoch = epoch
+        if REGISTRY.latest <= written:
+            return  # nenhum snapshot aberto depois da última escrita: pode alterar no lugar
+        frozen = {}
+        for field in self._versioned_fields:
+            value = state.get(field)
+            frozen[field] = value
+            if isinstance(value, (list, dict)):
+                state[field] = value.copy()
+        versions = state.get("_frozen_versions")
+        if versions is None:
+            versions = self._frozen_versions = []
+        if not versions:
+            REGISTRY.track(self, epoch)
+        versions.append((epoch, frozen))
+
+    def _prune_versions(self, oldest):
+        """ Descarta as versões que nenhum snapshot aberto pode mais ler ('oldest' é None sem snapshots). """
+        versions = self.__dict__.get("_frozen_versions")
+        if not versions:
+            return
+        if oldest is None:
+            versions.clear()
+        elif versions[0][0] < oldest:
+            del versions[:bisect_left(versions, oldest, key=lambda version: version[0])]
+
+    def frozen_at(self, epoch: int):
+        """ Visão somente leitura do objeto como estava quando o snapshot 'epoch' foi criado. """
+        view = copy.copy(self)
+        versions = self.__dict__.get("_frozen_versions")
+        if versions:
+            # A primeira versão congelada depois de 'epoch' guarda o estado visto pelo snapshot
+            position = bisect_left(versions, epoch, key=lambda version: version[0])
+            if position < len(versions):
+                view.__dict__.update(versions[position][1])
+        view.__dict__.pop("_frozen_versions", None)
+        view._snapshot_epoch = epoch
+        return view
+
+
+class FrozenSequence:
+    """ Sequência somente leitura que entrega as visões congeladas dos itens sob demanda. """
+    def __init__(self, items, freeze):
+        self._items = items
+        self._freeze = freeze
+
+    def __len__(self):
+        return len(self._items)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._freeze(item) for item in self._items[index]]
+        return self._freeze(self._items[index])
+
+    def __iter__(self):
+        return (self._freeze(item) for item in self._items)
+
+
+class Snapshot:
+    """
+    Visão ponto-no-tempo do HRSystem para folhas e relatórios longos.
+    Expõe 'employees_list', 'attendance_list' e 'compliance_list' como o
+    HRSystem, mas congelados; as visões por objeto são criadas sob demanda e
+    reaproveitadas. Feche com 'close()' (ou use 'with') para liberar as versões.
+    """
+    def __init__(self, hr_system, registry: SnapshotRegistry = REGISTRY):
+        self._registry = registry
+        self.epoch = registry.open()
+        self._views = {}
+        punch_log = hr_system.punch_log
+        self._punch_log = punch_log.view(len(punch_log)) if punch_log is not None else None
+        self.employees_list = FrozenSequence(hr_system.employees_list, self._freeze)
+        self.attendance_list = FrozenSequence(hr_system.attendance_list, self._freeze)
+        self.compliance_list = FrozenSequence(hr_system.compliance_list, self._freeze)
+        self.employee_ids = hr_system.employee_ids
+        self._employees_by_id = hr_system._employees_by_id
+        self.closed = False
+
+    def _freeze(self, item):
+        if self.closed:
+            raise ReadOnlySnapshotException(f"Snapshot da época {self.epoch} já foi fechado")
+        view = self._views.get(id(item))
+        if view is None:
+            view = item.frozen_at(self.epoch)
+            if "_employee" in view.__dict__:
+                view._employee = self._freeze(view._employee)
+            if view.__dict__.get("_punch_log") is not None:
+                view._punch_log = self._punch_log
+            self._views[id(item)] = view
+        return view
+
+    @property
+    def punch_log(self):
+        """ Visão do log binário limitada aos pontos gravados até a criação do snapshot (ou None). """
+        return self._punch_log
+
+    def get_employee_by_id(self, employee_id):
+        employee = self._employees_by_id.get(employee_id)
+        return self._freeze(employee) if employee is not None else None
+
+    def close(self):
+        if not self.closed:
+            self._registry.close(self.epoch)
+            self._views.clear()
+            self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,197 @@
+# tax_engine.py
+"""
+Motor de imposto progressivo e bônus, dirigido por tabela (arquivo de configuração JSON).
+
+Formato do arquivo:
+    {
+      "tax_brackets": [{"from": 0, "rate": 0.0}, {"from": 2000, "rate": 0.075}, ...],
+      "deductions": [{"name": "Previdência", "rate": 0.08}, {"name": "Dependentes", "amount": 189.59}],
+      "bonus_rates": {"Manager": 0.20}
+    }
+
+As faixas são marginais: cada alíquota vale para a parte do valor acima do seu
+'from'. Na carga, a tabela é pré-computada com o imposto acumulado no início de
+cada faixa, então o imposto de um valor é uma busca binária (bisect, ou
+numpy.searchsorted para uma folha inteira) mais uma multiplicação: o custo por
+funcionário praticamente não cresce com o número de faixas.
+
+As deduções reduzem a base de cálculo (valor fixo ou fração do bruto). O motor
+entra no PaymentContext pelos Decorators 'TableBonusDecorator' e
+'ProgressiveTaxDecorator', no lugar dos percentuais fixos.
+"""
+
+import json
+from bisect import bisect_right
+from datetime import datetime
+
+from services import (
+    Attendance, BasePaymentDecorator, PaymentStrategy, MANAGER_BONUS_RATE, TAX_RATE
+)
+from exceptions import (
+    TaxConfigException, InvalidPaymentCalculationException, NegativePaymentException
+)
+
+try:
+    import numpy as np
+except ImportError:  # NumPy é opcional; sem ele a folha em lote usa bisect item a item
+    np = None
+
+# Equivale aos Decorators de percentual fixo (15% de imposto, 20% de bônus para gerentes)
+DEFAULT_CONFIG = {
+    "tax_brackets": [{"from": 0, "rate": TAX_RATE}],
+    "deductions": [],
+    "bonus_rates": {"Manager": MANAGER_BONUS_RATE},
+}
+
+
+class TaxTable:
+    """ Faixas marginais pré-computadas: 'thresholds' crescentes, 'rates' e imposto acumulado em cada início. """
+    def __init__(self, brackets):
+        if not brackets:
+            raise ValueError("A tabela de imposto precisa de pelo menos uma faixa")
+        thresholds, rates = [], []
+        for bracket in brackets:
+            start, rate = float(bracket["from"]), float(bracket["rate"])
+            if thresholds and start <= thresholds[-1]:
+                raise ValueError(f"Faixas devem estar em ordem crescente: {start} após {thresholds[-1]}")
+            if not 0 <= rate <= 1:
+                raise ValueError(f"Alíquota deve estar entre 0 e 1, recebido: {rate}")
+            thresholds.append(start)
+            rates.append(rate)
+        if thresholds[0] != 0:
+            raise ValueError(f"A primeira faixa deve começar em 0, recebido: {thresholds[0]}")
+        cumulative = [0.0]
+        for i in range(1, len(thresholds)):
+            cumulative.append(cumulative[-1] + (thresholds[i] - thresholds[i - 1]) * rates[i - 1])
+        self.thresholds = thresholds
+        self.rates = rates
+        self.cumulative = cumulative
+        if np is not None:
+            self._thresholds = np.array(thresholds)
+            self._rates = np.array(rates)
+            self._cumulative = np.array(cumulative)
+
+    def __len__(self):
+        return len(self.thresholds)
+
+    def tax(self, amount: float) -> float:
+        if amount <= 0:
+            return 0.0
+        i = bisect_right(self.thresholds, amount) - 1
+        return self.cumulative[i] + (amount - self.thresholds[i]) * self.rates[i]
+
+    def tax_batch(self, amounts):
+        """ Imposto de cada valor de 'amounts' (array NumPy ou lista) de uma vez. """
+        if np is None:
+            return [self.tax(amount) for amount in amounts]
+        amounts = np.maximum(np.asarray(amounts, dtype=np.float64), 0.0)
+        i = np.searchsorted(self._thresholds, amounts, side="right") - 1
+        return self._cumulative[i] + (amounts - self._thresholds[i]) * self._rates[i]
+
+
+class TaxEngine:
+    """ Imposto progressivo, deduções da base de cálculo e bônus por tipo de funcionário. """
+    def __init__(self, config: dict = None):
+        config = DEFAULT_CONFIG if config is None else config
+        try:
+            self.table = TaxTable(config["tax_brackets"])
+            self.fixed_deductions = 0.0
+            self.rate_deductions = 0.0
+            for deduction in config.get("deductions", []):
+                if "amount" in deduction:
+                    amount = float(deduction["amount"])
+                    if amount < 0:
+                        raise ValueError(f"Dedução '{deduction.get('name')}' não pode ser negativa")
+                    self.fixed_deductions += amount
+                else:
+                    rate = float(deduction["rate"])
+                    if not 0 <= rate <= 1:
+                        raise ValueError(f"Dedução '{deduction.get('name')}' deve estar entre 0 e 1, recebido: {rate}")
+                    self.rate_deductions += rate
+            if self.rate_deductions > 1:
+                raise ValueError("A soma das deduções percentuais não pode passar de 100%")
+            self.bonus_rates = {}
+            for employee_type, rate in config.get("bonus_rates", {}).items():
+                rate = float(rate)
+                if rate < 0:
+                    raise ValueError(f"Bônus de '{employee_type}' não pode ser negativo, recebido: {rate}")
+                self.bonus_rates[employee_type] = rate
+        except (KeyError, TypeError, ValueError) as e:
+            raise TaxConfigException(f"Configuração de imposto inválida: {str(e)}")
+
+    @classmethod
+    def from_file(cls, path: str):
+        try:
+            with open(path, encoding="utf-8") as f:
+                return cls(json.load(f))
+        except OSError as e:
+            raise TaxConfigException(f"Erro ao ler configuração de imposto '{path}': {str(e)}")
+        except json.JSONDecodeError as e:
+            raise TaxConfigException(f"Configuração de imposto '{path}' não é um JSON válido: {str(e)}")
+
+    def bonus_rate(self, employee) -> float:
+        return self.bonus_rates.get(type(employee).__name__, 0.0)
+
+    def taxable(self, gross: float) -> float:
+        return max(0.0, gross * (1.0 - self.rate_deductions) - self.fixed_deductions)
+
+    def tax(self, gross: float) -> float:
+        return self.table.tax(self.taxable(gross))
+
+    def tax_batch(self, gross):
+        """ Imposto de uma folha inteira (array de valores brutos) em operações vetorizadas. """
+        if np is None:
+            return [self.tax(amount) for amount in gross]
+        gross = np.asarray(gross, dtype=np.float64)
+        taxable = np.maximum(gross * (1.0 - self.rate_deductions) - self.fixed_deductions, 0.0)
+        return self.table.tax_batch(taxable)
+
+
+class TableBonusDecorator(BasePaymentDecorator):
+    """ Bônus pela tabela 'bonus_rates' do TaxEngine, conforme o tipo do funcionário. """
+    def __init__(self, strategy: PaymentStrategy, engine: TaxEngine):
+        super().__init__(strategy)
+        self._engine = engine
+
+    def calculate(self, attendance: Attendance, salary_per_hour: float,
+                  start: datetime = None, end: datetime = None) -> float:
+        try:
+            base_pay = self._wrapped_strategy.calculate(attendance, salary_per_hour, start, end)
+            if base_pay < 0:
+                raise NegativePaymentException(f"Pagamento base é negativo: R$ {base_pay:.2f}")
+            rate = self._engine.bonus_rate(attendance._employee)
+            if rate == 0:
+                return base_pay
+            bonus = base_pay * rate
+            print(f"  -> Bônus ({type(attendance._employee).__name__} {rate:.0%}): +R$ {bonus:.2f}")
+            return base_pay + bonus
+        except (NegativePaymentException, InvalidPaymentCalculationException):
+            raise
+        except Exception as e:
+            raise InvalidPaymentCalculationException(f"Erro ao calcular bônus: {str(e)}")
+
+
+class ProgressiveTaxDecorator(BasePaymentDecorator):
+    """ Imposto progressivo pelas faixas do TaxEngine (após as deduções da base de cálculo). """
+    def __init__(self, strategy: PaymentStrategy, engine: TaxEngine):
+        super().__init__(strategy)
+        self._engine = engine
+
+    def calculate(self, attendance: Attendance, salary_per_hour: float,
+                  start: datetime = None, end: datetime = None) -> float:
+        try:
+            gross_pay = self._wrapped_strategy.calculate(attendance, salary_per_hour, start, end)
+            if gross_pay < 0:
+                raise NegativePaymentException(f"Pagamento bruto é negativo: R$ {gross_pay:.2f}")
+            tax = self._engine.tax(gross_pay)
+            if tax > gross_pay:
+                raise InvalidPaymentCalculationException(
+                    f"Imposto ({tax:.2f}) excede o pagamento bruto ({gross_pay:.2f})"
+                )
+            effective = tax / gross_pay if gross_pay else 0.0
+            print(f"  -> Imposto progressivo ({effective:.1%} efetivo): -R$ {tax:.2f}")
+            return gross_pay - tax
+        except (NegativePaymentException, InvalidPaymentCalculationException):
+            raise
+        except Exception as e:
+            raise InvalidPaymentCalculationException(f"Erro ao calcular imposto progressivo: {str(e)}")
@@ -0,0 +1,135 @@
+# validation.py
+"""
+Esquema declarativo de validação do funcionário, compilado uma única vez.
+
+Cada campo declara suas regras (predicado + mensagem) e sua normalização. O
+esquema compilado valida um registro inteiro em uma passada e devolve os erros
+de todos os campos como dados (ValidationResult), sem lançar exceções; quem
+precisa de exceção chama 'raise_if_invalid'. Facade, Factory, Builder e a
+contratação em lote usam o mesmo EMPLOYEE_SCHEMA.
+"""
+
+from exceptions import InvalidEmployeeDataException, InvalidEmployeeTypeException
+
+MAX_SALARY_PER_HOUR = 10000.0
+
+
+class Field:
+    """ Um campo do esquema: regras (predicado, mensagem) avaliadas em ordem e normalização final. """
+    def __init__(self, name: str, rules, normalize=None, error_class=InvalidEmployeeDataException):
+        self.name = name
+        self.rules = tuple(rules)
+        self.normalize = normalize
+        self.error_class = error_class
+
+
+class FieldError:
+    def __init__(self, field: str, message: str, error_class=InvalidEmployeeDataException):
+        self.field = field
+        self.message = message
+        self.error_class = error_class
+
+    def __repr__(self):
+        return f"FieldError({self.field!r}, {self.message!r})"
+
+
+class ValidationResult:
+    """ 'value': registro normalizado (None se inválido); 'errors': FieldError de todos os campos inválidos. """
+    def __init__(self, value, errors):
+        self.value = value
+        self.errors = errors
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def raise_if_invalid(self):
+        """ Converte os erros em uma única exceção (de tipo, se o tipo de funcionário for inválido). """
+        if not self.errors:
+            return self.value
+        error_class = InvalidEmployeeDataException
+        if any(error.error_class is InvalidEmployeeTypeException for error in self.errors):
+            error_class = InvalidEmployeeTypeException
+        exception = error_class("; ".join(error.message for error in self.errors))
+        exception.errors = self.errors
+        raise exception
+
+
+class Schema:
+    """ Esquema compilado: a lista de campos vira uma tupla de (nome, regras, normalização) percorrida uma vez. """
+    def __init__(self, fields):
+        self.fields = tuple(fields)
+        self.field_names = tuple(field.name for field in self.fields)
+        self._by_name = {field.name: field for field in self.fields}
+        self._compiled = tuple(
+            (field.name, field.rules, field.normalize, field.error_class) for field in self.fields
+        )
+
+    def validate(self, *values) -> ValidationResult:
+        """ Valida os valores na ordem de 'field_names' e retorna o resultado, sem lançar exceções. """
+        if len(values) != len(self._compiled):
+            raise TypeError(f"Esperados {len(self._compiled)} valores ({', '.join(self.field_names)}), recebidos {len(values)}")
+        record = {}
+        errors = None
+        for (name, rules, normalize, error_class), value in zip(self._compiled, values):
+            for predicate, message in rules:
+                if not predicate(value):
+                    if errors is None:
+                        errors = []
+                    errors.append(FieldError(name, message.format(value=value), error_class))
+                    break
+            else:
+                record[name] = normalize(value) if normalize is not None else value
+        if errors:
+            return ValidationResult(None, errors)
+        return ValidationResult(record, [])
+
+    def validate_record(self, record: dict) -> ValidationResult:
+        return self.validate(*(record.get(name) for name in self.field_names))
+
+    def validate_field(self, name: str, value):
+        """ Valida um único campo: retorna (valor normalizado, None) ou (None, FieldError). """
+        field = self._by_name[name]
+        for predicate, message in field.rules:
+            if not predicate(value):
+                return None, FieldError(name, message.format(value=value), field.error_class)
+        return (field.normalize(value) if field.normalize is not None else value), None
+
+
+def _non_empty_text(value) -> bool:
+    return isinstance(value, str) and len(value.strip()) > 0
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float))
+
+
+def _optional_text(default):
+    return lambda value: (str(value).strip() or default) if value else default
+
+
+EMPLOYEE_SCHEMA = Schema([
+    Field("emp_type", [
+        (lambda value: isinstance(value, int) and value in (1, 2, 3),
+         "Tipo de funcionário deve ser 1, 2 ou 3, recebido: {value}"),
+    ], error_class=InvalidEmployeeTypeException),
+    Field("name", [(_non_empty_text, "Nome do funcionário não pode ser vazio")], str.strip),
+    Field("age", [
+        (lambda value: isinstance(value, int) and value > 0,
+         "Idade deve ser um número inteiro positivo, recebido: {value}"),
+    ]),
+    Field("email", [(_non_empty_text, "Email do funcionário não pode ser vazio")], str.strip),
+    Field("department", [(_non_empty_text, "Departamento não pode ser vazio")], str.strip),
+    Field("work_position", [], _optional_text("Not Assigned")),
+    Field("salary", [
+        (lambda value: _is_number(value) and value > 0, "Salário deve ser um número positivo, recebido: {value}"),
+        (lambda value: value <= MAX_SALARY_PER_HOUR,
+         "Salário por hora não pode exceder R$ 10.000,00, recebido: R$ {value:.2f}"),
+    ], float),
+    Field("hire_date", [], _optional_text("Not Defined")),
+])
+
+
+def validate_employee(emp_type, name, age, email, department, work_position, salary, hire_date) -> ValidationResult:
+    """ Atalho para EMPLOYEE_SCHEMA.validate com os argumentos de HRFacade.hire_employee. """
+    return EMPLOYEE_SCHEMA.validate(emp_type, name, age, email, department, work_position, salary, hire_date)